@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from django.core.files import File
 from django.core.urlresolvers import reverse, NoReverseMatch
 from django.db import models
+from django.db.models import Q
 from django.db.models.signals import post_save, pre_save
 from django.utils.translation import get_language, ugettext_lazy as _
 from cms.models.pluginmodel import CMSPlugin
@@ -105,7 +106,7 @@ class NewsItemPermission(PermissionMixin):
         if self.status == 'published':
             return True
 
-        if self.author == user:
+        if self.author_id == user.pk:
             return True
 
         if user.is_superuser or is_admin(user):
@@ -119,6 +120,19 @@ class NewsItemPermission(PermissionMixin):
 
         return False
 
+    @classmethod
+    def anonymoususer_can_view_q(cls, user):
+        return Q(status='published')
+
+    @classmethod
+    def user_can_view_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if user.is_superuser or is_admin(user):
+            return Q()
+
+        return Q(status='published') | Q(author=user)
+
 
 class NewsItemTranslation(TranslationModel):
     news_item = models.ForeignKey('NewsItem')
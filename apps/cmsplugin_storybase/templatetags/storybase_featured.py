@@ -2,6 +2,7 @@ from itertools import chain
 from django.contrib.auth.models import AnonymousUser
 from django.template import Library, Context
 from django.template.loader import get_template
+from storybase.models import prefetch_perms
 from cmsplugin_storybase.models import NewsItem
 from storybase_story.models import Story
 from storybase_user.models import Project
@@ -19,8 +20,10 @@ def featured_items(context, count=4, img_width=335, objects=None):
         user = context['user']
     else:
         user = AnonymousUser()
-    normalized = [obj.normalize_for_view(img_width) for obj in objects
-                  if obj.has_perm(user, 'view')]
+    # Check the permissions for all the objects at once rather than
+    # one at a time
+    normalized = [obj.normalize_for_view(img_width) for obj
+                  in prefetch_perms(user, objects, ['view'])]
     template = get_template('storybase/featured_object.html')
     context = Context({
         'objects': normalized,
@@ -1,5 +1,6 @@
-from storybase.api.resources import (DataUriResourceMixin, HookedModelResource,
-        TranslatedModelResource)
+from storybase.api.resources import (ChunkedUploadResource,
+        DataUriResourceMixin, HookedModelResource, TranslatedModelResource,
+        TypeaheadObject, TypeaheadResource)
 from storybase.api.views import CreativeCommonsLicenseGetProxyView
     
 from storybase.api.authorization import (LoggedInAuthorization,
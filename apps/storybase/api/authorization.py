@@ -3,6 +3,8 @@ from django.db.models import Q
 from tastypie.authorization import Authorization
 from tastypie.exceptions import Unauthorized
 
+from storybase.models import prefetch_perms
+
 
 class UserAuthorization(object):
 
@@ -27,17 +29,24 @@ class LoggedInAuthorization(Authorization, UserAuthorization):
         """
         Filter a list of objects to only the items for which a request's user
         has a particular set of permissions.
+
+        If ``object_list`` is a QuerySet of a model that can express the
+        permissions as a ``Q`` object, the filtering is done at the
+        database level.  Otherwise, the permissions are checked for all the
+        objects at once with ``prefetch_perms``.
         """
-        # TODO: Use custom queryset methods to do this at the database
-        # level instead of iterating through the list and checking the
-        # permissions on each item
         filtered = []
 
         if self.user_valid(bundle):
-            for obj in object_list:
-                if (hasattr(obj, 'has_perms') and
-                        obj.has_perms(bundle.request.user, perms)):
-                    filtered.append(obj)
+            model = getattr(object_list, 'model', None)
+            if (hasattr(object_list, 'filter') and
+                    hasattr(model, 'perms_q')):
+                q = model.perms_q(bundle.request.user, perms)
+                if q is not None:
+                    return object_list.filter(q)
+
+            filtered = prefetch_perms(bundle.request.user, object_list,
+                                      perms)
 
         return filtered
 
@@ -90,8 +99,9 @@ class LoggedInAuthorization(Authorization, UserAuthorization):
 
         Should return an empty list if none are allowed.
 
-        Delegates to each object in the list's ``has_perms`` method to check
-        permissions for the request's user.
+        Delegates to the model's ``perms_q`` method or each object in the
+        list's ``has_perms`` method to check permissions for the request's
+        user.
         """
         return self.filter_by_perms(object_list, bundle, ['change'])
 
@@ -111,8 +121,9 @@ class LoggedInAuthorization(Authorization, UserAuthorization):
 
         Should return an empty list if none are allowed.
 
-        Delegates to each object in the list's ``has_perms`` method to check
-        permissions for the request's user.
+        Delegates to the model's ``perms_q`` method or each object in the
+        list's ``has_perms`` method to check permissions for the request's
+        user.
         """
         return self.filter_by_perms(object_list, bundle, ['delete'])
 
@@ -33,24 +33,32 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from cStringIO import StringIO
 import base64
-import os
+import hashlib
 import re
 
 from django.conf import settings
+from django.conf.urls import url
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.db import connection
 from django.http import HttpResponse
+from django.utils import translation
 
 from tastypie import fields, http
+from tastypie.authentication import Authentication
+from tastypie.authorization import ReadOnlyAuthorization
 from tastypie.bundle import Bundle
-from tastypie.exceptions import ImmediateHttpResponse, NotFound
-from tastypie.resources import (ModelResource, 
+from tastypie.cache import SimpleCache
+from tastypie.exceptions import BadRequest, ImmediateHttpResponse, NotFound
+from tastypie.resources import (ModelResource, Resource,
                                 convert_post_to_patch)
-from tastypie.utils import dict_strip_unicode_keys
+from tastypie.utils import dict_strip_unicode_keys, trailing_slash
 from tastypie.utils.mime import build_content_type
 
+from storybase.api.authorization import LoggedInAuthorization
+from storybase.models import ChunkedUpload
+
 class MultipartFileUploadModelResource(ModelResource):
     """
     A version of ModelResource that accepts file uploads via
@@ -77,8 +85,10 @@ class MultipartFileUploadModelResource(ModelResource):
         # or multipart/form-data, then ignore the data attribute and
         # just grab the data to deserialize from the request
         if format.startswith('multipart'):
-            deserialized = request.POST.copy()
-            deserialized.update(request.FILES)
+            # Build a plain dictionary rather than copying the QueryDict,
+            # which would make a deep copy of every value
+            deserialized = dict(request.POST.items())
+            deserialized.update(request.FILES.items())
         else:
             deserialized = self._meta.serializer.deserialize(data, format=request.META.get('CONTENT_TYPE', 'application/json'))
         return deserialized
@@ -531,7 +541,33 @@ class TranslatedModelResource(HookedModelResource):
             return http.HttpNotFound()
 
 
+class HttpRequestEntityTooLarge(HttpResponse):
+    status_code = 413
+
+
+def check_upload_size(size):
+    """
+    Reject an upload with a 413 response if it's larger than
+    ``STORYBASE_MAX_UPLOAD_SIZE`` bytes
+    """
+    if size > settings.STORYBASE_MAX_UPLOAD_SIZE:
+        raise ImmediateHttpResponse(response=HttpRequestEntityTooLarge(
+            "Uploaded files can't be larger than %d bytes" %
+            settings.STORYBASE_MAX_UPLOAD_SIZE))
+
+
 class DataUriResourceMixin(object):
+    # Number of encoded characters to decode at a time.  This must be a
+    # multiple of 4, the length of a group of base64 characters.
+    data_uri_chunk_size = 64 * 1024
+
+    # Characters that aren't part of the base64 alphabet, such as
+    # whitespace.  ``base64.b64decode`` ignores these.
+    non_base64_re = re.compile(r'[^A-Za-z0-9+/=]+')
+
+    # Pattern that matches the URI of a ``ChunkedUploadResource``
+    upload_uri_pattern = r"/uploads/(?P<upload_id>[0-9a-f]{32,32})/?$"
+
     def parse_data_uri(self, data_uri):
         """
         Parse a data URI string
@@ -541,32 +577,390 @@ class DataUriResourceMixin(object):
         See http://tools.ietf.org/html/rfc2397
 
         """
-        pattern = r"data:(?P<mime>[\w/]+);(?P<encoding>\w+),(?P<data>.*)"
-        m = re.search(pattern, data_uri)
-        return (m.group('mime'), m.group('encoding'), m.group('data'))
+        (mime, encoding, offset) = self.parse_data_uri_header(data_uri)
+        return (mime, encoding, data_uri[offset:])
+
+    def parse_data_uri_header(self, data_uri):
+        """
+        Parse the part of a data URI string that comes before the data
+
+        Returns a tuple of (mime_type, encoding, offset), where offset is
+        the position of the first character of the data in the string.
+        Unlike ``parse_data_uri``, this doesn't copy the data.
+
+        """
+        comma = data_uri.find(',')
+        if not data_uri.startswith('data:') or comma == -1:
+            raise BadRequest("Invalid data URI")
+        params = data_uri[len('data:'):comma].split(';')
+        mime = params[0] or 'text/plain'
+        encoding = None
+        if len(params) > 1 and params[-1] == 'base64':
+            encoding = 'base64'
+        return (mime, encoding, comma + 1)
+
+    def decode_data_uri(self, data_uri, filename):
+        """
+        Decode a base64-encoded data URI into a temporary file
+
+        The data is decoded a piece at a time and written to disk, so the
+        decoded file is never held in memory.  Raises ``BadRequest`` if
+        the data URI can't be decoded.
+
+        Returns a ``TemporaryUploadedFile``.
+
+        """
+        (content_type, encoding, offset) = self.parse_data_uri_header(
+            data_uri)
+        if encoding != 'base64':
+            raise BadRequest("Only base64-encoded data URIs are supported")
+        # Every 4 encoded characters decode to at most 3 bytes, so this
+        # is an upper bound of the file's size that we know before
+        # decoding anything
+        check_upload_size((len(data_uri) - offset) * 3 // 4)
+
+        f = TemporaryUploadedFile(name=filename, content_type=content_type,
+                                  size=None, charset=None)
+        size = 0
+        remainder = ''
+        try:
+            for start in xrange(offset, len(data_uri),
+                                self.data_uri_chunk_size):
+                chunk = remainder + self.non_base64_re.sub('',
+                    data_uri[start:start + self.data_uri_chunk_size])
+                # Only decode complete groups of 4 characters and carry
+                # the rest over to the next piece
+                end = len(chunk) - (len(chunk) % 4)
+                decoded = base64.b64decode(chunk[:end])
+                remainder = chunk[end:]
+                f.write(decoded)
+                size += len(decoded)
+            if remainder:
+                decoded = base64.b64decode(remainder)
+                f.write(decoded)
+                size += len(decoded)
+        except TypeError:
+            f.close()
+            raise BadRequest("The data URI isn't correctly base64-encoded")
+
+        f.size = size
+        f.seek(0)
+        return f
 
     def _hydrate_file(self, bundle, file_model_class, file_field, 
         filename_field='filename'):
         """Decode the base-64 encoded file"""
-        def file_size(f):
-            f.seek(0, os.SEEK_END)
-            return f.tell()
-
         file_uri = bundle.data.get(file_field, None)
 
         if file_uri:
-            (content_type, encoding, data) = self.parse_data_uri(
-                file_uri)
             filename = bundle.data.get(filename_field)
-            f = StringIO()
-            f.write(base64.b64decode(data))
-            size = file_size(f)
-            file = InMemoryUploadedFile(file=f, field_name=None, 
-                                        name=filename,
-                                        content_type=content_type,
-                                        size=size, charset=None)
-            file_model = file_model_class.objects.create(file=file)
+            f = self.decode_data_uri(file_uri, filename)
+            try:
+                file_model = file_model_class.objects.create(file=f)
+            finally:
+                f.close()
             bundle.data[file_field] = file_model 
+
+        return bundle
+
+    def is_upload_uri(self, value):
+        """Is a field value the URI of a ``ChunkedUpload``?"""
+        return (isinstance(value, basestring) and
+                re.search(self.upload_uri_pattern, value) is not None)
+
+    def hydrate_chunked_upload(self, bundle, file_model_class, file_field,
+                               validate=None):
+        """
+        Replace the URI of a completed ``ChunkedUpload`` in a file field
+        with a ``file_model_class`` instance for the uploaded file
+
+        ``validate`` is an optional callable that is passed the uploaded
+        file and should raise ``BadRequest`` if the file isn't acceptable.
+        The upload is deleted once its file has been copied, so it can
+        only be used once.
+
+        """
+        value = bundle.data.get(file_field, None)
+        if not self.is_upload_uri(value):
+            return bundle
+
+        m = re.search(self.upload_uri_pattern, value)
+        user = getattr(bundle.request, 'user', None)
+        if user is None or not user.is_authenticated():
+            raise ImmediateHttpResponse(response=http.HttpUnauthorized(
+                "You must be logged in to use an upload"))
+        try:
+            upload = ChunkedUpload.objects.get(
+                upload_id=m.group('upload_id'), owner=user)
+        except ObjectDoesNotExist:
+            raise BadRequest("An upload matching the provided URI could "
+                             "not be found")
+        if not upload.complete:
+            raise BadRequest("The upload is not complete")
+
+        f = upload.get_uploaded_file()
+        try:
+            if validate is not None:
+                validate(f)
+            file_model = file_model_class.objects.create(file=f)
+        finally:
             f.close()
+        upload.delete()
+        bundle.data[file_field] = file_model
 
         return bundle
+
+
+class ChunkedUploadResource(ModelResource):
+    """
+    Upload a large file in pieces
+
+    To start an upload, POST the file's ``filename``, ``content_type``
+    and ``size`` in bytes.  Then PUT each piece of the file, in order, to
+    the upload's ``chunk/`` endpoint with a ``Content-Range`` header,
+    e.g. ``Content-Range: bytes 0-1048575/5242880``.  If a request
+    fails, GET the upload to find the ``offset`` to resume from.
+
+    Once the upload is ``complete``, its ``resource_uri`` can be used as
+    the value of an asset's ``image`` or a data set's ``file``.
+
+    """
+    upload_id = fields.CharField(attribute='upload_id', readonly=True)
+    offset = fields.IntegerField(attribute='offset', readonly=True)
+    complete = fields.BooleanField(attribute='complete', readonly=True)
+
+    class Meta:
+        always_return_data = True
+        queryset = ChunkedUpload.objects.all()
+        resource_name = 'uploads'
+        list_allowed_methods = ['post']
+        detail_allowed_methods = ['get', 'delete']
+        authentication = Authentication()
+        authorization = LoggedInAuthorization()
+        detail_uri_name = 'upload_id'
+        fields = ['filename', 'content_type', 'size']
+
+    def prepend_urls(self):
+        return [
+            url(r"^(?P<resource_name>%s)/(?P<upload_id>[0-9a-f]{32,32})/chunk%s$" %
+                (self._meta.resource_name, trailing_slash()),
+                self.wrap_view('dispatch_chunk'),
+                name="api_dispatch_chunk"),
+        ]
+
+    def get_object_list(self, request):
+        object_list = super(ChunkedUploadResource, self).get_object_list(
+            request)
+        # Users can only see their own uploads
+        if (request is not None and hasattr(request, 'user') and
+                request.user.is_authenticated()):
+            return object_list.filter(owner=request.user)
+        return object_list.none()
+
+    def obj_create(self, bundle, **kwargs):
+        if not bundle.request.user.is_authenticated():
+            raise ImmediateHttpResponse(response=http.HttpUnauthorized())
+
+        # Clean up abandoned uploads
+        ChunkedUpload.objects.delete_expired()
+
+        try:
+            size = int(bundle.data.get('size'))
+        except (TypeError, ValueError):
+            raise BadRequest("You must specify the size of the file in bytes")
+        if size < 0:
+            raise BadRequest("You must specify the size of the file in bytes")
+        # Reject large files before any of the file is sent
+        check_upload_size(size)
+
+        kwargs['owner'] = bundle.request.user
+        return super(ChunkedUploadResource, self).obj_create(bundle,
+                                                            **kwargs)
+
+    def dispatch_chunk(self, request, **kwargs):
+        """
+        Append a piece of the file to an upload
+
+        The request body is copied to the upload's temporary file as it
+        is read, rather than being loaded into memory.
+
+        """
+        self.method_check(request, allowed=['put'])
+        self.is_authenticated(request)
+        self.throttle_check(request)
+
+        bundle = self.build_bundle(request=request)
+        try:
+            upload = self.obj_get(bundle,
+                **self.remove_api_resource_names(kwargs))
+        except ObjectDoesNotExist:
+            return http.HttpNotFound()
+
+        m = re.match(r"bytes (\d+)-(\d+)/(\d+)$",
+                     request.META.get('HTTP_CONTENT_RANGE', ''))
+        if m is None:
+            raise BadRequest("You must specify a Content-Range header")
+        (start, end, total) = [int(value) for value in m.groups()]
+        if total != upload.size or end < start:
+            raise BadRequest("The Content-Range header doesn't match the "
+                             "size of the upload")
+
+        if start == upload.offset:
+            try:
+                upload.append(request, end - start + 1)
+            except ValueError, e:
+                raise BadRequest(str(e))
+            response_class = http.HttpAccepted
+        else:
+            # The client is out of sync with the server.  Let it know
+            # where to resume from.
+            response_class = http.HttpConflict
+
+        self.log_throttled_access(request)
+        bundle = self.full_dehydrate(self.build_bundle(obj=upload,
+                                                       request=request))
+        return self.create_response(request, bundle,
+                                    response_class=response_class)
+
+
+class TypeaheadObject(object):
+    """A single suggestion returned by a ``TypeaheadResource``"""
+    def __init__(self, id=None, name=None):
+        self.id = id
+        self.name = name
+
+    def __unicode__(self):
+        return self.name
+
+
+class TypeaheadResource(Resource):
+    """
+    Base class for read-only resources that suggest objects whose names
+    match what a user has typed so far
+
+    Subclasses set ``model``, ``id_field`` and ``name_field`` and can
+    override ``get_queryset`` to limit the objects that are suggested.
+    ``name_field`` must be a field on ``model`` rather than a lookup
+    that spans relationships, so the matching can use the indexes on
+    the name column.
+
+    Names that start with the query are returned first, in alphabetical
+    order.  If there are fewer of these than the requested limit, the
+    rest of the results are names that contain the query or, if
+    ``STORYBASE_TYPEAHEAD_TRIGRAM`` is enabled, names that are similar
+    to the query, most similar first.
+
+    Query parameters:
+    q -- The text to match
+    limit -- The maximum number of suggestions to return
+    lang -- Language code of the names to match.  Defaults to the
+            active language.
+
+    """
+    model = None
+    id_field = 'pk'
+    name_field = 'name'
+
+    id = fields.CharField(attribute='id')
+    name = fields.CharField(attribute='name')
+
+    class Meta:
+        object_class = TypeaheadObject
+        allowed_methods = ['get']
+        detail_allowed_methods = []
+        include_resource_uri = False
+        limit = 10
+        max_limit = 50
+        authentication = Authentication()
+        authorization = ReadOnlyAuthorization()
+        cache = SimpleCache(timeout=settings.STORYBASE_TYPEAHEAD_CACHE_TIMEOUT,
+                            public=True,
+                            varies=['Accept', 'Accept-Language'])
+
+    def get_queryset(self, language):
+        return self.model._default_manager.all()
+
+    def get_request_language(self, request):
+        language = request.GET.get('lang', translation.get_language())
+        languages = dict(settings.LANGUAGES)
+        for code in (language, language.split('-')[0]):
+            if code in languages:
+                return code
+        return settings.LANGUAGE_CODE
+
+    def get_request_limit(self, request):
+        try:
+            limit = int(request.GET.get('limit', self._meta.limit))
+        except ValueError:
+            raise BadRequest("Invalid limit '%s' provided. Please provide a "
+                             "positive integer." % request.GET['limit'])
+        if limit <= 0 or limit > self._meta.max_limit:
+            limit = self._meta.max_limit
+        return limit
+
+    def get_matches(self, q, language, limit):
+        """
+        Get a list of (id, name) tuples for the objects that match a
+        query
+        """
+        name_field = self.name_field
+        queryset = self.get_queryset(language)
+        matches = list(queryset.filter(**{"%s__istartswith" % name_field: q})\
+                               .order_by(name_field)\
+                               .values_list(self.id_field, name_field)[:limit])
+        if len(matches) == limit:
+            return matches
+
+        queryset = queryset.exclude(**{"%s__istartswith" % name_field: q})
+        if settings.STORYBASE_TYPEAHEAD_TRIGRAM:
+            # Rank by the similarity of the names' trigrams. This requires
+            # PostgreSQL's pg_trgm extension.
+            column = "%s.%s" % (
+                connection.ops.quote_name(self.model._meta.db_table),
+                connection.ops.quote_name(
+                    self.model._meta.get_field(name_field).column))
+            queryset = queryset.extra(
+                select={'similarity': "similarity(%s, %%s)" % column},
+                select_params=(q,),
+                where=["%s %%%% %%s" % column], params=(q,))\
+                .order_by('-similarity', name_field)
+            rest = [(obj_id, name) for obj_id, name, similarity
+                    in queryset.values_list(self.id_field, name_field,
+                                            'similarity')\
+                               [:limit - len(matches)]]
+        else:
+            rest = list(queryset.filter(**{"%s__icontains" % name_field: q})\
+                                .order_by(name_field)\
+                                .values_list(self.id_field, name_field)\
+                                [:limit - len(matches)])
+
+        return matches + rest
+
+    def obj_get_list(self, bundle, **kwargs):
+        """
+        Get the suggestions for the request's query
+
+        Tastypie's ``get_list`` doesn't use the resource's cache, so the
+        suggestions for each query, language and limit are cached here.
+
+        """
+        request = bundle.request
+        q = request.GET.get('q', '').strip()
+        if not q:
+            return []
+
+        language = self.get_request_language(request)
+        limit = self.get_request_limit(request)
+        # The query can contain characters that aren't allowed in cache
+        # keys, so hash it
+        cache_key = self.generate_cache_key('list',
+            q=hashlib.md5(q.encode('utf-8')).hexdigest(),
+            language=language, limit=limit, **kwargs)
+        obj_list = self._meta.cache.get(cache_key)
+        if obj_list is None:
+            obj_list = [TypeaheadObject(id=obj_id, name=name)
+                        for obj_id, name
+                        in self.get_matches(q, language, limit)]
+            self._meta.cache.set(cache_key, obj_list)
+
+        return obj_list
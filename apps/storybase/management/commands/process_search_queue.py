@@ -0,0 +1,53 @@
+import logging
+from optparse import make_option
+import time
+
+from django.core.management.base import BaseCommand
+
+from storybase.models import SearchQueueItem
+
+logger = logging.getLogger('storybase.search.management')
+
+class Command(BaseCommand):
+    help = ("Update the search index for objects queued by the\n"
+            "QueuedSignalProcessor\n\n"
+            "This can be run from a cron job, or as a long-running worker\n"
+            "by specifying the --interval option.\n\n"
+            )
+    option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=500,
+                help="Number of queued objects to index at a time"),
+            make_option('--interval',
+                action='store',
+                type='int',
+                dest='interval',
+                default=None,
+                help=("Keep running, checking the queue after waiting this "
+                      "many seconds")),
+            )
+
+    def process_queue(self, batch_size, verbosity):
+        total = 0
+        processed = SearchQueueItem.objects.process(batch_size=batch_size)
+        while processed:
+            total += processed
+            processed = SearchQueueItem.objects.process(batch_size=batch_size)
+
+        message = "%d queued objects indexed" % (total)
+        logger.info(message)
+        if verbosity > 1:
+            self.stdout.write(message + "\n")
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        interval = options.get('interval')
+        verbosity = int(options.get('verbosity'))
+
+        self.process_queue(batch_size, verbosity)
+        while interval:
+            time.sleep(interval)
+            self.process_queue(batch_size, verbosity)
@@ -0,0 +1,151 @@
+from datetime import datetime
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from haystack import connections
+from haystack.constants import DEFAULT_ALIAS
+from haystack.query import SearchQuerySet
+
+from storybase.models import SearchIndexMark
+
+logger = logging.getLogger('storybase.search.management')
+
+class Command(BaseCommand):
+    help = ("Incrementally update the search index\n\n"
+            "Only objects that have changed since the last time this\n"
+            "command was run are reindexed.  Changed objects that should\n"
+            "no longer be in the index, such as unpublished stories, are\n"
+            "removed from it.  The first run indexes everything.\n\n"
+            "This is intended to be run from a cron job.\n\n"
+            )
+    option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=100,
+                help="Number of objects to index at a time"),
+            make_option('--remove',
+                action='store_true',
+                dest='remove',
+                default=False,
+                help=("Also remove objects that have been deleted from the "
+                      "database from the index.  This requires reading all "
+                      "identifiers from the index.")),
+            make_option('--using',
+                action='store',
+                dest='using',
+                default=DEFAULT_ALIAS,
+                help="The Haystack connection to update"),
+            make_option('--reset',
+                action='store_true',
+                dest='reset',
+                default=False,
+                help="Ignore the stored high-water mark and index everything"),
+            )
+
+    def get_identifier(self, model, pk):
+        return u"%s.%s.%s" % (model._meta.app_label, model._meta.module_name,
+                              pk)
+
+    def get_changed_pks(self, index, using, start_date):
+        """
+        Get the primary keys of objects that might need to be reindexed
+        """
+        if start_date is None:
+            qs = index.index_queryset(using=using).prefetch_related(None)
+        elif hasattr(index, 'updated_queryset'):
+            qs = index.updated_queryset(start_date, using=using)
+        else:
+            updated_field = index.get_updated_field()
+            qs = index.get_model()._default_manager.filter(
+                **{"%s__gte" % updated_field: start_date})
+
+        return list(qs.order_by('pk').values_list('pk', flat=True))
+
+    def update_chunk(self, index, backend, using, pks):
+        """
+        Reindex a chunk of objects, removing the ones that shouldn't be
+        in the index
+
+        Returns a tuple of the number of updated and removed objects.
+
+        """
+        model = index.get_model()
+        objects = list(index.index_queryset(using=using).filter(pk__in=pks))
+        indexed_pks = set([obj.pk for obj in objects])
+        backend.update(index, [obj for obj in objects
+                               if index.should_update(obj)])
+        removed_pks = [pk for pk in pks if pk not in indexed_pks]
+        for pk in removed_pks:
+            backend.remove(self.get_identifier(model, pk))
+
+        return (len(indexed_pks), len(removed_pks))
+
+    def remove_deleted(self, index, backend, using, batch_size):
+        """
+        Remove objects from the index that no longer exist in the database
+        """
+        model = index.get_model()
+        index_pks = [int(pk) for pk in
+                     SearchQuerySet(using=using).models(model)\
+                                                .values_list('pk', flat=True)]
+        removed = 0
+        for i in range(0, len(index_pks), batch_size):
+            pks = index_pks[i:i + batch_size]
+            existing_pks = set(index.index_queryset(using=using)\
+                                    .prefetch_related(None)\
+                                    .filter(pk__in=pks)\
+                                    .values_list('pk', flat=True))
+            for pk in pks:
+                if pk not in existing_pks:
+                    backend.remove(self.get_identifier(model, pk))
+                    removed += 1
+
+        return removed
+
+    def update_index(self, index, using, options):
+        model = index.get_model()
+        batch_size = options.get('batch_size')
+        verbosity = int(options.get('verbosity'))
+        backend = connections[using].get_backend()
+
+        if index.get_updated_field() is None:
+            if verbosity > 1:
+                self.stdout.write("Skipping %s, no updated field\n" %
+                                  model.__name__)
+            return
+
+        start_date = None
+        if not options.get('reset'):
+            start_date = SearchIndexMark.objects.get_mark(model)
+        # Record the time before looking for changes so changes made while
+        # we're indexing are picked up on the next run
+        started = datetime.now()
+
+        pks = self.get_changed_pks(index, using, start_date)
+        updated = removed = 0
+        for i in range(0, len(pks), batch_size):
+            (chunk_updated, chunk_removed) = self.update_chunk(index,
+                backend, using, pks[i:i + batch_size])
+            updated += chunk_updated
+            removed += chunk_removed
+
+        if options.get('remove'):
+            removed += self.remove_deleted(index, backend, using, batch_size)
+
+        SearchIndexMark.objects.set_mark(model, started)
+
+        message = "%s: %d objects indexed, %d objects removed" % (
+            model.__name__, updated, removed)
+        logger.info(message)
+        if verbosity > 1:
+            self.stdout.write(message + "\n")
+
+    def handle(self, *args, **options):
+        using = options.get('using')
+        unified_index = connections[using].get_unified_index()
+        for model in unified_index.get_indexed_models():
+            self.update_index(unified_index.get_index(model), using, options)
@@ -3,6 +3,9 @@ Custom QuerySet and Manager classes and mixins used across the different
 StoryBase apps.
 """
 from django.db import models
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
+
+from model_utils.managers import InheritanceManager, InheritanceQuerySet
 
 
 class FeaturedQuerySetMixin(object):
@@ -39,8 +42,81 @@ class PublishedQuerySetMixin(object):
             return self.filter(status__in=published_statuses)
 
 
+class TranslatedQuerySetMixin(object):
+    """
+    Mixin for custom QuerySet implementations for models that inherit
+    from TranslatedModel
+    """
+    _translations_language = None
+    _prefetch_translations = False
+
+    def with_translations(self, language=None):
+        """
+        Return a QuerySet that retrieves the translations of its items in
+        bulk
+
+        Translations are fetched with one query for each chunk of rows
+        rather than up to four queries for each item the first time one
+        of its translated fields is accessed.
+
+        Arguments:
+        language -- the language code for which translations should be
+                    resolved.  Defaults to the language that is active
+                    when the QuerySet is evaluated.
+
+        """
+        return self._clone(_prefetch_translations=True,
+                           _translations_language=language)
+
+    def _clone(self, *args, **kwargs):
+        kwargs.setdefault('_prefetch_translations',
+                          self._prefetch_translations)
+        kwargs.setdefault('_translations_language',
+                          self._translations_language)
+        return super(TranslatedQuerySetMixin, self)._clone(*args, **kwargs)
+
+    def iterator(self):
+        iterator = super(TranslatedQuerySetMixin, self).iterator()
+        if not self._prefetch_translations:
+            for obj in iterator:
+                yield obj
+            return
+
+        # Avoid a circular import
+        from storybase.models import prefetch_translations
+
+        chunk = []
+        for obj in iterator:
+            chunk.append(obj)
+            if len(chunk) == GET_ITERATOR_CHUNK_SIZE:
+                prefetch_translations(chunk, self._translations_language)
+                for chunk_obj in chunk:
+                    yield chunk_obj
+                chunk = []
+
+        prefetch_translations(chunk, self._translations_language)
+        for chunk_obj in chunk:
+            yield chunk_obj
+
+
+class TranslatedQuerySet(TranslatedQuerySetMixin, models.query.QuerySet):
+    """QuerySet for models that inherit from TranslatedModel"""
+    # Implementation is in the mixin
+    pass
+
+
+class TranslatedInheritanceQuerySet(TranslatedQuerySetMixin,
+        InheritanceQuerySet):
+    """
+    QuerySet for models that inherit from TranslatedModel and whose
+    subclasses are retrieved with ``select_subclasses()``
+    """
+    # Implementation is in the mixin
+    pass
+
+
 class FeaturedQuerySet(FeaturedQuerySetMixin, PublishedQuerySetMixin,
-        models.query.QuerySet):
+        TranslatedQuerySetMixin, models.query.QuerySet):
     """
     QuerySet that provides utility methods for models that
     inherit from PublishedModel and have an on_homepage flag
@@ -58,7 +134,33 @@ class PublishedManagerMixin(object):
         return self.get_query_set().published(published_statuses)
 
 
-class FeaturedManager(PublishedManagerMixin, models.Manager):
+class TranslatedManagerMixin(object):
+    """
+    Mixin that proxies methods to its queryset that mixes in
+    TranslatedQuerySetMixin
+    """
+    def with_translations(self, language=None):
+        return self.get_query_set().with_translations(language)
+
+
+class TranslatedManager(TranslatedManagerMixin, models.Manager):
+    """Manager for models that inherit from TranslatedModel"""
+    def get_query_set(self):
+        return TranslatedQuerySet(self.model, using=self._db)
+
+
+class TranslatedInheritanceManager(TranslatedManagerMixin,
+        InheritanceManager):
+    """
+    Version of django-model-utils' InheritanceManager for models that
+    inherit from TranslatedModel
+    """
+    def get_query_set(self):
+        return TranslatedInheritanceQuerySet(self.model)
+
+
+class FeaturedManager(PublishedManagerMixin, TranslatedManagerMixin,
+        models.Manager):
     """Add ability to query featured content"""
     def get_query_set(self):
         return FeaturedQuerySet(self.model, using=self._db)
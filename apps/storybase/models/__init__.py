@@ -1,5 +1,9 @@
 from storybase.models.base import (LicensedModel, PublishedModel,
    TimestampedModel, WeightedModel, set_date_on_published)
 from storybase.models.dirtyfields import DirtyFieldsMixin, TzDirtyFieldsMixin
-from storybase.models.permission import PermissionMixin
-from storybase.models.translation import TranslatedModel, TranslationModel
+from storybase.models.permission import (PermissionMixin,
+    disable_perm_cache, enable_perm_cache, get_perm_cache, prefetch_perms)
+from storybase.models.translation import (TranslatedModel, TranslationModel,
+    prefetch_translations)
+from storybase.models.search import SearchIndexMark, SearchQueueItem
+from storybase.models.upload import ChunkedUpload
@@ -34,17 +34,50 @@ except ImportError:
 # THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 # Adapted from http://stackoverflow.com/questions/110803/dirty-fields-in-django
-from django.db.models.signals import post_save
+from django.db.models.signals import class_prepared, post_save
 
 class DirtyFieldsMixin(object):
+    """
+    Track which fields of a model instance have changed since it was
+    loaded or last saved
+
+    Only the fields listed in ``dirty_fields`` are tracked.  If it is
+    None, all local fields that aren't relations are tracked.  Fields
+    that were deferred when the instance was loaded aren't tracked, so
+    checking for changes doesn't load them.
+
+    """
+    dirty_fields = None
+
     def __init__(self, *args, **kwargs):
         super(DirtyFieldsMixin, self).__init__(*args, **kwargs)
-        post_save.connect(reset_state, sender=self.__class__, 
-                            dispatch_uid='%s-DirtyFieldsMixin-sweeper' % self.__class__.__name__)
         reset_state(sender=self.__class__, instance=self)
 
+    @classmethod
+    def _get_dirty_field_names(cls):
+        """Get the names of the tracked fields"""
+        # Look in the class' own dictionary so subclasses compute
+        # their own list
+        names = cls.__dict__.get('_dirty_field_names')
+        if names is None:
+            if cls.dirty_fields is None:
+                # Use the concrete model's fields as deferred classes are
+                # proxies without local fields
+                names = [f.name for f in
+                         cls._meta.concrete_model._meta.local_fields
+                         if not f.rel]
+            else:
+                names = list(cls.dirty_fields)
+            cls._dirty_field_names = names
+        return names
+
     def _as_dict(self):
-        return dict([(f.name, getattr(self, f.name)) for f in self._meta.local_fields if not f.rel])
+        # Deferred fields aren't in the instance's dictionary until
+        # they're loaded
+        state = self.__dict__
+        return dict([(name, getattr(self, name))
+                     for name in self._get_dirty_field_names()
+                     if name in state])
 
     @classmethod
     def _value_changed(cls, old, new):
@@ -83,3 +116,18 @@ class TzDirtyFieldsMixin(DirtyFieldsMixin):
 
 def reset_state(sender, instance, **kwargs):
     instance._original_state = instance._as_dict()
+
+def connect_reset_state(sender, **kwargs):
+    """
+    Reset the tracked state of instances of models that use
+    ``DirtyFieldsMixin`` after they're saved
+
+    The signal handler is connected once for each model class, when
+    the class is created, rather than each time a model instance is
+    created.
+    """
+    if issubclass(sender, DirtyFieldsMixin):
+        post_save.connect(reset_state, sender=sender,
+            dispatch_uid='%s-DirtyFieldsMixin-sweeper' % sender.__name__)
+
+class_prepared.connect(connect_reset_state)
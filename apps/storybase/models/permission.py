@@ -1,5 +1,129 @@
+from collections import defaultdict
+import threading
+
+from django.core.signals import request_finished, request_started
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+_local = threading.local()
+
+
+def enable_perm_cache(**kwargs):
+    """
+    Start caching the results of permission checks in the current thread
+
+    This is connected to the ``request_started`` signal so permission
+    checks are cached for the duration of a request.
+
+    """
+    _local.perm_cache = {}
+
+
+def disable_perm_cache(**kwargs):
+    """Stop caching the results of permission checks in the current thread"""
+    _local.perm_cache = None
+
+
+def get_perm_cache():
+    """
+    Get the current thread's permission cache
+
+    Returns None if permission checks aren't being cached.
+
+    """
+    return getattr(_local, 'perm_cache', None)
+
+
+def clear_perm_cache(**kwargs):
+    """
+    Discard cached permission checks
+
+    This is connected to the model signals so checks made after a
+    model instance is saved or deleted, or a many-to-many relation is
+    changed, during a request reflect the change.
+
+    """
+    cache = get_perm_cache()
+    if cache:
+        cache.clear()
+
+
+request_started.connect(enable_perm_cache)
+request_finished.connect(disable_perm_cache)
+post_save.connect(clear_perm_cache)
+post_delete.connect(clear_perm_cache)
+m2m_changed.connect(clear_perm_cache)
+
+
+def _perm_cache_key(actor, model, pk, perm):
+    return (actor.__class__.__name__.lower(), getattr(actor, 'pk', None),
+            model, pk, perm)
+
+
+def prefetch_perms(actor, objects, perms):
+    """
+    Check an actor's permissions for a list of objects using a constant
+    number of queries
+
+    For each model in ``objects`` and each permission, the objects for
+    which ``actor`` has the permission are found with a single query
+    using the model's ``perm_q``.  Permissions that can't be checked
+    at the database level fall back to calling ``has_perm`` on each
+    object.  If permission checks are being cached, the results are
+    stored so later calls to ``has_perm`` for these objects don't hit
+    the database.
+
+    Returns a list of the objects for which ``actor`` has all of
+    ``perms``.
+
+    """
+    objects = list(objects)
+    results = {}
+    objs_by_model = defaultdict(list)
+    for obj in objects:
+        if (getattr(obj, '_meta', None) is not None and obj.pk is not None
+                and hasattr(obj, 'perm_q')):
+            objs_by_model[obj._meta.concrete_model].append(obj)
+
+    for model, model_objs in objs_by_model.items():
+        pks = set(obj.pk for obj in model_objs)
+        for perm in perms:
+            q = model.perm_q(actor, perm)
+            if q is None:
+                continue
+            allowed = set(model._base_manager.filter(q, pk__in=pks)\
+                                              .values_list('pk', flat=True))
+            for pk in pks:
+                results[_perm_cache_key(actor, model, pk, perm)] = (
+                    pk in allowed)
+
+    cache = get_perm_cache()
+    if cache is not None:
+        cache.update(results)
+
+    def check(obj, perm):
+        if getattr(obj, '_meta', None) is not None:
+            key = _perm_cache_key(actor, obj._meta.concrete_model, obj.pk,
+                                  perm)
+            if key in results:
+                return results[key]
+        return obj.has_perm(actor, perm)
+
+    return [obj for obj in objects
+            if hasattr(obj, 'has_perm')
+            and all(check(obj, perm) for perm in perms)]
+
+
 class PermissionMixin(object):
-    """Interface for model-instance permissions"""
+    """
+    Interface for model-instance permissions
+
+    When permission checks are being cached, the result of ``has_perm``
+    for a saved model instance is cached by actor, model, primary key and
+    permission, so checking the same permission on another instance of
+    the same object doesn't hit the database again.
+
+    """
     def has_perms(self, user, perms):
         for perm in perms:
             if not self.has_perm(user, perm):
@@ -8,6 +132,21 @@ class PermissionMixin(object):
             return True
 
     def has_perm(self, actor, perm):
+        cache = get_perm_cache()
+        key = None
+        if (cache is not None and getattr(self, '_meta', None) is not None
+                and self.pk is not None):
+            key = _perm_cache_key(actor, self._meta.concrete_model, self.pk,
+                                  perm)
+            if key in cache:
+                return cache[key]
+
+        result = self._has_perm(actor, perm)
+        if key is not None:
+            cache[key] = result
+        return result
+
+    def _has_perm(self, actor, perm):
         actor_class_name = actor.__class__.__name__.lower()
         func_name = "%s_can_%s" % (actor_class_name, perm)
         func = getattr(self, func_name, None)
@@ -15,3 +154,45 @@ class PermissionMixin(object):
             return func(actor)
         else:
             return False
+
+    @classmethod
+    def perms_q(cls, user, perms):
+        """
+        Get a ``Q`` object that limits a QuerySet of this model to the
+        instances for which a user has a set of permissions
+
+        Returns None if any of the permissions can't be checked at the
+        database level.  In that case, callers should fall back to
+        calling ``has_perms`` on each instance.
+
+        """
+        q = Q()
+        for perm in perms:
+            perm_q = cls.perm_q(user, perm)
+            if perm_q is None:
+                return None
+            q = q & perm_q
+        return q
+
+    @classmethod
+    def perm_q(cls, actor, perm):
+        """
+        Get a ``Q`` object that limits a QuerySet of this model to the
+        instances for which an actor has a particular permission
+
+        This is the QuerySet equivalent of ``has_perm`` and calls through to
+        a classmethod named ``<actor>_can_<perm>_q``.  Returns None if there
+        is an ``<actor>_can_<perm>`` method without a matching ``_q``
+        classmethod.
+
+        """
+        actor_class_name = actor.__class__.__name__.lower()
+        func_name = "%s_can_%s" % (actor_class_name, perm)
+        func = getattr(cls, "%s_q" % func_name, None)
+        if func is not None:
+            return func(actor)
+        elif hasattr(cls, func_name):
+            return None
+        else:
+            # Like ``has_perm``, deny permissions that aren't defined
+            return Q(pk__in=[])
@@ -0,0 +1,156 @@
+"""Models for deferred search index updates"""
+from django.db import models
+from django.db.models.loading import get_model
+
+
+class SearchQueueItemManager(models.Manager):
+    def enqueue(self, instance):
+        """
+        Mark a model instance as needing to be updated in the search index
+
+        Only one queue item is kept for each object, so repeated saves of
+        the same object between flushes of the queue are coalesced into a
+        single index update.
+
+        """
+        return self.get_or_create(app_label=instance._meta.app_label,
+            module_name=instance._meta.module_name,
+            object_id=instance.pk)
+
+    def process(self, batch_size=500):
+        """
+        Update the search index for the oldest queued objects
+
+        Queued objects that still belong in the index, as determined by the
+        index's ``index_queryset()``, are sent to the search backend in a
+        single bulk update per model.  Objects that have been deleted or
+        that no longer belong in the index are removed from it.
+
+        Returns the number of queue items that were processed.
+
+        """
+        # HACK: Import here to avoid circular import
+        # See http://stackoverflow.com/a/17364366/386210
+        from haystack import connections, connection_router
+        from haystack.exceptions import NotHandled
+
+        items = list(self.order_by('created')[:batch_size])
+        if not items:
+            return 0
+
+        # Remove the items from the queue before touching the index.
+        # Anything that changes while we're updating the index will
+        # be queued again and picked up on the next run.
+        self.filter(pk__in=[item.pk for item in items]).delete()
+
+        items_by_model = {}
+        for item in items:
+            items_by_model.setdefault((item.app_label, item.module_name),
+                                      []).append(item)
+
+        try:
+            for (app_label, module_name), model_items in items_by_model.items():
+                model = get_model(app_label, module_name)
+                if model is None:
+                    continue
+
+                for using in connection_router.for_write():
+                    try:
+                        index = connections[using].get_unified_index().get_index(model)
+                    except NotHandled:
+                        continue
+
+                    backend = connections[using].get_backend()
+                    objects = list(index.index_queryset(using=using).filter(
+                        pk__in=[item.object_id for item in model_items]))
+                    indexed_ids = set([obj.pk for obj in objects])
+                    backend.update(index, [obj for obj in objects
+                                           if index.should_update(obj)])
+                    for item in model_items:
+                        if item.object_id not in indexed_ids:
+                            backend.remove(item.identifier)
+        except Exception:
+            # Put the items back in the queue so they can be retried
+            for item in items:
+                self.get_or_create(app_label=item.app_label,
+                    module_name=item.module_name,
+                    object_id=item.object_id)
+            raise
+
+        return len(items)
+
+
+class SearchQueueItem(models.Model):
+    """An object that needs to be updated or removed from the search index"""
+    app_label = models.CharField(max_length=100)
+    module_name = models.CharField(max_length=100)
+    object_id = models.PositiveIntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = SearchQueueItemManager()
+
+    class Meta:
+        app_label = 'storybase'
+        unique_together = (('app_label', 'module_name', 'object_id'),)
+
+    def __unicode__(self):
+        return self.identifier
+
+    @property
+    def identifier(self):
+        """
+        Haystack identifier of the queued object
+
+        This is in the same format as the one returned by
+        ``haystack.utils.get_identifier()`` and can be passed to a
+        backend's ``remove()`` method even after the object has been
+        deleted.
+
+        """
+        return u"%s.%s.%s" % (self.app_label, self.module_name,
+                              self.object_id)
+
+
+class SearchIndexMarkManager(models.Manager):
+    def get_mark(self, model):
+        """
+        Get the time the index for a model was last incrementally updated
+
+        Returns None if the index has never been updated.
+
+        """
+        try:
+            return self.get(app_label=model._meta.app_label,
+                            module_name=model._meta.module_name).updated
+        except SearchIndexMark.DoesNotExist:
+            return None
+
+    def set_mark(self, model, updated):
+        """Record the time the index for a model was incrementally updated"""
+        mark, created = self.get_or_create(app_label=model._meta.app_label,
+            module_name=model._meta.module_name,
+            defaults={'updated': updated})
+        if not created:
+            mark.updated = updated
+            mark.save()
+        return mark
+
+
+class SearchIndexMark(models.Model):
+    """
+    High-water mark for incremental updates of a model's search index
+
+    Objects edited on or after ``updated`` still need to be reindexed.
+    """
+    app_label = models.CharField(max_length=100)
+    module_name = models.CharField(max_length=100)
+    updated = models.DateTimeField()
+
+    objects = SearchIndexMarkManager()
+
+    class Meta:
+        app_label = 'storybase'
+        unique_together = (('app_label', 'module_name'),)
+
+    def __unicode__(self):
+        return u"%s.%s" % (self.app_label, self.module_name)
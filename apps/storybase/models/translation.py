@@ -16,6 +16,7 @@ class TranslatedModel(models.Model):
     translated_fields = []
     """List of field names to be translated"""
     _translation_cache = None
+    _translation_languages = None
 
     def __init__(self, *args, **kwargs):
         super(TranslatedModel, self).__init__(*args, **kwargs)
@@ -94,9 +95,50 @@ class TranslatedModel(models.Model):
 
     def clear_translation_cache(self):
         self._translation_cache = {}
+        self._translation_languages = None
 
     def set_translation_cache_item(self, code, obj):
         self._translation_cache[code] = obj
+        if (self._translation_languages is not None and
+                obj.language not in self._translation_languages):
+            self._translation_languages.append(obj.language)
+
+    def prefetch_translation(self, translations, language=None):
+        """
+        Fill the translation cache from an already-retrieved list of
+        translations
+
+        The translation is selected using the same fallback chain as
+        ``__getattribute__``: the requested language, its base language,
+        the default language and then any translation.
+
+        Arguments:
+        translations -- list of translation model instances for this
+                        model instance
+        language -- the language code used as the cache key.  Defaults to
+                    the currently active language.
+
+        """
+        if language is None:
+            language = translation.get_language()
+        # Remember the available languages so ``get_languages`` doesn't
+        # have to query for them
+        self._translation_languages = [trans.language
+                                       for trans in translations]
+        by_language = dict([(trans.language, trans)
+                            for trans in translations])
+        for code in (language, language.split('-')[0],
+                     settings.LANGUAGE_CODE):
+            if code in by_language:
+                translated_object = by_language[code]
+                break
+        else:
+            if not translations:
+                # Leave the cache empty so the missing translation is
+                # handled (and logged) by ``__getattribute__``
+                return
+            translated_object = translations[0]
+        self.set_translation_cache_item(language, translated_object)
 
     # TODO: Use this within the create_* functions in the different
     # applications, e.g. storybase_story.models.create_story
@@ -151,6 +193,8 @@ class TranslatedModel(models.Model):
 
     def get_languages(self):
         """Get a list of translated languages for the model instance"""
+        if self._translation_languages is not None:
+            return list(self._translation_languages)
         translated_manager = self._get_translated_manager()
         return [trans.language 
                 for trans in translated_manager.all()]
@@ -188,6 +232,57 @@ class TranslatedModel(models.Model):
         abstract = True
 
 
+def prefetch_translations(objects, language=None):
+    """
+    Retrieve the translations for a list of ``TranslatedModel`` instances
+
+    Rather than running up to four queries per instance the first time a
+    translated field is accessed, this fetches the translations for all
+    instances of each model class in a single query and populates each
+    instance's translation cache.
+
+    Arguments:
+    objects -- a list of ``TranslatedModel`` instances.  The instances
+               can be of different classes, for example the result of
+               ``InheritanceQuerySet.select_subclasses()``.
+    language -- the language code for which translations should be
+                resolved.  Defaults to the currently active language.
+
+    """
+    if language is None:
+        language = translation.get_language()
+
+    objects_by_class = {}
+    for obj in objects:
+        if obj.pk is None:
+            continue
+        objects_by_class.setdefault(obj.__class__, []).append(obj)
+
+    for model_class, class_objects in objects_by_class.items():
+        translation_class = model_class.translation_class
+        if translation_class._meta.abstract:
+            # The translations are stored on the subclasses, e.g. for
+            # ``Asset``. Fall back to retrieving them lazily.
+            continue
+        # The foreign key may point to a parent class of the model, e.g.
+        # ``HtmlAssetTranslation.asset`` points to ``Asset``
+        fk_fields = [field for field in translation_class._meta.fields
+                     if field.rel and issubclass(model_class, field.rel.to)]
+        if not fk_fields:
+            continue
+        fk_field = fk_fields[0]
+        filter_kwargs = {
+            "%s__in" % fk_field.name: [obj.pk for obj in class_objects],
+        }
+        translations = {}
+        for trans in translation_class.objects.filter(**filter_kwargs)\
+                                              .order_by('pk'):
+            translations.setdefault(getattr(trans, fk_field.attname),
+                                    []).append(trans)
+        for obj in class_objects:
+            obj.prefetch_translation(translations.get(obj.pk, []), language)
+
+
 class TranslationModel(models.Model):
     """Base class for model that encapsulates translated fields"""
     translation_id = UUIDField(auto=True)
@@ -0,0 +1,129 @@
+"""Models for uploading large files in chunks"""
+from datetime import timedelta
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import UploadedFile
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from uuidfield.fields import UUIDField
+
+from storybase.models.permission import PermissionMixin
+
+
+class ChunkedUploadManager(models.Manager):
+    def delete_expired(self):
+        """
+        Delete uploads that haven't been added to within
+        ``STORYBASE_CHUNKED_UPLOAD_EXPIRY`` seconds, along with their
+        partial files
+        """
+        cutoff = timezone.now() - timedelta(
+            seconds=settings.STORYBASE_CHUNKED_UPLOAD_EXPIRY)
+        for upload in self.filter(last_edited__lt=cutoff):
+            upload.delete()
+
+
+class ChunkedUpload(PermissionMixin, models.Model):
+    """
+    A file that is uploaded in pieces
+
+    The size of the file is declared up front and the pieces are
+    appended, in order, to a temporary file.  If a request fails, the
+    client can retrieve ``offset`` and resume from there.  Once the
+    upload is complete, it can be used in place of a file or a data URI
+    when creating or updating assets and data sets.
+
+    """
+    upload_id = UUIDField(auto=True, db_index=True)
+    owner = models.ForeignKey(User, related_name="chunked_uploads",
+                              blank=True, null=True)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    last_edited = models.DateTimeField(auto_now=True)
+
+    objects = ChunkedUploadManager()
+
+    class Meta:
+        app_label = 'storybase'
+
+    def __unicode__(self):
+        return self.filename
+
+    @property
+    def path(self):
+        """Path of the temporary file containing the uploaded data"""
+        upload_dir = settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir()
+        return os.path.join(upload_dir, "%s.upload" % self.upload_id)
+
+    @property
+    def complete(self):
+        return self.offset == self.size
+
+    def append(self, stream, length, chunk_size=64 * 1024):
+        """
+        Append data read from a file-like object to the upload
+
+        The data is copied ``chunk_size`` bytes at a time so the whole
+        piece is never held in memory.  Raises ``ValueError`` if the
+        data would make the file larger than its declared size or if
+        ``stream`` has fewer than ``length`` bytes.  In that case,
+        ``offset`` is unchanged and the piece can be sent again.
+
+        """
+        if self.offset + length > self.size:
+            raise ValueError("Upload would exceed the declared size of "
+                             "%d bytes" % self.size)
+
+        remaining = length
+        with open(self.path, 'ab') as f:
+            # Discard anything written by an earlier attempt that
+            # failed part way through
+            f.truncate(self.offset)
+            while remaining > 0:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                f.write(chunk)
+                remaining -= len(chunk)
+
+        if remaining > 0:
+            raise ValueError("Expected %d bytes but only received %d" %
+                             (length, length - remaining))
+
+        self.offset += length
+        self.save()
+
+    def get_uploaded_file(self):
+        """Get an ``UploadedFile`` for the completed upload"""
+        return UploadedFile(file=open(self.path, 'rb'), name=self.filename,
+                            content_type=self.content_type or None,
+                            size=self.size)
+
+    def delete(self, *args, **kwargs):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        super(ChunkedUpload, self).delete(*args, **kwargs)
+
+    def user_can_change(self, user):
+        return user.is_active and user == self.owner
+
+    @classmethod
+    def user_can_change_q(cls, user):
+        if not user.is_active:
+            return Q(pk__in=[])
+        return Q(owner=user)
+
+    def user_can_delete(self, user):
+        return self.user_can_change(user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
@@ -218,3 +218,81 @@ class RealtimeSignalProcessor(HaystackRealtimeSignalProcessor):
     def teardown(self):
         self._teardown_story()
         self._teardown_help()
+
+
+class QueuedSignalProcessor(RealtimeSignalProcessor):
+    """
+    Signal processor that defers index updates to a queue
+
+    Instead of updating the search index inside the signal handlers,
+    this records the objects that need to be reindexed in the
+    ``SearchQueueItem`` table.  Repeated changes to the same object are
+    coalesced into a single queue item.  The queue is flushed with
+    bulk backend updates by the ``process_search_queue`` management
+    command.
+
+    To use it, set ``HAYSTACK_SIGNAL_PROCESSOR`` to
+    ``'storybase.search.signals.QueuedSignalProcessor'`` and run
+    ``process_search_queue`` from a cron job or as a long-running worker.
+    """
+
+    def enqueue(self, instance):
+        MySearchQueueItem = get_model('storybase', 'SearchQueueItem')
+        MySearchQueueItem.objects.enqueue(instance)
+
+    def handle_method(self, method_name, sender, instance, **kwargs):
+        """
+        Queue the objects affected by a change to a model instance
+
+        ``method_name`` is the name of a ``SearchIndex`` method that
+        takes the changed instance and returns the indexed objects that
+        need to be updated.
+        """
+        if kwargs.get('action') in ('pre_add', 'pre_remove', 'pre_clear'):
+            # The signal is m2m_changed.  We only want to update
+            # on the post actions
+            return
+
+        objects = set()
+        using_backends = self.connection_router.for_write(instance=instance)
+        for using in using_backends:
+            try:
+                index = self._get_index(using, sender)
+            except NotHandled:
+                continue
+
+            if method_name is None:
+                objects.add(instance)
+            else:
+                objects.update(getattr(index, method_name)(instance))
+
+        for obj in objects:
+            self.enqueue(obj)
+
+    def handle_save(self, sender, instance, **kwargs):
+        # Look up the index by the instance's class rather than the sender
+        # because the sender of ``m2m_changed`` is the intermediate model
+        self.handle_method(None, instance.__class__, instance, **kwargs)
+
+    def handle_delete(self, sender, instance, **kwargs):
+        self.handle_method(None, instance.__class__, instance, **kwargs)
+
+    def handle_asset_translation_save(self, sender, instance, **kwargs):
+        self.handle_method('asset_translation_objects', sender, instance, **kwargs)
+
+    def handle_asset_relation_save(self, sender, instance, **kwargs):
+        self.handle_method('asset_relation_objects', sender, instance, **kwargs)
+
+    def handle_cache_story_for_delete(self, sender, instance, **kwargs):
+        # The story needs to be cached right away, so bypass the queue
+        super(QueuedSignalProcessor, self).handle_method(
+            'cache_story_for_delete', sender, instance, **kwargs)
+
+    def handle_section_translation_save(self, sender, instance, **kwargs):
+        self.handle_method('section_translation_objects', sender, instance, **kwargs)
+
+    def handle_translation_save(self, sender, instance, **kwargs):
+        self.handle_method('translation_objects', sender, instance, **kwargs)
+
+    def handle_location_save(self, sender, instance, **kwargs):
+        self.handle_method('location_objects', sender, instance, **kwargs)
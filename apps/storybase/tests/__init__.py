@@ -1,3 +1,5 @@
+import base64
+from datetime import datetime
 import sys
 from urlparse import parse_qs
 
@@ -10,11 +12,16 @@ from django.template import Context, Template, RequestContext
 from django.test import TestCase
 from django.utils import simplejson
 
-from storybase.models import PermissionMixin
+from tastypie.exceptions import BadRequest, ImmediateHttpResponse
+from tastypie.test import ResourceTestCase
+
+from storybase.api import DataUriResourceMixin
+from storybase.models import (ChunkedUpload, PermissionMixin,
+    SearchIndexMark, disable_perm_cache, enable_perm_cache, prefetch_perms)
 from storybase.forms import UserEmailField 
 from storybase.tests.base import SettingsChangingTestCase
 from storybase.utils import (escape_json_for_html, full_url,
-    get_language_name, is_file)
+    get_language_name, invalidate_instance_cache, is_file, key_from_instance)
 
 class ContextProcessorTest(TestCase):
     def test_conf(self):
@@ -129,6 +136,226 @@ class PermissionMixinTest(TestCase):
     def test_has_perm_unknown_perm(self):
         self.assertFalse(self.obj.has_perm(self.user, "foo"))
 
+    def test_perms_q_no_query(self):
+        """
+        Test that perms_q returns None when a permission can't be checked
+        in the database
+        """
+        self.assertEqual(TestPermissionClass.perms_q(self.user, ["add"]),
+                         None)
+
+    def test_perm_q_unknown_perm(self):
+        q = TestPermissionClass.perm_q(self.user, "foo")
+        self.assertEqual(q.children, [('pk__in', [])])
+
+
+class SearchIndexMarkTest(TestCase):
+    def test_get_set_mark(self):
+        self.assertEqual(SearchIndexMark.objects.get_mark(User), None)
+        updated = datetime(2013, 1, 1, 12, 0)
+        SearchIndexMark.objects.set_mark(User, updated)
+        self.assertEqual(SearchIndexMark.objects.get_mark(User), updated)
+        updated = datetime(2013, 1, 2, 12, 0)
+        SearchIndexMark.objects.set_mark(User, updated)
+        self.assertEqual(SearchIndexMark.objects.get_mark(User), updated)
+        self.assertEqual(SearchIndexMark.objects.count(), 1)
+
+
+class PermissionCacheTest(TestCase):
+    """Test caching permission checks and checking them in bulk"""
+
+    def setUp(self):
+        self.user = User.objects.create_user("test", "test@example.com",
+                                             "test")
+        self.user2 = User.objects.create_user("test2", "test2@example.com",
+                                              "test2")
+        self.uploads = [
+            ChunkedUpload.objects.create(owner=self.user,
+                                         filename="test%d.bin" % i, size=10)
+            for i in range(2)
+        ]
+        self.uploads.append(ChunkedUpload.objects.create(owner=self.user2,
+            filename="test2.bin", size=10))
+        enable_perm_cache()
+
+    def tearDown(self):
+        disable_perm_cache()
+
+    def test_has_perm_cached(self):
+        upload = ChunkedUpload.objects.get(pk=self.uploads[0].pk)
+        self.assertTrue(upload.has_perm(self.user, 'change'))
+        # Checking the permission on another instance of the same object
+        # uses the cached result
+        upload = ChunkedUpload.objects.get(pk=self.uploads[0].pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(upload.has_perm(self.user, 'change'))
+
+    def test_has_perm_not_cached(self):
+        """Test that checks aren't cached when the cache is disabled"""
+        disable_perm_cache()
+        upload = ChunkedUpload.objects.get(pk=self.uploads[0].pk)
+        self.assertTrue(upload.has_perm(self.user, 'change'))
+        upload = ChunkedUpload.objects.get(pk=self.uploads[0].pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(upload.has_perm(self.user, 'change'))
+
+    def test_cache_cleared_on_save(self):
+        upload = ChunkedUpload.objects.get(pk=self.uploads[0].pk)
+        self.assertTrue(upload.has_perm(self.user, 'change'))
+        upload.owner = self.user2
+        upload.save()
+        self.assertFalse(upload.has_perm(self.user, 'change'))
+
+    def test_prefetch_perms(self):
+        uploads = list(ChunkedUpload.objects.order_by('pk'))
+        with self.assertNumQueries(1):
+            allowed = prefetch_perms(self.user, uploads, ['change'])
+        self.assertEqual(allowed, uploads[:2])
+        with self.assertNumQueries(0):
+            self.assertTrue(uploads[0].has_perm(self.user, 'change'))
+            self.assertFalse(uploads[2].has_perm(self.user, 'change'))
+
+    def test_prefetch_perms_no_query(self):
+        """
+        Test that prefetch_perms falls back to has_perm for permissions
+        that can't be checked in the database
+        """
+        obj = TestPermissionClass()
+        self.assertEqual(prefetch_perms(self.user, [obj], ['add']), [obj])
+        self.assertEqual(prefetch_perms(self.user, [obj], ['add', 'delete']),
+                         [])
+
+
+class DataUriResourceMixinTest(SettingsChangingTestCase):
+    def setUp(self):
+        super(DataUriResourceMixinTest, self).setUp()
+        self.mixin = DataUriResourceMixin()
+        self.data = "".join([chr(i % 256) for i in range(1000)])
+
+    def test_parse_data_uri_header(self):
+        data_uri = "data:image/svg+xml;base64,PHN2Zy8+"
+        (mime, encoding, offset) = self.mixin.parse_data_uri_header(data_uri)
+        self.assertEqual(mime, "image/svg+xml")
+        self.assertEqual(encoding, "base64")
+        self.assertEqual(data_uri[offset:], "PHN2Zy8+")
+
+    def test_decode_data_uri(self):
+        """
+        Test that a data URI is decoded correctly when it's decoded a
+        piece at a time
+        """
+        # Use a chunk size that doesn't divide the encoded data evenly
+        self.mixin.data_uri_chunk_size = 12
+        encoded = base64.encodestring(self.data)
+        data_uri = "data:application/octet-stream;base64, %s" % encoded
+        f = self.mixin.decode_data_uri(data_uri, "test.bin")
+        try:
+            self.assertEqual(f.read(), self.data)
+            self.assertEqual(f.size, len(self.data))
+            self.assertEqual(f.name, "test.bin")
+            self.assertEqual(f.content_type, "application/octet-stream")
+        finally:
+            f.close()
+
+    def test_decode_data_uri_invalid(self):
+        data_uri = "data:application/octet-stream;base64,abcde"
+        self.assertRaises(BadRequest, self.mixin.decode_data_uri, data_uri,
+                          "test.bin")
+
+    def test_decode_data_uri_too_large(self):
+        """
+        Test that a data URI larger than the maximum upload size is
+        rejected before it is decoded
+        """
+        self.set_setting('STORYBASE_MAX_UPLOAD_SIZE', 100)
+        data_uri = "data:application/octet-stream;base64,%s" % (
+            base64.b64encode(self.data))
+        try:
+            self.mixin.decode_data_uri(data_uri, "test.bin")
+            self.fail("Expected ImmediateHttpResponse")
+        except ImmediateHttpResponse, e:
+            self.assertEqual(e.response.status_code, 413)
+
+
+class ChunkedUploadResourceTest(ResourceTestCase):
+    def setUp(self):
+        super(ChunkedUploadResourceTest, self).setUp()
+        self.username = 'test'
+        self.password = 'test'
+        self.user = User.objects.create_user(self.username,
+            'test@example.com', self.password)
+        self.data = "".join([chr(i % 256) for i in range(1000)])
+
+    def tearDown(self):
+        for upload in ChunkedUpload.objects.all():
+            upload.delete()
+
+    def create_upload(self):
+        self.api_client.client.login(username=self.username,
+                                     password=self.password)
+        resp = self.api_client.post('/api/0.1/uploads/', format='json',
+            data={
+                'filename': "test.bin",
+                'content_type': "application/octet-stream",
+                'size': len(self.data),
+            })
+        self.assertHttpCreated(resp)
+        return self.deserialize(resp)
+
+    def put_chunk(self, upload, start, end):
+        return self.api_client.client.put(
+            "%schunk/" % upload['resource_uri'], self.data[start:end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE="bytes %d-%d/%d" % (start, end,
+                                                   len(self.data)))
+
+    def test_upload(self):
+        upload = self.create_upload()
+        self.assertEqual(upload['offset'], 0)
+        self.assertFalse(upload['complete'])
+        resp = self.put_chunk(upload, 0, 599)
+        self.assertHttpAccepted(resp)
+        self.assertEqual(self.deserialize(resp)['offset'], 600)
+        resp = self.put_chunk(upload, 600, 999)
+        self.assertHttpAccepted(resp)
+        self.assertTrue(self.deserialize(resp)['complete'])
+        upload_obj = ChunkedUpload.objects.get(upload_id=upload['upload_id'])
+        self.assertEqual(upload_obj.owner, self.user)
+        f = upload_obj.get_uploaded_file()
+        try:
+            self.assertEqual(f.read(), self.data)
+        finally:
+            f.close()
+
+    def test_upload_out_of_order(self):
+        """
+        Test that the current offset is returned when a piece doesn't
+        start where the last one ended
+        """
+        upload = self.create_upload()
+        self.assertHttpAccepted(self.put_chunk(upload, 0, 599))
+        resp = self.put_chunk(upload, 0, 599)
+        self.assertHttpConflict(resp)
+        self.assertEqual(self.deserialize(resp)['offset'], 600)
+
+    def test_upload_too_large(self):
+        self.api_client.client.login(username=self.username,
+                                     password=self.password)
+        resp = self.api_client.post('/api/0.1/uploads/', format='json',
+            data={
+                'filename': "test.bin",
+                'size': settings.STORYBASE_MAX_UPLOAD_SIZE + 1,
+            })
+        self.assertEqual(resp.status_code, 413)
+        self.assertEqual(ChunkedUpload.objects.count(), 0)
+
+    def test_upload_other_user(self):
+        """Test that users can't add to another user's upload"""
+        upload = self.create_upload()
+        User.objects.create_user('test2', 'test2@example.com', 'test2')
+        self.api_client.client.login(username='test2', password='test2')
+        self.assertHttpNotFound(self.put_chunk(upload, 0, 599))
+
 
 class UserEmailFieldTest(TestCase):
     """Tests for UserEmailField form field"""
@@ -215,3 +442,20 @@ class UtilsTestCase(TestCase):
 
     def test_get_language_name(self):
         self.assertEqual("English", get_language_name("en"))
+
+    def test_key_from_instance(self):
+        key = key_from_instance(self._site, 'test')
+        self.assertTrue(key.startswith("sites.site:%s:" % self._site.pk))
+        self.assertTrue(key.endswith(":test"))
+        self.assertEqual(key_from_instance(self._site, 'test'), key)
+
+    def test_invalidate_instance_cache(self):
+        """
+        Test that invalidating an instance's cache changes all keys
+        derived from the instance
+        """
+        key = key_from_instance(self._site)
+        extra_key = key_from_instance(self._site, 'test')
+        invalidate_instance_cache(self._site)
+        self.assertNotEqual(key_from_instance(self._site), key)
+        self.assertNotEqual(key_from_instance(self._site, 'test'), extra_key)
@@ -2,10 +2,12 @@
 
 from urlparse import urlsplit, urlunsplit
 import re
+import time
 from itertools import cycle, islice
 
 from django.conf import settings
 from django.contrib.sites.models import get_current_site
+from django.core.cache import cache
 from django.template.defaultfilters import slugify as django_slugify
 from django.utils.translation import ugettext as _
 
@@ -85,6 +87,35 @@ def unique_slugify(instance, value, slug_field_name='slug', queryset=None,
     setattr(instance, slug_field.attname, slug)
 
 
+def unique_slug(value, taken, slug_len=50, slug_separator='-'):
+    """
+    Calculates a slug of ``value`` that isn't in the set ``taken``
+
+    This works like ``unique_slugify`` but checks uniqueness against a set
+    of slugs instead of querying the database, which is useful when
+    creating many objects at once.  The returned slug is added to
+    ``taken``.
+    """
+    slug = slugify(value)
+    if slug_len:
+        slug = slug[:slug_len]
+    slug = _slug_strip(slug, slug_separator)
+    original_slug = slug
+
+    next = 2
+    while not slug or slug in taken:
+        slug = original_slug
+        end = '%s%s' % (slug_separator, next)
+        if slug_len and len(slug) + len(end) > slug_len:
+            slug = slug[:slug_len-len(end)]
+            slug = _slug_strip(slug, slug_separator)
+        slug = '%s%s' % (slug, end)
+        next += 1
+
+    taken.add(slug)
+    return slug
+
+
 def _slug_strip(value, separator='-'):
     """
     Cleans up a slug by removing slug separator characters that occur at the
@@ -162,12 +193,85 @@ def full_url(urlstring, scheme='http'):
         return urlunsplit((scheme, current_site.domain, urlstring, None, None))
 
 
+def instance_key_prefix(instance):
+    """Get the namespace for cache keys derived from a model instance"""
+    opts = instance._meta
+    return '%s.%s:%s' % (opts.app_label, opts.module_name, instance.pk)
+
+
+def generation_key(instance):
+    """Get the cache key of a model instance's cache generation counter"""
+    return instance_key_prefix(instance) + ':generation'
+
+
+def new_generation():
+    """
+    Get a starting value for a cache generation counter
+
+    The counter is seeded from the current time rather than starting at
+    one so that if the counter is evicted from the cache, the new counter
+    won't match keys from an earlier generation that are still cached.
+
+    """
+    return int(time.time() * 1000)
+
+
+def get_generation(key):
+    """
+    Get the current value of a cache generation counter
+
+    Including the value in cache keys lets a whole group of cached values
+    be invalidated at once by calling ``incr_generation``.
+
+    """
+    generation = cache.get(key)
+    if generation is None:
+        generation = new_generation()
+        if not cache.add(key, generation):
+            # Another process initialized the counter first
+            generation = cache.get(key, generation)
+    return generation
+
+
+def incr_generation(key):
+    """Increment a cache generation counter"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The counter isn't in the cache
+        generation = new_generation()
+        cache.set(key, generation)
+        return generation
+
+
+def get_instance_generation(instance):
+    """Get the current cache generation for a model instance"""
+    return get_generation(generation_key(instance))
+
+
+def invalidate_instance_cache(instance):
+    """
+    Invalidate all cached values derived from a model instance
+
+    This increments the instance's cache generation, so keys returned
+    by ``key_from_instance`` for the instance no longer match the
+    previously cached values, which will eventually be evicted.
+
+    """
+    return incr_generation(generation_key(instance))
+
+
 def key_from_instance(instance, extra=None):
     """
     Generate a cache key for a Django model instance
+
+    The key includes the instance's cache generation, so any values
+    cached using keys from this function can be invalidated at once by
+    calling ``invalidate_instance_cache``.
+
     """
-    opts = instance._meta
-    key = '%s.%s:%s' % (opts.app_label, opts.module_name, instance.pk)
+    key = '%s:%s' % (instance_key_prefix(instance),
+                     get_instance_generation(instance))
     return key if extra is None else key + ":" + extra
 
 
@@ -179,8 +283,8 @@ def latest_context(qs, count=3, img_width=100, order_by='-published'):
     """Popuplate the context for latest_* template tags"""
     return {
         'objects': [obj.normalize_for_view(img_width)
-                    for obj in qs.published().not_featured()
-                                 .order_by(order_by)[:count]],
+                    for obj in qs.with_translations().published()
+                                 .not_featured().order_by(order_by)[:count]],
     }
 
 def escape_json_for_html(json_str):
@@ -89,7 +89,7 @@ class AssetResource(IframePostDetailResource):
 
     class Meta:
         always_return_data = True
-        queryset = Asset.objects.select_subclasses()
+        queryset = Asset.objects.select_subclasses().with_translations()
         resource_name = 'assets'
         list_allowed_methods = ['get', 'post', 'put']
         detail_allowed_methods = ['get', 'post', 'put', 'delete']
@@ -233,6 +233,10 @@ class AssetResource(IframePostDetailResource):
 
         return kwargs
 
+    def validate_image(self, f):
+        if not image_type_supported(f):
+            raise BadRequest("Unsupported image format")
+
     def hydrate_image(self, bundle):
         if bundle.obj.asset_id and hasattr(bundle.obj, 'image'):
             try:
@@ -243,13 +247,16 @@ class AssetResource(IframePostDetailResource):
             except Exception:
                 pass
 
-        if ('image' in bundle.data and
+        if self.is_upload_uri(bundle.data.get('image')):
+            # The image data is the URI of a chunked upload
+            return self.hydrate_chunked_upload(bundle, Image, 'image',
+                                               validate=self.validate_image)
+        elif ('image' in bundle.data and
                 isinstance(bundle.data['image'], UploadedFile)):
             # The image data is an uploaded file
 
             # Make sure the file format is supported
-            if not image_type_supported(bundle.data['image']):
-                raise BadRequest("Unsupported image format")
+            self.validate_image(bundle.data['image'])
 
             # Create an image object and add it to the bundle
             image = Image.objects.create(file=bundle.data['image'])
@@ -336,7 +343,7 @@ class DataSetResource(IframePostDetailResource):
 
     class Meta:
         always_return_data = True
-        queryset = DataSet.objects.select_subclasses()
+        queryset = DataSet.objects.select_subclasses().with_translations()
         resource_name = 'datasets'
         list_allowed_methods = ['get', 'post']
         detail_allowed_methods = ['get', 'post', 'delete', 'put']
@@ -445,7 +452,10 @@ class DataSetResource(IframePostDetailResource):
             except Exception:
                 pass
 
-        if ('file' in bundle.data and
+        if self.is_upload_uri(bundle.data.get('file')):
+            # The file data is the URI of a chunked upload
+            return self.hydrate_chunked_upload(bundle, File, 'file')
+        elif ('file' in bundle.data and
             isinstance(bundle.data['file'], UploadedFile)):
             # The file data is an uploaded file, create a file object
             # and add it to the bundle
@@ -0,0 +1,52 @@
+import logging
+from optparse import make_option
+import time
+
+from django.core.management.base import BaseCommand
+
+from storybase_asset.models import ImageDerivative
+
+logger = logging.getLogger('storybase.asset.management')
+
+class Command(BaseCommand):
+    help = ("Generate thumbnails of image assets at the sizes used by\n"
+            "the site\n\n"
+            "Only thumbnails that haven't already been generated are\n"
+            "created.  This can be run from a cron job, or as a\n"
+            "long-running worker that picks up newly uploaded images by\n"
+            "specifying the --interval option.\n\n"
+            )
+    option_list = BaseCommand.option_list + (
+            make_option('--processes',
+                action='store',
+                type='int',
+                dest='processes',
+                default=None,
+                help=("Number of worker processes used to resize images. "
+                      "Defaults to the number of CPUs")),
+            make_option('--interval',
+                action='store',
+                type='int',
+                dest='interval',
+                default=None,
+                help=("Keep running, checking for new images after waiting "
+                      "this many seconds")),
+            )
+
+    def generate(self, processes, verbosity):
+        generated = ImageDerivative.objects.generate_missing(
+            processes=processes)
+        message = "%d thumbnails generated" % (generated)
+        logger.info(message)
+        if verbosity > 1:
+            self.stdout.write(message + "\n")
+
+    def handle(self, *args, **options):
+        processes = options.get('processes')
+        interval = options.get('interval')
+        verbosity = int(options.get('verbosity'))
+
+        self.generate(processes, verbosity)
+        while interval:
+            time.sleep(interval)
+            self.generate(processes, verbosity)
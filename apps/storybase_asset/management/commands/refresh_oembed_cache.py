@@ -0,0 +1,62 @@
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from storybase_asset.models import ExternalAsset, OembedResponse
+
+logger = logging.getLogger('storybase.asset.management')
+
+class Command(BaseCommand):
+    help = ("Request new versions of stored oEmbed responses that have\n"
+            "expired\n\n"
+            "Stored responses are used to render external assets even\n"
+            "after they expire, so this should be run regularly from a\n"
+            "cron job.\n\n"
+            )
+    option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=100,
+                help="Number of responses to refresh at a time"),
+            make_option('--workers',
+                action='store',
+                type='int',
+                dest='workers',
+                default=4,
+                help="Number of requests to make to providers in parallel"),
+            make_option('--all',
+                action='store_true',
+                dest='all',
+                default=False,
+                help="Refresh all stored responses, not just expired ones"),
+            )
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        workers = options.get('workers')
+        verbosity = int(options.get('verbosity'))
+
+        if options.get('all'):
+            qs = OembedResponse.objects.order_by('pk')
+        else:
+            qs = OembedResponse.objects.stale()
+        # Get the ids up front since refreshing a response changes
+        # whether it's stale
+        pks = list(qs.values_list('pk', flat=True))
+
+        total = refreshed = 0
+        for i in range(0, len(pks), batch_size):
+            responses = OembedResponse.objects.filter(
+                pk__in=pks[i:i + batch_size])
+            refreshed += OembedResponse.objects.refresh(
+                ExternalAsset.oembed_providers, responses, workers=workers)
+            total += len(pks[i:i + batch_size])
+
+        message = "%d oEmbed responses refreshed, %d failed" % (
+            refreshed, total - refreshed)
+        logger.info(message)
+        if verbosity > 1:
+            self.stdout.write(message + "\n")
@@ -1,5 +1,10 @@
 """Models for story content assets"""
+from datetime import datetime, timedelta
+import hashlib
+import logging
 import mimetypes
+from multiprocessing import Pool
+from multiprocessing.pool import ThreadPool
 import os
 import re
 from ssl import SSLError
@@ -12,9 +17,11 @@ from django.contrib.auth.models import User
 from django.core.files import File
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import connection, models
+from django.db.models import Q
 from django.db.models.signals import pre_save, post_delete, m2m_changed
 from django.template.loader import render_to_string
+from django.utils import simplejson
 from django.utils.html import strip_tags
 from django.utils.text import Truncator 
 from django.utils.translation import ugettext_lazy as _
@@ -23,15 +30,17 @@ from django.utils.safestring import mark_safe
 from filer.fields.image import FilerFileField, FilerImageField
 from filer.models import File as FilerFile, Image 
 from micawber.exceptions import ProviderException, ProviderNotFoundException
-from model_utils.managers import InheritanceManager
 from uuidfield.fields import UUIDField
 
 from storybase.fields import ShortTextField
+from storybase.managers import TranslatedInheritanceManager
 from storybase.models import (LicensedModel, PublishedModel,
     TimestampedModel, TranslatedModel, TranslationModel,
     PermissionMixin, set_date_on_published)
-from storybase.utils import full_url, key_from_instance
+from storybase.utils import (full_url, invalidate_instance_cache,
+    key_from_instance)
 from storybase_asset.oembed import bootstrap_providers
+from storybase_asset.oembed.providers import MockProvider
 from storybase_asset.utils import img_el
 
 ASSET_TYPES = (
@@ -63,6 +72,32 @@ FEATURED_ASSET_THUMBNAIL_HEIGHT = 240
 """Maximum height, in pixels, of featured asset thumbnails"""
 
 
+IMAGE_DERIVATIVE_SIZES = (
+    (FEATURED_ASSET_THUMBNAIL_WIDTH, FEATURED_ASSET_THUMBNAIL_HEIGHT),
+    # Asset thumbnails in the API
+    (222, 222),
+    # Widths used by ``normalize_for_view`` and the ``featured_asset``
+    # template tag
+    (100, 0),
+    (150, 0),
+    (222, 0),
+    (300, 0),
+    (335, 0),
+    (490, 0),
+    (500, 0),
+    # Sizes used by the ``featured_asset_thumbnail_url`` template tag,
+    # including in the widgets
+    (180, 0),
+    (200, 150),
+    (400, 300),
+)
+"""Sizes, in pixels, of thumbnails generated for each local image
+
+These are the (width, height) boxes that the thumbnails fit in.  A
+height or width of 0 means that dimension isn't constrained.
+"""
+
+
 class ImageRenderingMixin(object):
     """
     Mixin for rendering images in Asset-like objects
@@ -127,7 +162,7 @@ class AssetPermission(PermissionMixin):
             return False
 
         # Authenticated, active users can change their own assets
-        if self.owner == user:
+        if self.owner_id == user.pk:
             return True
 
         # Admins can change any asset
@@ -146,6 +181,22 @@ class AssetPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(owner=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class AssetTranslation(TranslationModel):
     """
@@ -207,7 +258,7 @@ class Asset(ImageRenderingMixin, TranslatedModel, LicensedModel,
 
     # Use InheritanceManager from django-model-utils to make
     # fetching of subclassed objects easier
-    objects = InheritanceManager()
+    objects = TranslatedInheritanceManager()
 
     def __unicode__(self):
         subclass_obj = Asset.objects.get_subclass(pk=self.pk)
@@ -293,6 +344,187 @@ class Asset(ImageRenderingMixin, TranslatedModel, LicensedModel,
         return " ".join(strings)
 
 
+OEMBED_RESPONSE_STATUSES = (
+    (u'ok', u'ok'),
+    (u'error', u'error'),
+)
+"""The possible outcomes of an oEmbed request"""
+
+
+class OembedResponseManager(models.Manager):
+    def make_key(self, url, params):
+        """Get the unique key for a URL and a set of oEmbed parameters"""
+        return hashlib.md5(simplejson.dumps([url, sorted(params.items())])
+                           .encode('utf-8')).hexdigest()
+
+    def cache_key(self, key):
+        return 'storybase_asset.oembedresponse:%s' % key
+
+    def fetch(self, providers, url, params):
+        """
+        Request oEmbed data for a URL from its provider
+
+        This doesn't touch the database so it can be called from worker
+        threads.
+
+        Returns a tuple of the status, the response data and an error
+        message.
+
+        """
+        try:
+            return ('ok', providers.request(url, **params), '')
+        except (ProviderException, ValueError, SSLError) as e:
+            # ValueError is raised when JSON of response couldn't
+            # be decoded, e.g. when offline
+            return ('error', None, unicode(e))
+
+    def store(self, url, params, status, data, error='', response=None):
+        """
+        Store the result of an oEmbed request in the database and cache
+
+        Successful responses are kept for ``STORYBASE_OEMBED_TTL`` seconds
+        and errors for ``STORYBASE_OEMBED_ERROR_TTL`` seconds.  If a
+        request for a response that was previously successful fails, the
+        previous data continues to be used until the request is retried.
+
+        """
+        key = self.make_key(url, params)
+        now = datetime.now()
+        if response is None:
+            response, created = self.get_or_create(key=key, defaults={
+                'url': url,
+                'params': simplejson.dumps(params),
+                'fetched': now,
+                'expires': now,
+            })
+
+        if status == 'ok':
+            response.status = status
+            response.data = simplejson.dumps(data)
+            response.error = ''
+            ttl = settings.STORYBASE_OEMBED_TTL
+        else:
+            if response.status != 'ok' or not response.data:
+                response.status = status
+                response.data = ''
+            response.error = error
+            ttl = settings.STORYBASE_OEMBED_ERROR_TTL
+        response.fetched = now
+        response.expires = now + timedelta(seconds=ttl)
+        response.save()
+        cache.set(self.cache_key(key), response.result)
+        return response
+
+    def request(self, providers, url, **params):
+        """
+        Get oEmbed data for a URL, only contacting the provider when
+        there is no stored response
+
+        Stored responses are returned even after they expire.  Use
+        ``refresh()``, via the ``refresh_oembed_cache`` management
+        command, to update them.
+
+        Raises ``ProviderNotFoundException`` if no provider handles the
+        URL or ``ProviderException`` if the provider returned an error.
+
+        """
+        provider = providers.provider_for_url(url)
+        if provider is None:
+            raise ProviderNotFoundException(
+                'Provider not found for "%s"' % url)
+        if isinstance(provider, MockProvider):
+            # Mock providers build their response locally, so there's
+            # nothing to be gained by storing it
+            return provider.request(url, **params)
+
+        key = self.make_key(url, params)
+        result = cache.get(self.cache_key(key))
+        if result is None:
+            try:
+                result = self.get(key=key).result
+                cache.set(self.cache_key(key), result)
+            except self.model.DoesNotExist:
+                (status, data, error) = self.fetch(providers, url, params)
+                result = self.store(url, params, status, data, error).result
+
+        (status, data, error) = result
+        if status != 'ok':
+            raise ProviderException(error)
+        return data
+
+    def stale(self):
+        """Get responses that should be requested again"""
+        return self.filter(expires__lte=datetime.now()).order_by('expires')
+
+    def refresh(self, providers, responses, workers=4):
+        """
+        Request a new version of stored oEmbed responses
+
+        Requests to the providers are made in parallel using a pool of
+        ``workers`` threads.
+
+        Returns the number of responses that were refreshed successfully.
+
+        """
+        responses = list(responses)
+        if not responses:
+            return 0
+
+        def fetch(response):
+            return self.fetch(providers, response.url, response.get_params())
+
+        pool = ThreadPool(workers)
+        try:
+            results = pool.map(fetch, responses)
+        finally:
+            pool.close()
+            pool.join()
+
+        refreshed = 0
+        for (response, (status, data, error)) in zip(responses, results):
+            self.store(response.url, response.get_params(), status, data,
+                       error, response=response)
+            if status == 'ok':
+                refreshed += 1
+        return refreshed
+
+
+class OembedResponse(models.Model):
+    """
+    A stored response from an oEmbed provider
+
+    This lets ``ExternalAsset`` instances be rendered without waiting on
+    a request to a third-party oEmbed endpoint.  Failed requests are
+    stored as well, so a provider that is down isn't contacted on every
+    render.
+
+    """
+    key = models.CharField(max_length=32, unique=True)
+    url = models.TextField()
+    params = models.TextField(default='{}')
+    status = models.CharField(max_length=10, choices=OEMBED_RESPONSE_STATUSES,
+                              default='error')
+    data = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    fetched = models.DateTimeField()
+    expires = models.DateTimeField(db_index=True)
+
+    objects = OembedResponseManager()
+
+    def __unicode__(self):
+        return self.url
+
+    def get_params(self):
+        return dict((str(k), v) for k, v
+                    in simplejson.loads(self.params).items())
+
+    @property
+    def result(self):
+        """The response as a tuple of status, data and error message"""
+        data = simplejson.loads(self.data) if self.data else None
+        return (self.status, data, self.error)
+
+
 class ExternalAssetTranslation(AssetTranslation):
     """Translatable fields for an Asset model instance"""
     url = models.URLField(max_length=500)
@@ -309,7 +541,9 @@ class ExternalAsset(Asset):
     translated_fields = Asset.translated_fields + ['url']
     translation_class = ExternalAssetTranslation
 
-    oembed_providers = bootstrap_providers(cache)
+    # Responses are cached using ``OembedResponse`` rather than the
+    # registry's own cache
+    oembed_providers = bootstrap_providers()
 
     IMAGE_MIMETYPES = (
         "image/jpeg", 
@@ -327,7 +561,8 @@ class ExternalAsset(Asset):
 
     @classmethod
     def get_oembed_response(cls, url, **extra_params):
-        return cls.oembed_providers.request(url, **extra_params)
+        return OembedResponse.objects.request(cls.oembed_providers, url,
+                                              **extra_params)
 
     def __unicode__(self):
         maxlength = 100
@@ -551,6 +786,167 @@ class LocalImageAssetTranslation(AssetTranslation):
     image = FilerImageField(null=True)
 
 
+class ImageDerivativeManager(models.Manager):
+    def cache_key(self, image_id, width, height):
+        return 'storybase_asset.imagederivative:%s:%dx%d' % (image_id,
+            width, height)
+
+    def generate(self, image, width, height):
+        """
+        Generate a thumbnail of an image
+
+        Returns a dictionary of field values for an ``ImageDerivative``
+        describing the thumbnail.
+
+        """
+        thumbnailer = image.easy_thumbnails_thumbnailer
+        thumbnail = thumbnailer.get_thumbnail({'size': (width, height)})
+        return {
+            'width': width,
+            'height': height,
+            'url': thumbnail.url,
+            'size': thumbnail.size,
+            'image_width': thumbnail.width,
+            'image_height': thumbnail.height,
+        }
+
+    def store(self, image_id, data):
+        """Save information about a generated thumbnail"""
+        derivative, created = self.get_or_create(image_id=image_id,
+            width=data['width'], height=data['height'], defaults=data)
+        if not created:
+            for name, value in data.items():
+                setattr(derivative, name, value)
+            derivative.save()
+        cache.set(self.cache_key(image_id, derivative.width,
+                                 derivative.height), derivative)
+        return derivative
+
+    def get_derivative(self, image, width, height):
+        """
+        Get a thumbnail of an image that fits in a particular size
+
+        The thumbnail is looked up in the cache, then in the database.
+        It's only generated if it hasn't been generated already, usually
+        by the ``generate_image_derivatives`` management command.
+
+        """
+        key = self.cache_key(image.pk, width, height)
+        derivative = cache.get(key)
+        if derivative is None:
+            try:
+                derivative = self.get(image=image, width=width,
+                                      height=height)
+                cache.set(key, derivative)
+            except self.model.DoesNotExist:
+                derivative = self.store(image.pk,
+                                        self.generate(image, width, height))
+        return derivative
+
+    def missing(self, sizes=IMAGE_DERIVATIVE_SIZES):
+        """
+        Find the images used by image assets that are missing thumbnails
+
+        Returns a dictionary keyed by image id.  The values are lists of
+        the sizes that haven't been generated for the image.
+
+        """
+        image_ids = LocalImageAssetTranslation.objects\
+            .exclude(image=None).values_list('image_id', flat=True)\
+            .distinct()
+        missing = dict([(image_id, set(sizes)) for image_id in image_ids])
+        for (image_id, width, height) in self.filter(image__in=image_ids)\
+                .values_list('image_id', 'width', 'height'):
+            if image_id in missing:
+                missing[image_id].discard((width, height))
+        return dict([(image_id, sorted(image_sizes)) for image_id, image_sizes
+                     in missing.items() if image_sizes])
+
+    def generate_missing(self, sizes=IMAGE_DERIVATIVE_SIZES, processes=None):
+        """
+        Generate thumbnails that haven't been generated yet
+
+        Resizing is done in a pool of ``processes`` worker processes.
+        Defaults to the number of CPUs.
+
+        Returns the number of thumbnails that were generated.
+
+        """
+        missing = self.missing(sizes)
+        if not missing:
+            return 0
+
+        # Don't share the database connection with the worker processes
+        connection.close()
+        pool = Pool(processes)
+        try:
+            results = pool.map(generate_image_derivatives, missing.items())
+        finally:
+            pool.close()
+            pool.join()
+
+        generated = 0
+        for (image_id, image_sizes), data_list in zip(missing.items(),
+                                                      results):
+            for data in data_list:
+                self.store(image_id, data)
+                generated += 1
+        return generated
+
+
+class ImageDerivative(models.Model):
+    """
+    A pre-generated thumbnail of an image
+
+    Storing the thumbnail's URL, size and dimensions lets views and
+    feeds use thumbnails without reading or resizing the source image.
+    """
+    image = models.ForeignKey(Image, related_name='derivatives')
+    width = models.PositiveIntegerField()
+    """Width of the box the thumbnail fits in. 0 means unconstrained"""
+    height = models.PositiveIntegerField()
+    """Height of the box the thumbnail fits in. 0 means unconstrained"""
+    url = models.CharField(max_length=500)
+    size = models.PositiveIntegerField(default=0)
+    """Size of the thumbnail file, in bytes"""
+    image_width = models.PositiveIntegerField(default=0)
+    image_height = models.PositiveIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+
+    objects = ImageDerivativeManager()
+
+    class Meta:
+        unique_together = (('image', 'width', 'height'),)
+
+    def __unicode__(self):
+        return self.url
+
+
+def generate_image_derivatives(args):
+    """
+    Generate thumbnails of an image at several sizes
+
+    This takes a tuple of an image id and a list of sizes so it can be
+    called by ``multiprocessing.Pool.map``.  It returns a list of
+    dictionaries describing the generated thumbnails.  Errors are logged
+    rather than raised so one bad image doesn't stop the others from
+    being processed.
+
+    """
+    (image_id, sizes) = args
+    results = []
+    try:
+        image = Image.objects.get(pk=image_id)
+        for (width, height) in sizes:
+            results.append(ImageDerivative.objects.generate(image, width,
+                                                            height))
+    except Exception, e:
+        logger = logging.getLogger('storybase_asset.models')
+        logger.error("Error generating thumbnails for image %s: %s" %
+                     (image_id, e))
+    return results
+
+
 class LocalImageAsset(Asset):
     """
     An asset that can be stored as an image file accessible by the
@@ -593,25 +989,31 @@ class LocalImageAsset(Asset):
         thumbnailer = self.image.easy_thumbnails_thumbnailer
         return thumbnailer.get_thumbnail(thumbnail_options)
 
+    def get_thumbnail_derivative(self, width=0, height=0):
+        """
+        Return the ``ImageDerivative`` for a thumbnail of this asset
+
+        Returns None if the asset doesn't have an image.
+
+        """
+        if not self.image:
+            return None
+        # Cropping is disabled in favor of CSS cropping.  To crop, the
+        # thumbnails would have to be generated with the 'crop' option
+        # See http://easy-thumbnails.readthedocs.org/en/latest/ref/processors/#easy_thumbnails.processors.scale_and_crop
+        return ImageDerivative.objects.get_derivative(self.image, width,
+                                                      height)
+
     def get_thumbnail_url(self, width=0, height=0, **kwargs):
         """Return the URL of the Asset's thumbnail"""
         include_host = kwargs.get('include_host', False)
-        if not self.image:
+        derivative = self.get_thumbnail_derivative(width, height)
+        if derivative is None:
             return None
-        thumbnail_options = {
-            # Disable crop for now in favor of CSS cropping, but this
-            # is how you would do it. This particular argument crops
-            # from the center on the x-axis and the top edge of the
-            # image on the y-axis.  
-            # See http://easy-thumbnails.readthedocs.org/en/latest/ref/processors/#easy_thumbnails.processors.scale_and_crop
-            #'crop': ',0',
-            'size': (width, height),
-        }
-        thumbnail = self.get_thumbnail(thumbnail_options)
         if include_host:
-            return full_url(thumbnail.url)
+            return full_url(derivative.url)
         else:
-            return thumbnail.url
+            return derivative.url
 
 def add_dataset_to_story(sender, **kwargs):
     """
@@ -754,10 +1156,7 @@ def invalidate_featured_asset_url_cache(sender, instance, **kwargs):
     action = kwargs.get('action')
     reverse = kwargs.get('reverse')
     if action in ("post_add", "post_remove", "post_clear") and not reverse:
-        key = instance.featured_asset_thumbnail_url_key()
-        key_with_host = instance.featured_asset_thumbnail_url_key(include_host=True)
-        cache.delete(key)
-        cache.delete(key_with_host)
+        invalidate_instance_cache(instance)
 
 
 class DataSetPermission(PermissionMixin):
@@ -769,7 +1168,7 @@ class DataSetPermission(PermissionMixin):
             return False
 
         # Authenticated, active users can change their own dataset 
-        if self.owner == user:
+        if self.owner_id == user.pk:
             return True
 
         # Admins can change any asset
@@ -788,6 +1187,22 @@ class DataSetPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(owner=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class DataSetTranslation(TranslationModel):
     """Translatable fields for a DataSet model instance"""
@@ -834,7 +1249,7 @@ class DataSet(TranslatedModel, PublishedModel, TimestampedModel,
 
     # Use InheritanceManager from django-model-utils to make
     # fetching of subclassed objects easier
-    objects = InheritanceManager()
+    objects = TranslatedInheritanceManager()
 
     def __unicode__(self):
         return self.title
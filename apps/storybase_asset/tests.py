@@ -13,17 +13,22 @@ except ImportError:
 import django
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.template.defaultfilters import striptags, truncatewords
 from django.test import TestCase
 from django.test.client import encode_multipart, BOUNDARY, MULTIPART_CONTENT
 
+from micawber.exceptions import ProviderException, ProviderNotFoundException
+from micawber.providers import Provider, ProviderRegistry
 from tastypie.test import ResourceTestCase, TestApiClient
 
+from storybase.models import ChunkedUpload
 from storybase.tests.base import FixedTestApiClient, FileCleanupMixin
 from storybase_story.models import (create_section, create_story,
     Container, SectionAsset, SectionLayout, Story)
 from storybase_asset.models import (Asset, ExternalAsset, HtmlAsset,
-    HtmlAssetTranslation, ExternalDataSet, DataSet,
+    HtmlAssetTranslation, ExternalDataSet, DataSet, ImageDerivative,
+    OembedResponse, IMAGE_DERIVATIVE_SIZES, generate_image_derivatives,
     create_html_asset, create_external_asset, create_local_image_asset,
     create_external_dataset, create_local_dataset)
 from storybase_asset.oembed.providers import GoogleSpreadsheetProvider
@@ -366,6 +371,46 @@ class LocalImageAssetModelTest(FileCleanupMixin, TestCase):
             url = asset.get_thumbnail_url(width=222, height=222)
             self.assertIn(image_filename, url)
 
+    def create_image_asset(self, image_filename="test_image.jpg"):
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        img_path = os.path.join(app_dir, "test_files", image_filename)
+        with open(img_path) as image:
+            asset = create_local_image_asset(type='image', image=image,
+                image_filename=image_filename, title="Test Image Asset")
+            self.add_file_to_cleanup(asset.image.file.path)
+        return asset
+
+    def test_get_thumbnail_url_stored(self):
+        """
+        Test that a thumbnail's information is stored and used instead
+        of generating the thumbnail again
+        """
+        asset = self.create_image_asset()
+        url = asset.get_thumbnail_url(width=222, height=222)
+        derivative = ImageDerivative.objects.get(image=asset.image,
+                                                 width=222, height=222)
+        self.assertEqual(derivative.url, url)
+        self.assertTrue(derivative.size > 0)
+        self.assertTrue(derivative.image_width <= 222)
+        self.assertTrue(derivative.image_height <= 222)
+        cache.clear()
+        with patch('storybase_asset.models.ImageDerivativeManager.generate') as mock_generate:
+            self.assertEqual(asset.get_thumbnail_url(width=222, height=222),
+                             url)
+            self.assertFalse(mock_generate.called)
+
+    def test_missing_derivatives(self):
+        asset = self.create_image_asset()
+        missing = ImageDerivative.objects.missing()
+        self.assertEqual(missing[asset.image.pk],
+                         sorted(IMAGE_DERIVATIVE_SIZES))
+        for data in generate_image_derivatives((asset.image.pk, [(100, 0)])):
+            ImageDerivative.objects.store(asset.image.pk, data)
+        missing = ImageDerivative.objects.missing()
+        self.assertNotIn((100, 0), missing[asset.image.pk])
+        self.assertEqual(len(missing[asset.image.pk]),
+                         len(IMAGE_DERIVATIVE_SIZES) - 1)
+
 
 class HtmlAssetModelTest(TestCase):
     def test_string_representation_from_title(self):
@@ -454,6 +499,97 @@ class MockProviderTest(TestCase):
         self.assertEqual(response['html'], expected)
 
 
+class StubProvider(Provider):
+    """oEmbed provider that doesn't make any HTTP requests"""
+    def __init__(self, fail=False):
+        super(StubProvider, self).__init__('http://example.com/oembed')
+        self.fail = fail
+        self.requests = 0
+
+    def request(self, url, **extra_params):
+        self.requests += 1
+        if self.fail:
+            raise ProviderException('Error fetching "%s"' % url)
+        return {
+            'type': 'video',
+            'html': '<iframe src="%s"></iframe>' % url,
+            'url': url,
+        }
+
+
+class OembedResponseTest(TestCase):
+    def setUp(self):
+        self.provider = StubProvider()
+        self.providers = ProviderRegistry()
+        self.providers.register('https?://example.com/\S*', self.provider)
+        self.url = 'http://example.com/videos/1'
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_request_stored(self):
+        """Test that a response is only requested from the provider once"""
+        data = OembedResponse.objects.request(self.providers, self.url)
+        self.assertEqual(data['html'],
+                         '<iframe src="%s"></iframe>' % self.url)
+        self.assertEqual(self.provider.requests, 1)
+        self.assertEqual(
+            OembedResponse.objects.request(self.providers, self.url), data)
+        # Make sure the response comes from the database when it's not
+        # in the cache
+        cache.clear()
+        self.assertEqual(
+            OembedResponse.objects.request(self.providers, self.url), data)
+        self.assertEqual(self.provider.requests, 1)
+        # Different parameters are stored separately
+        OembedResponse.objects.request(self.providers, self.url,
+                                       maxwidth=222)
+        self.assertEqual(self.provider.requests, 2)
+        self.assertEqual(OembedResponse.objects.count(), 2)
+
+    def test_request_error_stored(self):
+        """Test that failed requests are stored"""
+        self.provider.fail = True
+        self.assertRaises(ProviderException,
+            OembedResponse.objects.request, self.providers, self.url)
+        self.assertRaises(ProviderException,
+            OembedResponse.objects.request, self.providers, self.url)
+        self.assertEqual(self.provider.requests, 1)
+        response = OembedResponse.objects.get()
+        self.assertEqual(response.status, 'error')
+
+    def test_request_provider_not_found(self):
+        self.assertRaises(ProviderNotFoundException,
+            OembedResponse.objects.request, self.providers,
+            'http://fakedomain.com/videos/1')
+        self.assertEqual(OembedResponse.objects.count(), 0)
+
+    def test_refresh(self):
+        OembedResponse.objects.request(self.providers, self.url)
+        self.assertEqual(OembedResponse.objects.stale().count(), 0)
+        OembedResponse.objects.update(expires=datetime.now())
+        self.assertEqual(OembedResponse.objects.stale().count(), 1)
+        refreshed = OembedResponse.objects.refresh(self.providers,
+            OembedResponse.objects.stale())
+        self.assertEqual(refreshed, 1)
+        self.assertEqual(self.provider.requests, 2)
+        self.assertEqual(OembedResponse.objects.stale().count(), 0)
+
+    def test_refresh_error_keeps_data(self):
+        """
+        Test that a stored response is still used when refreshing it fails
+        """
+        data = OembedResponse.objects.request(self.providers, self.url)
+        self.provider.fail = True
+        refreshed = OembedResponse.objects.refresh(self.providers,
+            OembedResponse.objects.all())
+        self.assertEqual(refreshed, 0)
+        self.assertEqual(
+            OembedResponse.objects.request(self.providers, self.url), data)
+        response = OembedResponse.objects.get()
+        self.assertNotEqual(response.error, '')
+
+
 class AssetApiTest(FileCleanupMixin, TestCase):
     """ Test the public API for creating Assets """
 
@@ -790,6 +926,47 @@ class DataSetResourceTest(DataUrlMixin, FileCleanupMixin, ResourceTestCase):
         # Test that the created dataset is associated with a story 
         self.assertIn(self.story, created_dataset.stories.all())
 
+    def test_post_list_with_story_file_as_chunked_upload(self):
+        """
+        Test that a user can create a dataset with a file uploaded in
+        pieces, and that the upload is removed once it's used
+        """
+        data_filename = "test_data.csv"
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+        data_path = os.path.join(app_dir, "test_files", data_filename)
+        data = file(data_path, 'r').read()
+        self.api_client.client.login(username=self.username,
+                                     password=self.password)
+        resp = self.api_client.post('/api/0.1/uploads/', format='json',
+            data={
+                'filename': data_filename,
+                'content_type': "text/csv",
+                'size': len(data),
+            })
+        self.assertHttpCreated(resp)
+        upload_uri = self.deserialize(resp)['resource_uri']
+        resp = self.api_client.client.put("%schunk/" % upload_uri, data,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE="bytes 0-%d/%d" % (len(data) - 1, len(data)))
+        self.assertHttpAccepted(resp)
+        upload = ChunkedUpload.objects.get()
+        upload_path = upload.path
+
+        post_data = {
+            'title': "Test Dataset",
+            'description': "A test dataset",
+            'file': upload_uri,
+            'language': "en",
+        }
+        uri = '/api/0.1/datasets/stories/%s/' % (self.story.story_id)
+        resp = self.api_client.post(uri, format='json', data=post_data)
+        self.assertHttpCreated(resp)
+        created_dataset = DataSet.objects.get_subclass()
+        self.add_file_to_cleanup(created_dataset.file.file.path)
+        self.assertEqual(file(created_dataset.file.path, 'r').read(), data)
+        self.assertEqual(ChunkedUpload.objects.count(), 0)
+        self.assertFalse(os.path.exists(upload_path))
+
     def test_post_list_with_story_file_as_multipart(self):
         """Test that a user can create a new dataset with a file sent as multipart form data"""  
         data_filename = "test_data.csv"
@@ -9,9 +9,10 @@ from tastypie.exceptions import ImmediateHttpResponse
 from tastypie.resources import Resource, ModelResource
 from tastypie.utils import trailing_slash
 
-from storybase.api import HookedModelResource, LoggedInAuthorization
+from storybase.api import (HookedModelResource, LoggedInAuthorization,
+    TypeaheadResource)
 from storybase_geo import settings
-from storybase_geo.models import GeoLevel, Location, Place
+from storybase_geo.models import GeoLevel, GeocodeResult, Location, Place
 from storybase_geo.utils import get_geocoder
 from storybase_story.models import Story
 
@@ -105,6 +106,16 @@ class PlaceResource(ModelResource):
             'name': ALL,
         }
 
+
+class PlaceTypeaheadResource(TypeaheadResource):
+    """Suggest places whose names match what a user has typed"""
+    model = Place
+    id_field = 'place_id'
+
+    class Meta(TypeaheadResource.Meta):
+        resource_name = 'typeahead/places'
+
+
 # TODO: Document, error handling
 class GeocodeObject(object):
     def __init__(self, place=None, lat=None, lng=None):
@@ -143,18 +154,14 @@ class GeocoderResource(Resource):
         
     def obj_get_list(self, bundle, **kwargs):
         results = []
-        geocoder = self.get_geocoder()
         address = bundle.request.GET.get('q', None)
         if address:
-            geocoding_kwargs = {
-                'exactly_one': settings.STORYBASE_GEOCODE_EXACTLY_ONE
-            }
-            try:
-                for place, (lat, lng) in geocoder.geocode(address, **geocoding_kwargs):
-                    result = GeocodeObject(place=place, lat=float(lat), lng=float(lng))
-                    results.append(result)
-            except ValueError:
-                # No match for address found, results list will be empty
-                pass
+            geocoded = GeocodeResult.objects.geocode(address,
+                geocoder=self.get_geocoder())
+            if settings.STORYBASE_GEOCODE_EXACTLY_ONE:
+                geocoded = geocoded[:1]
+            for place, (lat, lng) in geocoded:
+                result = GeocodeObject(place=place, lat=lat, lng=lng)
+                results.append(result)
 
         return results
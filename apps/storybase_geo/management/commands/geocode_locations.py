@@ -0,0 +1,83 @@
+import logging
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from storybase_geo.models import GeocodeResult, Location
+
+logger = logging.getLogger('storybase.geo.management')
+
+class Command(BaseCommand):
+    help = ("Geocode locations that have an address but no point\n\n"
+            "Addresses are geocoded in parallel and the results are stored\n"
+            "so the same address isn't geocoded again.\n\n"
+            )
+    option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=100,
+                help="Number of locations to geocode at a time"),
+            make_option('--workers',
+                action='store',
+                type='int',
+                dest='workers',
+                default=4,
+                help="Number of addresses to geocode in parallel"),
+            make_option('--rate',
+                action='store',
+                type='float',
+                dest='rate',
+                default=None,
+                help=("Maximum number of requests per second to make to the "
+                      "geocoder")),
+            )
+
+    def get_pending(self):
+        """Get locations that have an address but haven't been geocoded"""
+        return Location.objects.filter(point=None)\
+                               .exclude(address='', city='', state='',
+                                        postcode='')\
+                               .order_by('pk')
+
+    def handle(self, *args, **options):
+        batch_size = options.get('batch_size')
+        workers = options.get('workers')
+        rate = options.get('rate')
+        verbosity = int(options.get('verbosity'))
+
+        geocoded = failed = 0
+        last_pk = 0
+        while True:
+            locations = list(self.get_pending()\
+                                 .filter(pk__gt=last_pk)[:batch_size])
+            if not locations:
+                break
+            last_pk = locations[-1].pk
+
+            results = GeocodeResult.objects.geocode_many(
+                [location.get_geocode_address() for location in locations],
+                workers=workers, rate=rate)
+            for location in locations:
+                location_results = results[location.get_geocode_address()]
+                if not location_results:
+                    failed += 1
+                    continue
+                # Use the first result, just like the ``geocode`` signal
+                # handler.  Save the location, rather than updating the
+                # row, so ``post_save`` handlers, like the ones that
+                # reindex the location's stories, run.  Since the
+                # latitude and longitude are set, the ``geocode`` handler
+                # just sets the point.
+                place, (lat, lng) = location_results[0]
+                location.lat = lat
+                location.lng = lng
+                location.save()
+                geocoded += 1
+
+        message = "%d locations geocoded, %d locations not found" % (
+            geocoded, failed)
+        logger.info(message)
+        if verbosity > 1:
+            self.stdout.write(message + "\n")
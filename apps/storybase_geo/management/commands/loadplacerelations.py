@@ -1,6 +1,9 @@
 import csv
+from optparse import make_option
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.encoding import force_unicode
 from django.utils.translation import ugettext as _
 
 from storybase_geo.models import GeoLevel, Place, PlaceRelation
@@ -16,7 +19,22 @@ class Command(BaseCommand):
             "\t\t\tidentifier for the parent place\n"
             "  lookup_field\t\tName of model field used to look up places\n"
             "  child_geolevel\tGeoLevel model slug for GeoLevel of\n"
-            "\t\t\tchild places\n") 
+            "\t\t\tchild places\n\n"
+            "Relations are inserted in batches without checking for\n"
+            "cycles.  This is safe because parents are always at the\n"
+            "parent geolevel of the child places.\n")
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=1000,
+            help="Number of relations to insert at a time"),
+    )
+
+    def insert_relations(self, relations):
+        with transaction.commit_on_success():
+            PlaceRelation.objects.bulk_create(relations)
     
     def handle(self, *args, **options):
         try:
@@ -30,41 +48,56 @@ class Command(BaseCommand):
                                  "field, parent field, lookup field and "
                                  "child geolevel argument"))
 
+        batch_size = options.get('batch_size')
+        verbosity = int(options.get('verbosity'))
+
+        # Look up the primary keys of all the places at both geolevels
+        # at once instead of querying for each row.  Values are compared as
+        # unicode strings, since that's what comes out of the CSV file.
+        child_pks = dict([(unicode(value), pk) for value, pk in
+                          Place.objects.filter(geolevel=child_geolevel)\
+                                       .values_list(lookup_field, 'pk')])
+        parent_pks = dict([(unicode(value), pk) for value, pk in
+                           Place.objects.filter(
+                               geolevel=child_geolevel.parent)\
+                                        .values_list(lookup_field, 'pk')])
+        existing = set(PlaceRelation.objects.filter(
+            child__geolevel=child_geolevel).values_list('parent_id',
+                                                        'child_id'))
+
         reader = csv.DictReader(csv_file)
+        relations = []
+        created = 0
         try:
             for row in reader:
-                child_val = row[child_field]
-                parent_val = row[parent_field]
+                child_val = force_unicode(row[child_field])
+                parent_val = force_unicode(row[parent_field])
                 if child_val and parent_val:
-                    child_kwargs = {
-                        lookup_field: child_val, 
-                        'geolevel': child_geolevel
-                    }
-                    parent_kwargs = {
-                        lookup_field: parent_val, 
-                        'geolevel': child_geolevel.parent
-                    }
-                    try:
-                        child = Place.objects.get(**child_kwargs)
-                    except Place.DoesNotExist:
+                    child_pk = child_pks.get(child_val)
+                    if child_pk is None:
                         self.stderr.write("Child Place with %s \"%s\" and "
                             "geolevel \"%s\" does not exist, skipping row\n" %
                             (lookup_field, row[child_field], child_geolevel))
                         continue
 
-                    try:
-                        parent = Place.objects.get(**parent_kwargs)
-                    except Place.DoesNotExist:
+                    parent_pk = parent_pks.get(parent_val)
+                    if parent_pk is None:
                         self.stderr.write("Parent Place with %s \"%s\" and "
                             "geolevel \"%s\" does not exist, skipping row\n" %
                             (lookup_field, row[parent_field],
                              child_geolevel.parent))
                         continue
 
-                    relation = PlaceRelation(parent=parent, child=child)
-                    relation.save()
-                    self.stderr.write("Relationship %s created\n" %
-                                     (relation))
+                    if (parent_pk, child_pk) in existing:
+                        continue
+
+                    existing.add((parent_pk, child_pk))
+                    relations.append(PlaceRelation(parent_id=parent_pk,
+                                                   child_id=child_pk))
+                    if len(relations) == batch_size:
+                        self.insert_relations(relations)
+                        created += len(relations)
+                        relations = []
 
                 else:
                     self.stderr.write("Row has an empty value, skipping\n")
@@ -72,4 +105,11 @@ class Command(BaseCommand):
         except IndexError, e:
             raise CommandError(str(e))
 
+        if relations:
+            self.insert_relations(relations)
+            created += len(relations)
+
         csv_file.close()
+
+        if verbosity > 0:
+            self.stdout.write("%d place relations created\n" % (created))
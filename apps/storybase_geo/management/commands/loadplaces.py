@@ -1,21 +1,80 @@
 from optparse import make_option
+import uuid
 
+from django.contrib.gis.gdal import (CoordTransform, DataSource, OGRGeomType,
+    OGRException, SpatialReference)
+from django.contrib.gis.geos import MultiPolygon
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.utils.encoding import force_unicode
 from django.utils.translation import ugettext as _
 
+from storybase.utils import unique_slug
 from storybase_geo.models import GeoLevel, Place
-from storybase_geo.utils.layermapping import LayerMapping
+from storybase_geo.utils import simplify_boundary
 
 class Command(BaseCommand):
     args = "<shapefile> <name_field> <boundary_field>"
-    help = "Load places from a shapefile"
+    help = ("Load places from a shapefile\n\n"
+            "Features are read one at a time and inserted in batches, so\n"
+            "large files can be loaded without loading every feature into\n"
+            "memory.\n\n"
+            "Arguments:\n"
+            "  shapefile\t\tPath to the shapefile\n"
+            "  name_field\t\tName of the field containing place names\n"
+            "  boundary_field\tOGR geometry type of the features, either\n"
+            "\t\t\tPOLYGON or MULTIPOLYGON\n")
     option_list = BaseCommand.option_list + (
         make_option('--geolevel',
             action='store',
             dest='geolevel'),
+        make_option('--batch-size',
+            action='store',
+            type='int',
+            dest='batch_size',
+            default=1000,
+            help="Number of places to insert at a time"),
+        make_option('--simplify',
+            action='store',
+            type='float',
+            dest='simplify',
+            default=None,
+            help=("Simplify boundaries with this tolerance, in the units "
+                  "of the Place boundary field's spatial reference system")),
+        make_option('--encoding',
+            action='store',
+            dest='encoding',
+            default='utf-8',
+            help="Character encoding of the shapefile's attributes"),
     )
 
+    def get_transform(self, layer, srid):
+        """
+        Get a ``CoordTransform`` from the layer's spatial reference system
+        to the one of the boundary field, or None if they're the same
+        """
+        if layer.srs is None or layer.srs.srid == srid:
+            return None
+
+        return CoordTransform(layer.srs, SpatialReference(srid))
+
+    def get_boundary(self, feature, transform, srid, simplify):
+        """Get a ``MultiPolygon`` from a feature's geometry"""
+        geom = feature.geom
+        if transform is not None:
+            geom.transform(transform)
+        geom = geom.geos
+        if geom.geom_type == 'Polygon':
+            geom = MultiPolygon(geom)
+        geom.srid = srid
+        if simplify:
+            geom = simplify_boundary(geom, simplify)
+        return geom
+
+    def insert_places(self, places):
+        with transaction.commit_on_success():
+            Place.objects.bulk_create(places)
+
     def handle(self, *args, **options):
         try:
             shapefile = args[0]
@@ -25,19 +84,57 @@ class Command(BaseCommand):
             raise CommandError(_("You must provide a shapefile, name "
                                  "field  and boundary field argument"))
 
-        mapping = {'name': name_field,
-                   'boundary': boundary_field
-                  }
+        try:
+            geom_type = OGRGeomType(boundary_field)
+        except OGRException:
+            raise CommandError(_("Invalid boundary field %s") % boundary_field)
+        if geom_type.name not in ('Polygon', 'MultiPolygon'):
+            raise CommandError(_("Boundary field must be POLYGON or "
+                                 "MULTIPOLYGON"))
+
+        geolevel = None
         if options['geolevel']:
             geolevel = GeoLevel.objects.get(slug=options['geolevel'])
-            def _set_geolevel(sender, instance, **kwargs):
-                """
-                Signal callback to set the geolevel for a
-                place                 
-                """
-                instance.geolevel = geolevel
 
-            pre_save.connect(_set_geolevel, sender=Place)
+        batch_size = options.get('batch_size')
+        simplify = options.get('simplify')
+        encoding = options.get('encoding')
+        verbosity = int(options.get('verbosity'))
+
+        layer = DataSource(shapefile)[0]
+        if name_field not in layer.fields:
+            raise CommandError(_("Shapefile has no field named %s") %
+                               name_field)
+        srid = Place._meta.get_field('boundary').srid
+        transform = self.get_transform(layer, srid)
+        # Slugs of existing places.  New slugs are added as they're
+        # assigned so they're unique without a query per place.
+        slugs = set(Place.objects.exclude(slug='')\
+                                 .values_list('slug', flat=True))
+
+        places = []
+        loaded = 0
+        for feature in layer:
+            name = force_unicode(feature.get(name_field), encoding)
+            place = Place(name=name, geolevel=geolevel,
+                place_id=uuid.uuid4().hex,
+                slug=unique_slug(name, slugs),
+                boundary=self.get_boundary(feature, transform, srid,
+                                           simplify))
+            # ``bulk_create`` doesn't send ``pre_save``, so set the
+            # centroid and simplified boundaries here
+            place.set_boundary_geometries()
+            places.append(place)
+            if len(places) == batch_size:
+                self.insert_places(places)
+                loaded += len(places)
+                places = []
+                if verbosity > 1:
+                    self.stdout.write("%d places loaded\n" % (loaded))
+
+        if places:
+            self.insert_places(places)
+            loaded += len(places)
 
-        lm = LayerMapping(Place, shapefile, mapping)
-        lm.save(verbose=True)
+        if verbosity > 0:
+            self.stdout.write("%d places loaded\n" % (loaded))
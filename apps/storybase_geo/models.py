@@ -1,9 +1,19 @@
+from datetime import datetime, timedelta
+import hashlib
+import logging
+from multiprocessing.pool import ThreadPool
+import re
+
 from django.contrib.auth.models import User
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import Point
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db.models import Q
 from django.db.models.signals import pre_save
+from django.utils import simplejson
+from django.utils.encoding import force_unicode
 from django.utils.translation import ugettext_lazy as _
 from django_dag.models import edge_factory, node_factory
 from localflavor.us.us_states import STATE_CHOICES
@@ -13,7 +23,11 @@ from uuidfield.fields import UUIDField
 from storybase.models import DirtyFieldsMixin, PermissionMixin
 from storybase.fields import ShortTextField
 from storybase.utils import unique_slugify
-from storybase_geo.utils import get_geocoder
+import storybase_geo.settings as geo_settings
+from storybase_geo.utils import (RateLimiter, get_geocoder,
+    simplify_boundary)
+
+logger = logging.getLogger('storybase')
 
 class GeoLevel(MPTTModel):
     """A hierarchical type of geography"""
@@ -27,6 +41,192 @@ class GeoLevel(MPTTModel):
         return self.name
 
 
+class GeocodeResultManager(models.Manager):
+    def normalize(self, address):
+        """
+        Normalize an address so trivially different versions of the same
+        address share a stored result
+        """
+        return u" ".join(re.sub(r'[^\w\s]', u' ', force_unicode(address),
+                                flags=re.UNICODE).lower().split())
+
+    def make_key(self, address):
+        """Get the unique key for an address and the configured geocoder"""
+        return hashlib.md5(u"%s:%s" % (geo_settings.STORYBASE_GEOCODER,
+                                       self.normalize(address))\
+                           .encode('utf-8')).hexdigest()
+
+    def cache_key(self, key):
+        return 'storybase_geo.geocoderesult:%s' % key
+
+    def fetch(self, geocoder, address):
+        """
+        Geocode an address
+
+        This doesn't touch the database so it can be called from worker
+        threads.
+
+        Returns a list of ``(place, (lat, lng))`` tuples.
+
+        """
+        try:
+            return [(place, (float(lat), float(lng))) for place, (lat, lng)
+                    in geocoder.geocode(address, exactly_one=False)]
+        except ValueError:
+            # No match for address found
+            return []
+
+    def store(self, address, results):
+        """
+        Store the result of geocoding an address in the database and cache
+
+        Results are kept for ``STORYBASE_GEOCODE_TTL`` seconds.  Addresses
+        that couldn't be geocoded are kept for
+        ``STORYBASE_GEOCODE_NEGATIVE_TTL`` seconds.
+
+        """
+        key = self.make_key(address)
+        now = datetime.now()
+        if results:
+            ttl = geo_settings.STORYBASE_GEOCODE_TTL
+        else:
+            ttl = geo_settings.STORYBASE_GEOCODE_NEGATIVE_TTL
+        result, created = self.get_or_create(key=key, defaults={
+            'address': self.normalize(address),
+            'fetched': now,
+            'expires': now,
+        })
+        result.results = simplejson.dumps([(place, lat, lng)
+                                           for place, (lat, lng) in results])
+        result.fetched = now
+        result.expires = now + timedelta(seconds=ttl)
+        result.save()
+        cache.set(self.cache_key(key), results, ttl)
+        return result
+
+    def geocode(self, address, geocoder=None):
+        """
+        Geocode an address, only contacting the geocoder when there is
+        no unexpired stored result
+
+        Returns a list of ``(place, (lat, lng))`` tuples.
+
+        """
+        if not self.normalize(address):
+            return []
+
+        key = self.make_key(address)
+        results = cache.get(self.cache_key(key))
+        if results is None:
+            now = datetime.now()
+            try:
+                result = self.get(key=key, expires__gt=now)
+                results = result.get_results()
+                cache.set(self.cache_key(key), results,
+                          int((result.expires - now).total_seconds()))
+            except self.model.DoesNotExist:
+                if geocoder is None:
+                    geocoder = get_geocoder()
+                results = self.fetch(geocoder, address)
+                self.store(address, results)
+
+        return results
+
+    def geocode_many(self, addresses, workers=4, rate=None):
+        """
+        Geocode a list of addresses
+
+        Addresses without unexpired stored results are geocoded in
+        parallel using a pool of ``workers`` threads.  If ``rate`` is
+        specified, no more than that many requests per second are made
+        to the geocoder.
+
+        Returns a dictionary of lists of ``(place, (lat, lng))`` tuples
+        keyed by address.  Addresses that couldn't be geocoded because of
+        an error have an empty list.  These aren't stored, so they will be
+        geocoded again next time.
+
+        """
+        geocoded = {}
+        pending = {}
+        for address in addresses:
+            if not self.normalize(address):
+                geocoded[address] = []
+            else:
+                pending.setdefault(self.make_key(address), []).append(address)
+
+        for result in self.filter(key__in=pending.keys(),
+                                  expires__gt=datetime.now()):
+            for address in pending.pop(result.key):
+                geocoded[address] = result.get_results()
+
+        if not pending:
+            return geocoded
+
+        geocoder = get_geocoder()
+        limiter = RateLimiter(rate)
+
+        def fetch(address):
+            limiter.wait()
+            try:
+                return self.fetch(geocoder, address)
+            except Exception, e:
+                # Catch Exception here because the different geocoders
+                # and versions of geopy raise different exception classes.
+                # An error shouldn't discard the results of the other
+                # addresses.
+                logger.warning("Error geocoding address %s (%s)" %
+                               (address, e))
+                return None
+
+        # Only geocode one version of each normalized address
+        to_fetch = [key_addresses[0] for key_addresses in pending.values()]
+        pool = ThreadPool(workers)
+        try:
+            fetched = pool.map(fetch, to_fetch)
+        finally:
+            pool.close()
+            pool.join()
+
+        for address, results in zip(to_fetch, fetched):
+            if results is None:
+                # Don't store a negative result for what might be a
+                # temporary error
+                results = []
+            else:
+                self.store(address, results)
+            for pending_address in pending[self.make_key(address)]:
+                geocoded[pending_address] = results
+
+        return geocoded
+
+
+class GeocodeResult(models.Model):
+    """
+    A stored result of geocoding an address
+
+    This lets the same address be geocoded repeatedly without waiting
+    on the external geocoder each time.  Addresses that the geocoder
+    couldn't find are stored as well.
+
+    """
+    key = models.CharField(max_length=32, unique=True)
+    address = models.TextField()
+    results = models.TextField(default='[]')
+    fetched = models.DateTimeField()
+    expires = models.DateTimeField(db_index=True)
+
+    objects = GeocodeResultManager()
+
+    def __unicode__(self):
+        return self.address
+
+    def get_results(self):
+        """Get the results as a list of ``(place, (lat, lng))`` tuples"""
+        return [(place, (lat, lng)) for place, lat, lng
+                in simplejson.loads(self.results)]
+
+
 class LocationPermission(PermissionMixin):
     """Permissions for the Story model"""
     def user_can_change(self, user):
@@ -52,6 +252,22 @@ class LocationPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(owner=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class Location(LocationPermission, DirtyFieldsMixin, models.Model):
     """A location with a specific address or latitude and longitude"""
@@ -79,6 +295,9 @@ class Location(LocationPermission, DirtyFieldsMixin, models.Model):
                               null=True)
     objects = models.GeoManager()
 
+    # Fields whose changes are checked by the ``geocode`` signal handler
+    dirty_fields = ('address', 'city', 'state', 'postcode', 'lat', 'lng')
+
     def __unicode__(self):
         if self.name:
             unicode_rep = u"%s" % self.name
@@ -90,12 +309,16 @@ class Location(LocationPermission, DirtyFieldsMixin, models.Model):
 
         return unicode_rep
 
+    def get_geocode_address(self):
+        """Get the string used to geocode this location's address"""
+        return "%s %s %s %s" % (self.address, self.city, self.state,
+                                self.postcode)
+
     def _geocode(self, address):
         point = None
-        geocoder = get_geocoder()
         # There might be more than one matching location.  For now, just
         # assume the first one.
-        results = list(geocoder.geocode(address, exactly_one=False))
+        results = GeocodeResult.objects.geocode(address)
         if results:
             place, (lat, lng) = results[0]
             point = (lat, lng)
@@ -115,9 +338,7 @@ def geocode(sender, instance, **kwargs):
     elif ('address' in changed_fields or 'city' in changed_fields or
             'state' in changed_fields or 'postcode' in changed_fields or
             instance.lat is None or instance.lng is None):
-        point = instance._geocode("%s %s %s %s" % 
-            (instance.address, instance.city, instance.state, 
-             instance.postcode))
+        point = instance._geocode(instance.get_geocode_address())
         if point:
             (lat, lng) = point
             instance.lat = lat
@@ -142,6 +363,15 @@ class Place(node_factory('PlaceRelation')):
                                  verbose_name=_("GeoLevel"))
     boundary = models.MultiPolygonField(blank=True, null=True,
                                         verbose_name=_("Boundary"))
+    # Simplified versions of ``boundary`` for displaying at lower map
+    # zoom levels and its centroid.  These are set automatically from
+    # ``boundary``.
+    boundary_low = models.MultiPolygonField(blank=True, null=True,
+        editable=False, verbose_name=_("Low resolution boundary"))
+    boundary_medium = models.MultiPolygonField(blank=True, null=True,
+        editable=False, verbose_name=_("Medium resolution boundary"))
+    centroid = models.PointField(blank=True, null=True, editable=False,
+                                 verbose_name=_("Centroid"))
     place_id = UUIDField(auto=True, verbose_name=_("Place ID"), db_index=True)
     slug = models.SlugField(blank=True)
 
@@ -151,6 +381,39 @@ class Place(node_factory('PlaceRelation')):
     def __unicode__(self):
         return self.name
 
+    def set_boundary_geometries(self):
+        """
+        Set the centroid and simplified boundaries based on the
+        full-resolution boundary
+        """
+        if self.boundary is None:
+            self.centroid = None
+            self.boundary_low = None
+            self.boundary_medium = None
+            return
+
+        self.centroid = self.boundary.centroid
+        for tier, options in geo_settings.STORYBASE_BOUNDARY_TIERS.items():
+            setattr(self, "boundary_%s" % tier,
+                    simplify_boundary(self.boundary, options['tolerance']))
+
+    @classmethod
+    def get_boundary_field_name(cls, zoom=None):
+        """
+        Get the name of the boundary field to use when displaying places
+        at a given map zoom level
+        
+        If ``zoom`` is None, the full-resolution boundary field is used.
+        """
+        if zoom is not None:
+            tiers = sorted(geo_settings.STORYBASE_BOUNDARY_TIERS.items(),
+                           key=lambda item: item[1]['max_zoom'])
+            for tier, options in tiers:
+                if zoom <= options['max_zoom']:
+                    return "boundary_%s" % tier
+
+        return 'boundary'
+
 
 def set_place_slug(sender, instance, **kwargs):
     """
@@ -162,7 +425,16 @@ def set_place_slug(sender, instance, **kwargs):
     if not instance.slug:
         unique_slugify(instance, instance.name)
 
+def set_place_boundary_geometries(sender, instance, **kwargs):
+    """
+    Update a Place's centroid and simplified boundaries
+
+    Should be connected to Place's pre_save signal.
+    """
+    instance.set_boundary_geometries()
+
 pre_save.connect(set_place_slug, sender=Place)
+pre_save.connect(set_place_boundary_geometries, sender=Place)
 
 
 class PlaceRelation(edge_factory(Place, concrete=False)):
@@ -19,3 +19,42 @@ STORYBASE_GEOCODE_EXACTLY_ONE = getattr(settings,
 """
 Should the geocoder return more than one result?
 """
+
+STORYBASE_GEOCODE_TTL = getattr(settings, 'STORYBASE_GEOCODE_TTL',
+                                60 * 60 * 24 * 30)
+"""
+Number of seconds to keep the results of geocoding an address before
+geocoding it again
+
+Default is 30 days
+"""
+
+STORYBASE_GEOCODE_NEGATIVE_TTL = getattr(settings,
+                                         'STORYBASE_GEOCODE_NEGATIVE_TTL',
+                                         60 * 60 * 24)
+"""
+Number of seconds to remember that an address couldn't be geocoded
+
+Default is 1 day
+"""
+
+STORYBASE_BOUNDARY_TIERS = getattr(settings, 'STORYBASE_BOUNDARY_TIERS', {
+    'low': {
+        'tolerance': 0.01,
+        'max_zoom': 6,
+    },
+    'medium': {
+        'tolerance': 0.001,
+        'max_zoom': 10,
+    },
+})
+"""
+Simplified versions of Place boundaries
+
+Keys are the names of the tiers, which correspond to the ``boundary_low``
+and ``boundary_medium`` fields of the ``Place`` model.  ``tolerance`` is
+the simplification tolerance, in the units of the boundary's spatial
+reference system (degrees by default).  ``max_zoom`` is the largest map
+zoom level that the tier is used for.  At larger zoom levels, the full
+resolution boundary is used.
+"""
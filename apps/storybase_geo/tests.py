@@ -1,8 +1,18 @@
+from datetime import datetime
+from StringIO import StringIO
+import os
+import tempfile
+
 from geopy.geocoders.base import Geocoder
 
 from django.http import HttpRequest
 from django.contrib.auth.models import User
+from django.contrib.gis.geos import MultiPolygon, Polygon
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.core.urlresolvers import reverse
+from django.db.models.signals import post_save
 from django.test import TestCase
 
 from tastypie.test import ResourceTestCase, TestApiClient
@@ -10,7 +20,8 @@ from tastypie.test import ResourceTestCase, TestApiClient
 from storybase.tests.base import (SettingsChangingTestCase,
                                   SloppyComparisonTestMixin)
 from storybase_geo.api import GeocoderResource
-from storybase_geo.models import Location, Place
+from storybase_geo.models import (GeoLevel, GeocodeResult, Location, Place,
+    PlaceRelation)
 from storybase_geo.utils import get_geocoder
 from storybase_story.models import create_story
 
@@ -120,6 +131,166 @@ class LocationModelTest(MockGeocoderTestMixin, SloppyComparisonTestMixin,
         self.assertApxEqual(loc.point.x, -87.6474517)
         self.assertApxEqual(loc.point.y, 41.8716782)
 
+    def test_get_dirty_fields(self):
+        """
+        Test that only the fields checked when geocoding are tracked
+        """
+        loc = Location.objects.create(name="The Piton Foundation",
+                                      lat=39.7438167, lng=-104.9884953)
+        self.assertEqual(loc.get_dirty_fields(), {})
+        loc.name = "The Hull House"
+        self.assertEqual(loc.get_dirty_fields(), {})
+        loc.lat = 41.8716782
+        self.assertEqual(loc.get_dirty_fields(), {'lat': 39.7438167})
+        loc.save()
+        self.assertEqual(loc.get_dirty_fields(), {})
+
+    def test_get_dirty_fields_deferred(self):
+        """
+        Test that checking for changes doesn't load deferred fields
+        """
+        loc = Location.objects.create(name="The Piton Foundation",
+                                      lat=39.7438167, lng=-104.9884953)
+        loc = Location.objects.only('name', 'lng').get(pk=loc.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(loc.get_dirty_fields(), {})
+            loc.lng = -87.6474517
+            self.assertEqual(loc.get_dirty_fields(), {'lng': -104.9884953})
+
+
+class CountingMockGeocoder(MockGeocoder):
+    """
+    Mock geocoder that records the addresses it geocodes
+
+    Geocoding the address "Error" raises an exception.
+
+    """
+    calls = []
+
+    def geocode(self, string, exactly_one=True):
+        CountingMockGeocoder.calls.append(string)
+        if string == "Error":
+            raise IOError("Connection reset by peer")
+        return super(CountingMockGeocoder, self).geocode(string, exactly_one)
+
+
+class GeocodeResultTest(SettingsChangingTestCase):
+    def get_settings_module(self):
+        from storybase_geo import settings
+        return settings
+
+    def setUp(self):
+        super(GeocodeResultTest, self).setUp()
+        self.set_setting('STORYBASE_GEOCODER',
+                         "storybase_geo.tests.CountingMockGeocoder")
+        CountingMockGeocoder.calls = []
+        cache.clear()
+
+    def test_normalize(self):
+        self.assertEqual(
+            GeocodeResult.objects.normalize("370 17th St,  Denver, CO 80202"),
+            GeocodeResult.objects.normalize("370 17TH ST DENVER CO 80202"))
+
+    def test_geocode_stored(self):
+        results = GeocodeResult.objects.geocode("370 17th St, Denver, CO 80202")
+        self.assertEqual(results, [("", (39.7438167, -104.9884953))])
+        # A trivially different version of the address shouldn't be
+        # geocoded again, even when it isn't in the cache
+        cache.clear()
+        results = GeocodeResult.objects.geocode("370 17th St Denver CO 80202")
+        self.assertEqual(results, [("", (39.7438167, -104.9884953))])
+        self.assertEqual(len(CountingMockGeocoder.calls), 1)
+        self.assertEqual(GeocodeResult.objects.count(), 1)
+
+    def test_geocode_negative(self):
+        self.assertEqual(GeocodeResult.objects.geocode("Nowhere"), [])
+        self.assertEqual(GeocodeResult.objects.geocode("Nowhere"), [])
+        self.assertEqual(len(CountingMockGeocoder.calls), 1)
+
+    def test_geocode_expired(self):
+        GeocodeResult.objects.geocode("Denver")
+        GeocodeResult.objects.update(expires=datetime.now())
+        cache.clear()
+        GeocodeResult.objects.geocode("Denver")
+        self.assertEqual(len(CountingMockGeocoder.calls), 2)
+
+    def test_geocode_many(self):
+        GeocodeResult.objects.geocode("golden, co")
+        addresses = ["Denver", "80202", "denver", "golden, co", "Nowhere",
+                     "  "]
+        results = GeocodeResult.objects.geocode_many(addresses, workers=2,
+                                                     rate=100)
+        self.assertEqual(results["Denver"],
+                         [("", (39.737567, -104.9847179))])
+        self.assertEqual(results["denver"], results["Denver"])
+        self.assertEqual(results["80202"],
+                         [("", (39.7541032, -105.000224))])
+        self.assertEqual(results["golden, co"],
+                         [("", (39.756655, -105.224949))])
+        self.assertEqual(results["Nowhere"], [])
+        self.assertEqual(results["  "], [])
+        self.assertEqual(sorted(CountingMockGeocoder.calls),
+                         ["80202", "Denver", "Nowhere", "golden, co"])
+
+    def test_geocode_many_error(self):
+        """
+        Test that an error geocoding one address doesn't discard the
+        results of the others and isn't stored
+        """
+        results = GeocodeResult.objects.geocode_many(["Denver", "Error"],
+                                                     workers=2)
+        self.assertEqual(results["Denver"],
+                         [("", (39.737567, -104.9847179))])
+        self.assertEqual(results["Error"], [])
+        self.assertEqual(GeocodeResult.objects.count(), 1)
+        # The address that failed is tried again
+        GeocodeResult.objects.geocode_many(["Denver", "Error"], workers=2)
+        self.assertEqual(sorted(CountingMockGeocoder.calls),
+                         ["Denver", "Error", "Error"])
+
+
+class GeocodeLocationsCommandTest(SettingsChangingTestCase):
+    def get_settings_module(self):
+        from storybase_geo import settings
+        return settings
+
+    def setUp(self):
+        super(GeocodeLocationsCommandTest, self).setUp()
+        self.set_setting('STORYBASE_GEOCODER',
+                         "storybase_geo.tests.CountingMockGeocoder")
+        CountingMockGeocoder.calls = []
+        cache.clear()
+        self.saved = []
+        post_save.connect(self.record_save, sender=Location)
+
+    def tearDown(self):
+        post_save.disconnect(self.record_save, sender=Location)
+        super(GeocodeLocationsCommandTest, self).tearDown()
+
+    def record_save(self, sender, instance, **kwargs):
+        self.saved.append(instance.pk)
+
+    def test_geocode_locations(self):
+        """
+        Test that locations are geocoded and saved so handlers that
+        reindex their stories run
+        """
+        location = Location.objects.create(name="Denver", city="Denver")
+        not_found = Location.objects.create(name="Nowhere", city="Nowhere")
+        # Simulate locations that weren't geocoded when they were saved
+        Location.objects.update(lat=None, lng=None, point=None)
+        GeocodeResult.objects.store(location.get_geocode_address(),
+                                    [("", (39.737567, -104.9847179))])
+        self.saved = []
+        call_command('geocode_locations', workers=1)
+        location = Location.objects.get(pk=location.pk)
+        self.assertEqual(location.lat, 39.737567)
+        self.assertEqual(location.lng, -104.9847179)
+        self.assertEqual(location.point.x, -104.9847179)
+        self.assertEqual(location.point.y, 39.737567)
+        self.assertEqual(self.saved, [location.pk])
+        self.assertEqual(Location.objects.get(pk=not_found.pk).point, None)
+
 
 class DefaultGeocoderTest(OpenMapQuestGeocoderTestMixin, 
         SettingsChangingTestCase):
@@ -395,3 +566,164 @@ class LocationResourceTest(ResourceTestCase):
         self.assertHttpUnauthorized(resp)
         self.assertEqual(Location.objects.count(), 1)
         self.assertEqual(self.user2.locations.count(), 1)
+
+
+class PlaceModelTest(TestCase):
+    def test_boundary_geometries(self):
+        # A square with lots of nearly collinear points along one side
+        points = [(0, 0)] + [(1 + (i % 2) * 0.0001, i * 0.01)
+                             for i in range(101)] + [(0, 1), (0, 0)]
+        boundary = MultiPolygon(Polygon(points), srid=4326)
+        place = Place.objects.create(name="Square", boundary=boundary)
+        place = Place.objects.get(pk=place.pk)
+        self.assertAlmostEqual(place.centroid.x, boundary.centroid.x)
+        self.assertAlmostEqual(place.centroid.y, boundary.centroid.y)
+        self.assertEqual(place.boundary_low.geom_type, 'MultiPolygon')
+        self.assertTrue(place.boundary_low.num_coords <
+                        place.boundary.num_coords)
+
+    def test_boundary_geometries_no_boundary(self):
+        place = Place.objects.create(name="Nowhere")
+        self.assertEqual(place.centroid, None)
+        self.assertEqual(place.boundary_low, None)
+
+    def test_get_boundary_field_name(self):
+        self.assertEqual(Place.get_boundary_field_name(4), 'boundary_low')
+        self.assertEqual(Place.get_boundary_field_name(8), 'boundary_medium')
+        self.assertEqual(Place.get_boundary_field_name(14), 'boundary')
+        self.assertEqual(Place.get_boundary_field_name(), 'boundary')
+
+
+class PlaceTypeaheadResourceTest(ResourceTestCase):
+    def setUp(self):
+        super(PlaceTypeaheadResourceTest, self).setUp()
+        cache.clear()
+        for name in ("Denver", "Denver County", "North Denver", "Boulder"):
+            Place.objects.create(name=name)
+        self.uri = '/api/0.1/typeahead/places/'
+
+    def tearDown(self):
+        cache.clear()
+
+    def get_names(self, **data):
+        resp = self.api_client.get(self.uri, data=data)
+        self.assertValidJSONResponse(resp)
+        return [obj['name'] for obj in self.deserialize(resp)['objects']]
+
+    def test_get_list(self):
+        """Test that names starting with the query are listed first"""
+        self.assertEqual(self.get_names(q="den"),
+                         ["Denver", "Denver County", "North Denver"])
+
+    def test_get_list_ids(self):
+        resp = self.api_client.get(self.uri, data={'q': "Boulder"})
+        objects = self.deserialize(resp)['objects']
+        self.assertEqual(objects, [{
+            'id': Place.objects.get(name="Boulder").place_id,
+            'name': "Boulder",
+        }])
+
+    def test_get_list_limit(self):
+        self.assertEqual(self.get_names(q="den", limit=2),
+                         ["Denver", "Denver County"])
+
+    def test_get_list_no_query(self):
+        self.assertEqual(self.get_names(), [])
+
+    def test_get_list_cached(self):
+        """Test that suggestions for a query are cached"""
+        self.assertEqual(self.get_names(q="bou"), ["Boulder"])
+        Place.objects.create(name="Boulder County")
+        self.assertEqual(self.get_names(q="bou"), ["Boulder"])
+        self.assertEqual(self.get_names(q="boul"),
+                         ["Boulder", "Boulder County"])
+
+    def test_get_list_cache_control(self):
+        resp = self.api_client.get(self.uri, data={'q': "den"})
+        self.assertIn('max-age', resp['Cache-Control'])
+
+
+class LoadPlacesCommandTest(TestCase):
+    def setUp(self):
+        self.geolevel = GeoLevel.objects.create(name="City", slug="city")
+        self.denver = Place.objects.create(name="Denver")
+        square = "[[[-105, 39], [-104, 39], [-104, 40], [-105, 40], [-105, 39]]]"
+        features = [
+            ('Denver', 'Polygon', square),
+            ('Denver', 'Polygon', square),
+            ('Aurora', 'MultiPolygon', "[%s]" % square),
+        ]
+        (fd, self.geojson_filename) = tempfile.mkstemp(suffix='.geojson')
+        geojson_file = os.fdopen(fd, 'w')
+        geojson_file.write('{"type": "FeatureCollection", "features": [%s]}' %
+            ", ".join(['{"type": "Feature", "properties": {"NAME": "%s"}, '
+                       '"geometry": {"type": "%s", "coordinates": %s}}' %
+                       feature for feature in features]))
+        geojson_file.close()
+
+    def tearDown(self):
+        os.remove(self.geojson_filename)
+
+    def test_load(self):
+        stdout = StringIO()
+        call_command('loadplaces', self.geojson_filename, 'NAME',
+                     'MULTIPOLYGON', geolevel='city', batch_size=2,
+                     simplify=0.01, verbosity=2, stdout=stdout)
+        # Places are inserted in a batch of 2 and then a batch of 1
+        self.assertEqual(stdout.getvalue(),
+                         "2 places loaded\n3 places loaded\n")
+        places = Place.objects.exclude(pk=self.denver.pk).order_by('pk')
+        self.assertEqual([place.name for place in places],
+                         ["Denver", "Denver", "Aurora"])
+        # Slugs are unique, including against existing places
+        self.assertEqual([place.slug for place in places],
+                         ["denver-2", "denver-3", "aurora"])
+        self.assertEqual(Place.objects.get(pk=self.denver.pk).slug, "denver")
+        for place in places:
+            self.assertEqual(place.geolevel, self.geolevel)
+            self.assertEqual(place.boundary.geom_type, 'MultiPolygon')
+            self.assertAlmostEqual(place.centroid.x, -104.5)
+            self.assertAlmostEqual(place.centroid.y, 39.5)
+            self.assertNotEqual(place.boundary_low, None)
+            self.assertNotEqual(place.boundary_medium, None)
+        self.assertEqual(len(set(place.place_id for place in places)), 3)
+
+    def test_load_missing_field(self):
+        self.assertRaises(CommandError, call_command, 'loadplaces',
+                          self.geojson_filename, 'MISSING', 'MULTIPOLYGON',
+                          verbosity=0)
+
+
+class LoadPlaceRelationsCommandTest(TestCase):
+    def setUp(self):
+        self.state_level = GeoLevel.objects.create(name="State", slug="state")
+        self.city_level = GeoLevel.objects.create(name="City", slug="city",
+                                                  parent=self.state_level)
+        self.illinois = Place.objects.create(name="Illinois",
+                                             geolevel=self.state_level)
+        self.colorado = Place.objects.create(name="Colorado",
+                                             geolevel=self.state_level)
+        self.chicago = Place.objects.create(name="Chicago",
+                                            geolevel=self.city_level)
+        self.denver = Place.objects.create(name="Denver",
+                                           geolevel=self.city_level)
+        (fd, self.csv_filename) = tempfile.mkstemp(suffix='.csv')
+        csv_file = os.fdopen(fd, 'w')
+        csv_file.write("city,state\n"
+                       "Chicago,Illinois\n"
+                       "Denver,Colorado\n"
+                       "Boulder,Colorado\n"
+                       "Chicago,Illinois\n")
+        csv_file.close()
+
+    def tearDown(self):
+        os.remove(self.csv_filename)
+
+    def test_load(self):
+        PlaceRelation.objects.create(parent=self.illinois, child=self.chicago)
+        call_command('loadplacerelations', self.csv_filename, 'city',
+                     'state', 'name', 'city', batch_size=1, verbosity=0,
+                     stderr=StringIO())
+        self.assertEqual(PlaceRelation.objects.count(), 2)
+        self.assertEqual(list(self.denver.parents()), [self.colorado])
+        self.assertEqual(list(self.chicago.parents()), [self.illinois])
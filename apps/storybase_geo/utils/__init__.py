@@ -1,3 +1,8 @@
+import threading
+import time
+
+from django.contrib.gis.geos import MultiPolygon
+
 from storybase.utils import import_class
 
 def get_geocoder():
@@ -5,3 +10,41 @@ def get_geocoder():
     from storybase_geo import settings
     geocoder_class = import_class(settings.STORYBASE_GEOCODER)
     return geocoder_class(**settings.STORYBASE_GEOCODER_ARGS)
+
+
+def simplify_boundary(boundary, tolerance):
+    """
+    Simplify a MultiPolygon boundary
+
+    Always returns a MultiPolygon.  If simplification would make the
+    boundary disappear entirely, the original boundary is returned.
+    """
+    simplified = boundary.simplify(tolerance, preserve_topology=True)
+    if simplified.empty:
+        return boundary
+    if simplified.geom_type == 'Polygon':
+        simplified = MultiPolygon(simplified)
+    simplified.srid = boundary.srid
+    return simplified
+
+
+class RateLimiter(object):
+    """
+    Limit the rate at which something is done, across threads
+
+    Call ``wait()`` before each call that should be rate limited.  It
+    blocks until the call is allowed.  If ``rate``, the number of calls
+    per second, is None, calls are not limited.
+    """
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_call = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.time()
+            delay = self.next_call - now
+            self.next_call = max(now, self.next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
@@ -25,7 +25,7 @@ class HelpResource(TranslatedModelResource):
     body = fields.CharField(attribute='body')
 
     class Meta:
-        queryset = Help.objects.all()
+        queryset = Help.objects.with_translations()
         resource_name = 'help'
         list_allowed_methods = ['get', 'post']
         authentication = Authentication()
@@ -5,10 +5,11 @@ from django.utils.translation import ugettext_lazy as _
 from uuidfield.fields import UUIDField
 
 from storybase.fields import ShortTextField
+from storybase.managers import TranslatedManager
 from storybase.models.translation import TranslatedModel, TranslationModel
 
 
-class HelpManager(models.Manager):
+class HelpManager(TranslatedManager):
     def get_by_natural_key(self, help_id):
         return self.get(help_id=help_id)
 
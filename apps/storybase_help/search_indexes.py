@@ -38,11 +38,16 @@ class HelpIndex(indexes.SearchIndex, indexes.Indexable):
         else:
             super(HelpIndex, self).update_object(instance, using, **kwargs)
 
-    def translation_update_object(self, instance, **kwargs):
-        """Signal handler for updating search index when the translation changes"""
+    def translation_objects(self, instance):
+        """Get the help items affected by a change to a translation"""
         # Deal with race condition when items are deleted
         # See issue #138
         try:
-            self.update_object(instance.help)
+            return [instance.help]
         except Help.DoesNotExist:
-            pass
+            return []
+
+    def translation_update_object(self, instance, **kwargs):
+        """Signal handler for updating search index when the translation changes"""
+        for help_item in self.translation_objects(instance):
+            self.update_object(help_item)
@@ -1,6 +1,7 @@
 from datetime import datetime
 import logging
 from optparse import make_option
+import time
 
 from django.core.management.base import BaseCommand
 
@@ -17,6 +18,24 @@ class Command(BaseCommand):
                 dest='send_on',
                 default=None,
                 help="Specify a send on date/time other than now"),
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=None,
+                help="Number of notifications to render and send at a time"),
+            make_option('--connections',
+                action='store',
+                type='int',
+                dest='connections',
+                default=None,
+                help="Number of mail server connections to send over in parallel"),
+            make_option('--retries',
+                action='store',
+                type='int',
+                dest='retries',
+                default=None,
+                help="Number of times to retry a message that fails to send"),
             )
     
     def handle(self, *args, **options):
@@ -28,11 +47,18 @@ class Command(BaseCommand):
                 send_on = datetime.strptime(send_on)
 
             from storybase_messaging.models import StoryNotification
-            (sent, unsent) = StoryNotification.objects.send_emails(send_on=send_on)
+            started = time.time()
+            (sent, unsent) = StoryNotification.objects.send_emails(
+                send_on=send_on,
+                batch_size=options.get('batch_size'),
+                connections=options.get('connections'),
+                retries=options.get('retries'))
+            elapsed = time.time() - started
 
             message = "%d story notifications sent" % (len(sent))
             if len(unsent):
                 message += " %d story notifications failed" % (len(unsent))
+            message += " in %.2f seconds" % (elapsed)
 
             logger.info(message)
             if int(options.get('verbosity')) > 1:
@@ -1,37 +1,127 @@
 from datetime import datetime 
+import logging
+from multiprocessing.pool import ThreadPool
+import time
 
 from django.core.mail import get_connection
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+
+import storybase_messaging.settings as messaging_settings
+
+logger = logging.getLogger('storybase')
 
 class EmailMessageList(list):
     """A list of ``EmailMessage`` objects that can be sent all at once"""
 
-    def send(self):
+    def send_with_connection(self, messages, retries=0, backoff=1):
+        """
+        Send messages over a single connection, retrying failures
+
+        A message that fails to send is retried up to ``retries`` times,
+        waiting ``backoff`` seconds before the first retry and doubling the
+        wait after each subsequent failure.  The connection is reopened
+        before each retry because a failure usually means the server
+        dropped it.  A failure to open the connection counts as a failed
+        attempt to send the current message.
+
+        Returns a list of ``(message, sent)`` tuples.
+
+        """
+        results = []
+        connection = get_connection()
+        is_open = False
+        try:
+            for message in messages:
+                message.connection = connection
+                attempt = 0
+                while True:
+                    try:
+                        if not is_open:
+                            connection.open()
+                            is_open = True
+                        message.send()
+                        results.append((message, True))
+                        break
+                    except Exception, e:
+                        # Catch Exception here because the different
+                        # backends are likely to raise different exception
+                        # classes
+                        recipients = ", ".join(message.to)
+                        if attempt >= retries:
+                            logger.error("Error sending e-mail to %s (%s)" %
+                                         (recipients, e))
+                            results.append((message, False))
+                            break
+                        delay = backoff * (2 ** attempt)
+                        logger.warning("Error sending e-mail to %s (%s), "
+                                       "retrying in %s seconds" %
+                                       (recipients, e, delay))
+                        attempt += 1
+                        time.sleep(delay)
+                        self.close_connection(connection)
+                        is_open = False
+        finally:
+            self.close_connection(connection)
+        return results
+
+    def close_connection(self, connection):
+        """Close a connection, ignoring errors from a broken connection"""
+        try:
+            connection.close()
+        except Exception, e:
+            logger.warning("Error closing e-mail connection (%s)" % e)
+
+    def send(self, connections=1, retries=0, backoff=1):
         """
         Send all messages in this list
 
         Returns a tuple of lists of messages that were successfully sent and
         those that were unsent
+
+        Keyword arguments:
+
+        * connections - Number of connections to the mail server to send
+                        messages over in parallel
+        * retries - Number of times to retry sending a message that fails
+        * backoff - Seconds to wait before the first retry of a failed
+                    message.  The wait is doubled for each further retry.
         
         """
-        sent = []
-        unsent = []
-        connection = get_connection()
-        connection.open()
-        for message in self:
-            message.connection = connection
+        if not len(self):
+            return ([], [])
+
+        started = time.time()
+        connections = max(1, min(connections, len(self)))
+        # Split the messages into one chunk per connection
+        chunks = [self[i::connections] for i in range(connections)]
+        if connections == 1:
+            chunk_results = [self.send_with_connection(chunks[0], retries,
+                                                       backoff)]
+        else:
+            pool = ThreadPool(connections)
             try:
-                message.send()
-                sent.append(message)
-            except Exception, e:
-                # Catch Exception here because the different backends are
-                # likely to raise different exception classes
-                import logging
-                logger = logging.getLogger('storybase')
-                recipients = ", ".join(message.to)
-                logger.error("Error sending e-mail to %s (%s)" % (recipients, e))
-                unsent.append(message)
-        connection.close()
+                chunk_results = pool.map(lambda chunk:
+                    self.send_with_connection(chunk, retries, backoff),
+                    chunks)
+            finally:
+                pool.close()
+                pool.join()
+
+        succeeded = set()
+        for results in chunk_results:
+            for message, result in results:
+                if result:
+                    succeeded.add(id(message))
+        sent = [message for message in self if id(message) in succeeded]
+        unsent = [message for message in self
+                  if id(message) not in succeeded]
+
+        elapsed = time.time() - started
+        logger.info("Sent %d of %d e-mails over %d connections in %.2f "
+                    "seconds (%.1f messages/second)" %
+                    (len(sent), len(self), connections, elapsed,
+                     len(sent) / elapsed if elapsed else len(sent)))
         return (sent, unsent)
 
 
@@ -39,7 +129,7 @@ class StoryNotificationQuerySet(models.query.QuerySet):
     def unsent(self):
         return self.filter(sent=None)
 
-    def ready_to_send(self, send_on=None):
+    def ready_to_send(self, send_on=None, max_attempts=None):
         """
         Returns a queryset filtered to notifications that are ready to send
 
@@ -48,17 +138,40 @@ class StoryNotificationQuerySet(models.query.QuerySet):
         * send_on - If the notification's ``send_on`` field is equal to or
                     before this field, consider it ready to send.
                     Defaults to ``datetime.now()``.
+        * max_attempts - Exclude notifications that have failed to send
+                         this many times.  Defaults to
+                         ``STORYBASE_NOTIFICATION_MAX_ATTEMPTS``.
 
         """
         if send_on is None:
             send_on = datetime.now()
+        if max_attempts is None:
+            max_attempts = messaging_settings.STORYBASE_NOTIFICATION_MAX_ATTEMPTS
 
-        return self.unsent().filter(send_on__lte=send_on)
+        return self.unsent().filter(send_on__lte=send_on)\
+                   .exclude(failure__attempts__gte=max_attempts)
 
     def emails(self):
+        """
+        Returns an ``EmailMessageList`` of the notifications' messages
+
+        Each message has a ``notification_id`` attribute with the primary
+        key of the notification it was generated from.
+
+        """
+        # HACK: Import here to avoid circular import
+        from storybase_story.models import Story
+
+        # Every message lists the same recent stories, less the notification's
+        # own story, so fetch them once for the whole batch
+        recent_stories = list(Story.objects.public().order_by('-published')[:4])
         emails = EmailMessageList() 
-        for notification in self:
-            emails.append(notification.get_email())
+        for notification in self.select_related('story', 'story__author'):
+            notification.recent_stories = [story for story in recent_stories
+                                           if story.pk != notification.story_id][:3]
+            email = notification.get_email()
+            email.notification_id = notification.pk
+            emails.append(email)
         return emails
 
 
@@ -66,10 +179,35 @@ class StoryNotificationManager(models.Manager):
     def get_query_set(self):
         return StoryNotificationQuerySet(self.model, using=self._db)
 
-    def send_emails(self, send_on=None):
+    def record_failures(self, pks):
+        """
+        Record a failed attempt to send each of a list of notifications
+        """
+        # HACK: Import here to avoid circular import
+        from storybase_messaging.models import StoryNotificationFailure
+
+        with transaction.commit_on_success():
+            failures = StoryNotificationFailure.objects.filter(
+                notification__in=pks)
+            failures.update(attempts=F('attempts') + 1,
+                            last_attempt=datetime.now())
+            existing = set(failures.values_list('notification_id', flat=True))
+            StoryNotificationFailure.objects.bulk_create([
+                StoryNotificationFailure(notification_id=pk, attempts=1)
+                for pk in pks if pk not in existing])
+
+    def send_emails(self, send_on=None, batch_size=None, connections=None,
+                    retries=None, backoff=None):
         """
         Send all notification emails that are ready to send
 
+        Messages are rendered and sent in batches.  After each batch,
+        the notifications whose messages were sent successfully have their
+        ``sent`` field set.  Notifications whose messages couldn't be sent
+        have the failure recorded in a ``StoryNotificationFailure`` and are
+        tried again the next time this method is called, until they have
+        failed ``STORYBASE_NOTIFICATION_MAX_ATTEMPTS`` times.
+
         Returns a tuple of lists of messages that were successfully sent and
         those that were unsent
 
@@ -78,8 +216,41 @@ class StoryNotificationManager(models.Manager):
         * send_on - If the notification's ``send_on`` field is equal to or
                     before this field, consider it ready to send.
                     Defaults to ``datetime.now()``.
+        * batch_size - Number of messages to render and send at a time.
+                       Defaults to ``STORYBASE_NOTIFICATION_BATCH_SIZE``.
+        * connections - Number of connections to the mail server to send
+                        messages over in parallel.  Defaults to
+                        ``STORYBASE_NOTIFICATION_CONNECTIONS``.
+        * retries - Number of times to retry a failed message.  Defaults to
+                    ``STORYBASE_NOTIFICATION_RETRIES``.
+        * backoff - Seconds to wait before retrying a failed message.
+                    Defaults to ``STORYBASE_NOTIFICATION_RETRY_BACKOFF``.
         """
-        qs = self.get_query_set().ready_to_send(send_on)
-        (sent, unsent) = qs.emails().send()
-        qs.update(sent=datetime.now())
+        if batch_size is None:
+            batch_size = messaging_settings.STORYBASE_NOTIFICATION_BATCH_SIZE
+        if connections is None:
+            connections = messaging_settings.STORYBASE_NOTIFICATION_CONNECTIONS
+        if retries is None:
+            retries = messaging_settings.STORYBASE_NOTIFICATION_RETRIES
+        if backoff is None:
+            backoff = messaging_settings.STORYBASE_NOTIFICATION_RETRY_BACKOFF
+
+        pks = list(self.get_query_set().ready_to_send(send_on)\
+                       .order_by('pk').values_list('pk', flat=True))
+        sent = []
+        unsent = []
+        for i in range(0, len(pks), batch_size):
+            emails = self.get_query_set().filter(pk__in=pks[i:i + batch_size])\
+                                         .emails()
+            (batch_sent, batch_unsent) = emails.send(connections=connections,
+                retries=retries, backoff=backoff)
+            if batch_sent:
+                self.get_query_set().filter(
+                    pk__in=[email.notification_id for email in batch_sent])\
+                    .update(sent=datetime.now())
+            if batch_unsent:
+                self.record_failures([email.notification_id
+                                      for email in batch_unsent])
+            sent.extend(batch_sent)
+            unsent.extend(batch_unsent)
         return (sent, unsent)
@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import models, transaction
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.template import Context
@@ -76,18 +76,51 @@ class SystemMessage(Message):
 
     notification_type = "system_message"
 
-    def send_notifications(self):
-        """Send a notification to all users"""
+    def send_notifications(self, batch_size=None):
+        """
+        Send a notification to all users
+
+        Notifications are queued for active users in chunks of
+        ``batch_size`` users, in primary key order, with one
+        ``NoticeQueueBatch`` per chunk.  The last user queued is recorded
+        in a ``SystemMessageProgress`` in the same transaction as the
+        chunk, so calling this method again after an interrupted send picks
+        up where it left off instead of notifying users twice.
+
+        Keyword arguments:
+
+        * batch_size - Number of users to queue notifications for at a
+                       time.  Defaults to
+                       ``STORYBASE_SYSTEM_MESSAGE_BATCH_SIZE``.
+
+        """
         from datetime import datetime
         if notification:
             from django.contrib.auth.models import User
 
+            if batch_size is None:
+                batch_size = messaging_settings.STORYBASE_SYSTEM_MESSAGE_BATCH_SIZE
+
+            progress, created = SystemMessageProgress.objects.get_or_create(
+                message=self)
             context = {
                 'message': self,
             }
-            notification.send(User.objects.filter(is_active=True), 
-                              self.notification_type, 
-                              context, on_site=False, queue=True)
+            while True:
+                user_ids = list(User.objects.filter(is_active=True,
+                                    pk__gt=progress.last_user_id)\
+                                .order_by('pk')\
+                                .values_list('pk', flat=True)[:batch_size])
+                if not user_ids:
+                    break
+
+                with transaction.commit_on_success():
+                    notification.send(User.objects.filter(pk__in=user_ids),
+                                      self.notification_type,
+                                      context, queue=True)
+                    progress.last_user_id = user_ids[-1]
+                    progress.queued += len(user_ids)
+                    progress.save()
         else:
             pass
 
@@ -95,6 +128,24 @@ class SystemMessage(Message):
         self.save()
 
 
+class SystemMessageProgress(models.Model):
+    """
+    Progress of queueing notifications for a ``SystemMessage``
+
+    Notifications are queued for users in primary key order, so
+    ``last_user_id`` is the primary key of the last user who has had
+    a notification queued.
+    """
+    message = models.OneToOneField(SystemMessage, related_name='progress')
+    last_user_id = models.PositiveIntegerField(default=0)
+    queued = models.PositiveIntegerField(default=0)
+    last_edited = models.DateTimeField(auto_now=True)
+
+    def __unicode__(self):
+        return u"%s: %d notifications queued" % (self.message_id,
+                                                  self.queued)
+
+
 class StoryNotification(models.Model):
     """
     Notification sent to user on certain story events
@@ -221,10 +272,15 @@ class StoryNotification(models.Model):
         if context is not None:
             return context
         else:
+            # ``recent_stories`` can be set ahead of time when generating
+            # messages in bulk to avoid a query per message
+            recent_stories = getattr(self, 'recent_stories', None)
+            if recent_stories is None:
+                recent_stories = Story.objects.public().exclude(pk=self.story.pk).order_by('-published')[:3]
             self._context = Context({
               'story': self.story,
               'unpublished_stories': self.story.author.stories.filter(status='draft').exclude(pk=self.story.pk).order_by('-created'),
-              'recent_stories': Story.objects.public().exclude(pk=self.story.pk).order_by('-published')[:3],
+              'recent_stories': recent_stories,
               # Pre-cook a bunch of URL paths to make template
               # markup leaner
               'builder_url': full_url(self.story.builder_url()),
@@ -269,6 +325,23 @@ class StoryNotification(models.Model):
         return email 
 
 
+class StoryNotificationFailure(models.Model):
+    """
+    Failed attempts to send a ``StoryNotification``
+
+    Notifications that have failed ``STORYBASE_NOTIFICATION_MAX_ATTEMPTS``
+    times are no longer sent.
+    """
+    notification = models.OneToOneField(StoryNotification,
+                                        related_name='failure')
+    attempts = models.PositiveIntegerField(default=0)
+    last_attempt = models.DateTimeField(auto_now=True)
+
+    def __unicode__(self):
+        return u"%s: %d failed attempts" % (self.notification_id,
+                                            self.attempts)
+
+
 def update_story_unpublished_notification(sender, instance, **kwargs):
     """Create/update story notification objects based on story state"""
     created = kwargs.get('created', False)
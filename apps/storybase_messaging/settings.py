@@ -9,3 +9,61 @@ story notifications
 Default is 5
 
 """
+
+STORYBASE_NOTIFICATION_BATCH_SIZE = getattr(settings,
+    'STORYBASE_NOTIFICATION_BATCH_SIZE', 100)
+"""
+Number of story notification emails to render and send at a time
+
+Default is 100
+
+"""
+
+STORYBASE_NOTIFICATION_CONNECTIONS = getattr(settings,
+    'STORYBASE_NOTIFICATION_CONNECTIONS', 4)
+"""
+Number of connections to the mail server used to send story notification
+emails in parallel
+
+Default is 4
+
+"""
+
+STORYBASE_NOTIFICATION_RETRIES = getattr(settings,
+    'STORYBASE_NOTIFICATION_RETRIES', 2)
+"""
+Number of times to retry sending a story notification email that fails
+
+Default is 2
+
+"""
+
+STORYBASE_NOTIFICATION_RETRY_BACKOFF = getattr(settings,
+    'STORYBASE_NOTIFICATION_RETRY_BACKOFF', 1)
+"""
+Number of seconds to wait before retrying a failed story notification
+email.  The wait is doubled after each retry.
+
+Default is 1
+
+"""
+
+STORYBASE_NOTIFICATION_MAX_ATTEMPTS = getattr(settings,
+    'STORYBASE_NOTIFICATION_MAX_ATTEMPTS', 3)
+"""
+Number of times a story notification email can fail to send before it is
+no longer tried.  Each call to ``StoryNotificationManager.send_emails``,
+including its retries, counts as one attempt.
+
+Default is 3
+
+"""
+
+STORYBASE_SYSTEM_MESSAGE_BATCH_SIZE = getattr(settings,
+    'STORYBASE_SYSTEM_MESSAGE_BATCH_SIZE', 1000)
+"""
+Number of users to queue system message notifications for at a time
+
+Default is 1000
+
+"""
@@ -1,17 +1,24 @@
 """Tests for the actions app"""
 
 from datetime import datetime, timedelta
+import pickle
 
 from django.conf import settings
 from django.contrib.auth.models import Group, User
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
 from django.template.loader import TemplateDoesNotExist
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.utils.translation import activate, get_language
 
 from storybase.tests.base import SloppyComparisonTestMixin
 from storybase_user.models import ADMIN_GROUP_NAME
-from storybase_messaging.managers import StoryNotificationQuerySet
-from storybase_messaging.models import SiteContactMessage, StoryNotification
+import storybase_messaging.settings as messaging_settings
+from storybase_messaging.managers import (EmailMessageList,
+    StoryNotificationQuerySet)
+from storybase_messaging.models import (SiteContactMessage, StoryNotification,
+    StoryNotificationFailure, SystemMessage, SystemMessageProgress)
 from storybase_story.models import create_story
 
 class EmailSendingTestCaseMixin(object):
@@ -36,6 +43,113 @@ class EmailSendingTestCaseMixin(object):
         self.fail('"%s" not found in sent email subjects' % (s))
 
 
+class FlakyEmailBackend(EmailBackend):
+    """
+    In-memory e-mail backend that fails to send some messages
+
+    Messages to "flaky@" addresses fail on the first attempt and messages
+    to "bounce@" addresses always fail.
+
+    """
+    attempts = {}
+
+    def send_messages(self, messages):
+        for message in messages:
+            recipient = message.to[0]
+            attempts = FlakyEmailBackend.attempts.get(recipient, 0) + 1
+            FlakyEmailBackend.attempts[recipient] = attempts
+            if recipient.startswith('bounce@'):
+                raise Exception("Mailbox unavailable")
+            if recipient.startswith('flaky@') and attempts == 1:
+                raise Exception("Connection unexpectedly closed")
+        return super(FlakyEmailBackend, self).send_messages(messages)
+
+
+class UnreachableEmailBackend(EmailBackend):
+    """
+    In-memory e-mail backend whose connections fail to open
+
+    The first ``failures`` attempts to open a connection fail.
+
+    """
+    failures = 0
+    opened = 0
+
+    def open(self):
+        UnreachableEmailBackend.opened += 1
+        if UnreachableEmailBackend.opened <= UnreachableEmailBackend.failures:
+            raise Exception("Connection refused")
+        return super(UnreachableEmailBackend, self).open()
+
+
+class EmailMessageListTest(EmailSendingTestCaseMixin, TestCase):
+    def setUp(self):
+        FlakyEmailBackend.attempts = {}
+        UnreachableEmailBackend.opened = 0
+
+    def create_emails(self, recipients):
+        return EmailMessageList([EmailMessage("Test", "Test body",
+                                              "test@floodlightproject.org",
+                                              [recipient])
+                                 for recipient in recipients])
+
+    def test_send_parallel(self):
+        self.check_backend()
+        emails = self.create_emails(["test%d@example.com" % i
+                                     for i in range(10)])
+        (sent, unsent) = emails.send(connections=3)
+        self.assertEqual(len(sent), 10)
+        self.assertEqual(len(unsent), 0)
+        self.assertEqual(len(self.get_sent_emails()), 10)
+        # Messages are returned in their original order
+        self.assertEqual(sent, list(emails))
+
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.FlakyEmailBackend')
+    def test_send_retry(self):
+        emails = self.create_emails(["test@example.com", "flaky@example.com",
+                                     "bounce@example.com"])
+        (sent, unsent) = emails.send(connections=2, retries=2, backoff=0)
+        self.assertEqual([email.to[0] for email in sent],
+                         ["test@example.com", "flaky@example.com"])
+        self.assertEqual([email.to[0] for email in unsent],
+                         ["bounce@example.com"])
+        self.assertEqual(FlakyEmailBackend.attempts["flaky@example.com"], 2)
+        self.assertEqual(FlakyEmailBackend.attempts["bounce@example.com"], 3)
+
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.UnreachableEmailBackend')
+    def test_send_open_failed(self):
+        """
+        Test that failing to open a connection counts as a failed attempt
+        rather than aborting the whole batch
+        """
+        UnreachableEmailBackend.failures = 100
+        emails = self.create_emails(["test1@example.com",
+                                     "test2@example.com"])
+        (sent, unsent) = emails.send(connections=2, retries=1, backoff=0)
+        self.assertEqual(sent, [])
+        self.assertEqual(unsent, list(emails))
+
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.UnreachableEmailBackend')
+    def test_send_open_retry(self):
+        """
+        Test that messages are sent when the connection opens on a retry
+        """
+        UnreachableEmailBackend.failures = 1
+        emails = self.create_emails(["test1@example.com",
+                                     "test2@example.com"])
+        (sent, unsent) = emails.send(retries=1, backoff=0)
+        self.assertEqual(sent, list(emails))
+        self.assertEqual(unsent, [])
+        self.assertEqual(UnreachableEmailBackend.opened, 2)
+
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.FlakyEmailBackend')
+    def test_send_no_retry(self):
+        emails = self.create_emails(["flaky@example.com"])
+        (sent, unsent) = emails.send()
+        self.assertEqual(len(sent), 0)
+        self.assertEqual(len(unsent), 1)
+
+
 class SiteContactMessageModelTest(EmailSendingTestCaseMixin, TestCase):
     """Test methods of the SiteContactMessge model"""
     def test_email_sent_on_save(self):
@@ -70,6 +184,46 @@ class SiteContactMessageModelTest(EmailSendingTestCaseMixin, TestCase):
         self.assertIn(message_body, sent_email.body)
 
 
+class SystemMessageModelTest(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user("test%d" % i,
+                                               "test%d@example.com" % i,
+                                               "test")
+                      for i in range(5)]
+        inactive_user = self.users[3]
+        inactive_user.is_active = False
+        inactive_user.save()
+        self.message = SystemMessage.objects.create()
+
+    def get_queued_user_ids(self):
+        from notification.models import NoticeQueueBatch
+        user_ids = []
+        for batch in NoticeQueueBatch.objects.order_by('pk'):
+            notices = pickle.loads(str(batch.pickled_data).decode("base64"))
+            user_ids.append(sorted([notice[0] for notice in notices]))
+        return user_ids
+
+    def test_send_notifications(self):
+        self.message.send_notifications(batch_size=2)
+        expected = [[self.users[0].pk, self.users[1].pk],
+                    [self.users[2].pk, self.users[4].pk]]
+        self.assertEqual(self.get_queued_user_ids(), expected)
+        self.assertNotEqual(self.message.sent, None)
+        progress = SystemMessageProgress.objects.get(message=self.message)
+        self.assertEqual(progress.last_user_id, self.users[4].pk)
+        self.assertEqual(progress.queued, 4)
+
+    def test_send_notifications_resume(self):
+        # Simulate a send that was interrupted after the first chunk
+        SystemMessageProgress.objects.create(message=self.message,
+            last_user_id=self.users[1].pk, queued=2)
+        self.message.send_notifications(batch_size=2)
+        self.assertEqual(self.get_queued_user_ids(),
+                         [[self.users[2].pk, self.users[4].pk]])
+        progress = SystemMessageProgress.objects.get(message=self.message)
+        self.assertEqual(progress.queued, 4)
+
+
 class StoryNotificationModelTest(TestCase):
     def setUp(self):
         self.username = 'test'
@@ -250,6 +404,62 @@ class StoryNotificationManagerTest(EmailSendingTestCaseMixin, TestCase):
             story=story2, notification_type='published').sent,
             None)
 
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.FlakyEmailBackend')
+    def test_send_emails_failed(self):
+        FlakyEmailBackend.attempts = {}
+        bounce_user = User.objects.create_user('bounce', 'bounce@example.com',
+                                               'bounce')
+        story1 = create_story(title="Test Story 1", summary="Test Summary",
+                                  byline="Test Byline", status='draft',
+                                  author=self.user)
+        story2 = create_story(title="Test Story 2", summary="Test Summary",
+                                  byline="Test Byline", status='draft',
+                                  author=bounce_user)
+        story1.status = 'published'
+        story2.status = 'published'
+        story1.save()
+        story2.save()
+        (sent, unsent) = StoryNotification.objects.send_emails(batch_size=1,
+            connections=2, retries=1, backoff=0)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(len(unsent), 1)
+        self.assertNotEqual(StoryNotification.objects.get(
+            story=story1, notification_type='published').sent,
+            None)
+        # The notification that couldn't be sent should be left for the
+        # next run
+        notification = StoryNotification.objects.get(
+            story=story2, notification_type='published')
+        self.assertEqual(notification.sent, None)
+        self.assertEqual(notification.failure.attempts, 1)
+
+    @override_settings(EMAIL_BACKEND='storybase_messaging.tests.FlakyEmailBackend')
+    def test_send_emails_max_attempts(self):
+        """
+        Test that notifications stop being sent once they have failed
+        too many times
+        """
+        FlakyEmailBackend.attempts = {}
+        bounce_user = User.objects.create_user('bounce', 'bounce@example.com',
+                                               'bounce')
+        story = create_story(title="Test Story 1", summary="Test Summary",
+                             byline="Test Byline", status='draft',
+                             author=bounce_user)
+        story.status = 'published'
+        story.save()
+        notification = StoryNotification.objects.get(story=story,
+            notification_type='published')
+        StoryNotificationFailure.objects.create(notification=notification,
+            attempts=messaging_settings.STORYBASE_NOTIFICATION_MAX_ATTEMPTS - 1)
+        (sent, unsent) = StoryNotification.objects.send_emails(retries=0,
+                                                               backoff=0)
+        self.assertEqual(len(unsent), 1)
+        self.assertNotIn(notification,
+                         StoryNotification.objects.all().ready_to_send())
+        (sent, unsent) = StoryNotification.objects.send_emails(retries=0,
+                                                               backoff=0)
+        self.assertEqual((sent, unsent), ([], []))
+
 
 class StoryNotificationSignalsTest(SloppyComparisonTestMixin, TestCase):
     """
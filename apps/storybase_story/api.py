@@ -63,7 +63,7 @@ class StoryResource(TranslatedModelResource):
 
     class Meta:
         always_return_data = True
-        queryset = Story.objects.all()
+        queryset = Story.objects.with_translations().with_connected_counts()
         resource_name = 'stories'
         allowed_methods = ['get', 'post', 'patch', 'put']
         authentication = Authentication()
@@ -274,7 +274,7 @@ class StoryResource(TranslatedModelResource):
         if applicable_filters:
             object_list = object_list.filter(**applicable_filters)
 
-        return object_list.order_by('-published').load_all()
+        return object_list.order_by('-published')
 
     def explore_result_get_list(self, request=None, **kwargs):
         filters = {}
@@ -308,22 +308,54 @@ class StoryResource(TranslatedModelResource):
     def _add_boundaries(self, request, to_be_serialized):
         """
         Add boundaries field to data to be seriazlized
+
+        If the request has a ``zoom`` parameter, the simplified boundaries
+        suitable for that map zoom level are used instead of the
+        full-resolution ones.
         """
         boundaries = []
         specified_places = request.GET.get('places', None)
         if specified_places and to_be_serialized['places']:
             specified_place_ids = specified_places.split(",")
-            for place in to_be_serialized['places']:
-                if place['id'] in specified_place_ids:
-                    place = Place.objects.get(place_id=place['id'])
+            place_ids = [place['id'] for place in to_be_serialized['places']
+                         if place['id'] in specified_place_ids]
+            try:
+                zoom = int(request.GET['zoom'])
+            except (KeyError, ValueError):
+                zoom = None
+            field_name = Place.get_boundary_field_name(zoom)
+            # Places are ordered by name, the same order as the places
+            # facet
+            places = Place.objects.filter(place_id__in=place_ids)\
+                                  .only('name', field_name)\
+                                  .order_by('name')
+            for place in places:
+                boundary = getattr(place, field_name)
+                if boundary is None:
+                    # The simplified boundary hasn't been generated yet
                     boundary = place.boundary
-                    if boundary:
-                        coords = boundary.coords
-                        boundary = [coords[0][i]
-                                    for i in range(boundary.num_geom)]
-                        boundaries.append(boundary)
+                if boundary:
+                    coords = boundary.coords
+                    boundary = [coords[0][i]
+                                for i in range(boundary.num_geom)]
+                    boundaries.append(boundary)
         to_be_serialized['boundaries'] = boundaries
 
+    def explore_load_objects(self, results):
+        """
+        Load the ``Story`` instances for a page of search results
+
+        All the model instances are retrieved in a single query instead of
+        one query per result.  Results whose model instance no longer exists
+        in the database are dropped.
+
+        """
+        pks = [int(result.pk) for result in results]
+        objects = Story.objects.with_translations()\
+                              .with_connected_counts()\
+                              .select_related('author').in_bulk(pks)
+        return [objects[pk] for pk in pks if pk in objects]
+
     def explore_get_data_to_be_serialized(self, request=None, **kwargs):
         """
         Helper to build a filtered and paginated list of stories and
@@ -334,17 +366,14 @@ class StoryResource(TranslatedModelResource):
 
         """
         resource_uri = self.explore_get_resource_list_uri()
-        objects = []
         results = self.explore_result_get_list(request, **kwargs)
         request_data = {}
         if hasattr(request, 'GET'):
             request_data = request.GET
 
-        for result in results:
-            bundle = self.build_bundle(obj=result.object, request=request)
-            objects.append(bundle)
-
-        paginator = self._meta.paginator_class(request_data, objects,
+        # Paginate the ``SearchQuerySet`` directly so only the requested
+        # slice of results is fetched from the search backend.
+        paginator = self._meta.paginator_class(request_data, results,
                                                resource_uri=resource_uri,
                                                limit=self._meta.limit)
         to_be_serialized = paginator.page()
@@ -352,9 +381,9 @@ class StoryResource(TranslatedModelResource):
 
         # full_dehydrate is a very slow process, so it should only
         # run on things that will be displayed.
-
-        for obj in to_be_serialized['objects']:
-            objects.append(self.full_dehydrate(obj))
+        for obj in self.explore_load_objects(to_be_serialized['objects']):
+            bundle = self.build_bundle(obj=obj, request=request)
+            objects.append(self.full_dehydrate(bundle))
 
         to_be_serialized['objects'] = objects
 
@@ -506,7 +535,7 @@ class SectionResource(TranslatedModelResource):
 
     class Meta:
         always_return_data = True
-        queryset = Section.objects.all().order_by('weight')
+        queryset = Section.objects.with_translations().order_by('weight')
         resource_name = 'sections'
         list_allowed_methods = ['get', 'post']
         detail_allowed_methods = ['get', 'patch', 'put', 'delete']
@@ -746,7 +775,7 @@ class StoryTemplateResource(TranslatedModelResource):
     examples = fields.ListField(blank=True, null=True)
 
     class Meta:
-        queryset = StoryTemplate.objects.all()
+        queryset = StoryTemplate.objects.with_translations()
         resource_name = 'templates'
         allowed_methods = ['get']
         # Hide the underlying id
@@ -81,7 +81,7 @@ class Banner(object):
         count -- The number of items to show in the banner (default 10)
 
         """
-        return Story.objects.public()[:count]
+        return Story.objects.with_connected_counts().public()[:count]
 
     def encode_args(self):
         """
@@ -127,7 +127,8 @@ class RandomBanner(Banner):
         # Sort the objects randomly. Unfortunately, we can't use call 
         # the parent's get_objects because QuerySets can't be reordered
         # after being sliced.
-        return Story.objects.public().order_by('?')[:count]
+        return Story.objects.with_connected_counts().public()\
+                            .order_by('?')[:count]
 
 
 class TopicBanner(Banner):
@@ -175,7 +176,8 @@ class TopicBanner(Banner):
             return []
 
         # Return all the stories
-        return self.topic.stories.public().order_by('?')[:count]
+        return self.topic.stories.with_connected_counts().public()\
+                                 .order_by('?')[:count]
 
     def encode_args(self):
         return getattr(self, 'slug', "")
@@ -1,14 +1,22 @@
+from calendar import timegm
+import hashlib
 from mimetypes import guess_type
 
 from django.conf import settings
 from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
 from django.core.urlresolvers import reverse
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
+from django.utils.http import (http_date, parse_etags, parse_http_date_safe,
+    quote_etag)
 from django.utils.text import Truncator
-from django.utils.translation import ugettext as _
+from django.utils.translation import get_language, ugettext as _
 
+from storybase.utils import get_generation
 from storybase_asset.models import FEATURED_ASSET_THUMBNAIL_WIDTH, FEATURED_ASSET_THUMBNAIL_HEIGHT
-from storybase_story.models import Story
+from storybase_story.models import FEED_CACHE_GENERATION_KEY, Story
 from storybase_taxonomy.models import Category
 
 class StoriesFeed(Feed):
@@ -19,6 +27,14 @@ class StoriesFeed(Feed):
     ``topics=SLUG`` or ``topics-exclude=SLUG`` querystring parameter to
     the GET request.
 
+    Rendered feeds are cached for each combination of filters until a
+    story is published or unpublished.  Responses include ``ETag`` and
+    ``Last-Modified`` headers, and conditional requests for a cached feed
+    that hasn't changed get a 304 response without querying the database.
+    ``Last-Modified`` is the time the most recently edited story in the
+    feed was changed, so edits to published stories are seen by clients
+    that only send ``If-Modified-Since``.
+
     """
     title = "%s %s" % (settings.STORYBASE_SITE_NAME, _("Stories"))
     description = _("Recent stories from ") + settings.STORYBASE_SITE_NAME
@@ -31,6 +47,79 @@ class StoriesFeed(Feed):
     def link(self):
         return reverse('explore_stories')
 
+    def get_cache_key(self, request, *args, **kwargs):
+        """Get the cache key for a feed request's rendered feed"""
+        params = []
+        for param in sorted(self.QUERY_MAP.keys()):
+            for name in (param, '%s-exclude' % param):
+                params.append((name, request.GET.get(name, '')))
+        params.extend(sorted(kwargs.items()))
+        params_hash = hashlib.md5(repr(params)).hexdigest()
+        return "storybase_story.feed:%s:%s:%s:%s" % (
+            get_generation(FEED_CACHE_GENERATION_KEY),
+            self.__class__.__name__, get_language(), params_hash)
+
+    def not_modified(self, request, cached):
+        """
+        Has the cached feed changed since the version the client has?
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or cached['etag'] in etags
+
+        if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        last_modified = parse_http_date_safe(cached['last_modified'] or '')
+        return (if_modified_since is not None and
+                last_modified is not None and
+                last_modified <= if_modified_since)
+
+    def get_last_modified(self, feedgen):
+        """
+        Get the value of the ``Last-Modified`` header for a generated feed
+
+        Django sets the header from the items' publication dates, which
+        don't change when a published story is edited, so use the
+        stories' ``last_edited`` dates instead.
+
+        """
+        dates = [item['last_edited'] for item in feedgen.items
+                 if item.get('last_edited') is not None]
+        if dates:
+            latest = max(dates)
+        else:
+            latest = feedgen.latest_post_date()
+        return http_date(timegm(latest.utctimetuple()))
+
+    def __call__(self, request, *args, **kwargs):
+        key = self.get_cache_key(request, *args, **kwargs)
+        cached = cache.get(key)
+        if cached is None:
+            try:
+                obj = self.get_object(request, *args, **kwargs)
+            except ObjectDoesNotExist:
+                raise Http404('Feed object does not exist.')
+            feedgen = self.get_feed(obj, request)
+            content = feedgen.writeString('utf-8')
+            cached = {
+                'content': content,
+                'content_type': feedgen.mime_type,
+                'last_modified': self.get_last_modified(feedgen),
+                'etag': hashlib.md5(content).hexdigest(),
+            }
+            cache.set(key, cached)
+
+        if self.not_modified(request, cached):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(cached['content'],
+                                    content_type=cached['content_type'])
+        response['ETag'] = quote_etag(cached['etag'])
+        if cached['last_modified']:
+            response['Last-Modified'] = cached['last_modified']
+        return response
+
     def get_object(self, request, *args, **kwargs):
         # HACK: Dummy get_object implementation that doesn't actually get an
         # object, but has the side effect of storying the request object as
@@ -59,13 +148,16 @@ class StoriesFeed(Feed):
 
     def items(self):
         # Only show non-connected, published stories in the feed
-        queryset = Story.objects.exclude(source__relation_type='connected').published()
+        queryset = Story.objects.with_translations()\
+                           .exclude(source__relation_type='connected')\
+                           .published()
         filter_kwargs, exclude_kwargs = self.get_filter_kwargs()
         if filter_kwargs:
             queryset = queryset.filter(**filter_kwargs)
         if exclude_kwargs:
             queryset = queryset.exclude(**exclude_kwargs)
-        return queryset.order_by('-published')[:25]
+        return queryset.prefetch_related('projects', 'organizations', 'tags',
+                                         'topics').order_by('-published')[:25]
 
     def item_title(self, item):
         return item.title
@@ -83,6 +175,11 @@ class StoriesFeed(Feed):
     def item_updateddate(self, item):
         return item.last_edited
 
+    def item_extra_kwargs(self, item):
+        # Keep the edit date with the generated item so it can be used
+        # for the ``Last-Modified`` header
+        return {'last_edited': item.last_edited}
+
     def item_categories(self, item):
         category_objs = list(item.projects.all()) + list(item.organizations.all()) + list(item.tags.all()) + list(item.topics.all())
         return [obj.name for obj in category_objs]
@@ -95,13 +192,16 @@ class StoriesFeed(Feed):
 
     def item_enclosure_length(self, item):
        asset = item.get_featured_asset()
-       thumbnail_options = {
-            'size': (FEATURED_ASSET_THUMBNAIL_WIDTH,FEATURED_ASSET_THUMBNAIL_HEIGHT),
-       }
        try:
-           return asset.get_thumbnail(thumbnail_options).size
+           # Use the size of the pre-generated thumbnail rather than
+           # generating the thumbnail
+           derivative = asset.get_thumbnail_derivative(
+               FEATURED_ASSET_THUMBNAIL_WIDTH, FEATURED_ASSET_THUMBNAIL_HEIGHT)
        except AttributeError:
            return 0
+       if derivative is None:
+           return 0
+       return derivative.size
 
     def item_enclosure_mime_type(self, item):
         url = item.featured_asset_thumbnail_url()
@@ -131,4 +231,7 @@ class TopicStoriesFeed(StoriesFeed):
         return "%s?topics=%s" % (reverse('explore_stories'), obj.pk)
 
     def items(self, obj):
-        return Story.objects.exclude(source__relation_type='connected').published().filter(topics=obj).order_by('-published')[:25]
+        return Story.objects.with_translations()\
+                           .exclude(source__relation_type='connected')\
+                           .published().filter(topics=obj)\
+                           .order_by('-published')[:25]
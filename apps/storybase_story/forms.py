@@ -106,11 +106,11 @@ class StoryTranslationAdminForm(forms.ModelForm):
 class StorySearchForm(SearchForm):
     """
     A custom search that allows user to optionally search based on a
-    single topic and/or place ID.
+    single topic ID and/or place ``place_id``.
 
     """
     topic_id = forms.IntegerField(required=False)
-    place_id = forms.IntegerField(required=False)
+    place_id = forms.CharField(required=False)
 
     def search(self):
         sqs = super(StorySearchForm, self).search()
@@ -122,7 +122,7 @@ class StorySearchForm(SearchForm):
 
         place_id = self.cleaned_data.get('place_id', None)
 
-        if place_id is not None:
+        if place_id:
             sqs = sqs.filter(place_ids__in=[place_id])
 
         return sqs
@@ -1,4 +1,5 @@
 import csv
+from optparse import make_option
 
 from django.core.management.base import BaseCommand, CommandError
 
@@ -10,6 +11,21 @@ class Command(BaseCommand):
             "This is mostly useful for testing\n"
             "Arguments:\n"
             "  csv_file\t\tA CSV file containing mappings between places\n")
+    option_list = BaseCommand.option_list + (
+            make_option('--batch-size',
+                action='store',
+                type='int',
+                dest='batch_size',
+                default=500,
+                help="Number of stories to create at a time"),
+            make_option('--no-index',
+                action='store_false',
+                dest='update_index',
+                default=True,
+                help=("Don't update the search index for the new stories. "
+                      "Use this if you're going to rebuild the index "
+                      "afterwards anyway.")),
+            )
     
     def handle(self, *args, **options):
         try:
@@ -18,6 +34,10 @@ class Command(BaseCommand):
             raise CommandError("You must provide a CSV file argument")
 
         reader = csv.DictReader(csv_file)
-        bulk_create(reader)
+        pks = bulk_create(reader, batch_size=options.get('batch_size'),
+                          update_index=options.get('update_index'))
 
         csv_file.close()
+
+        if int(options.get('verbosity')) > 1:
+            self.stdout.write("%d stories loaded\n" % (len(pks)))
@@ -1,17 +1,21 @@
 from django.db import models
-from storybase.managers import (FeaturedQuerySet, FeaturedManager)
+from django.db.models import Count
+from django.db.models.sql.constants import GET_ITERATOR_CHUNK_SIZE
+
+from storybase.managers import (FeaturedQuerySet, FeaturedManager,
+    TranslatedManager)
 
 class ContainerManager(models.Manager):
     def get_by_natural_key(self, name):
         return self.get(name=name)
 
 
-class SectionLayoutManager(models.Manager):
+class SectionLayoutManager(TranslatedManager):
     def get_by_natural_key(self, layout_id):
         return self.get(layout_id=layout_id)
 
 
-class SectionManager(models.Manager):
+class SectionManager(TranslatedManager):
     """
     Custom manager that defines a natural key to make it easier to generate
     custom fixtures.
@@ -28,6 +32,60 @@ class StoryQuerySet(FeaturedQuerySet):
     Based on ideas at http://dabapps.com/blog/higher-level-query-api-django-orm/
 
     """
+    _prefetch_connected_counts = False
+
+    def with_connected_counts(self):
+        """
+        Return a QuerySet that retrieves the number of published connected
+        stories of its items in bulk
+
+        The counts are fetched with one aggregate query for each chunk of
+        rows instead of one query for each call to
+        ``Story.connected_count()``.
+
+        """
+        return self._clone(_prefetch_connected_counts=True)
+
+    def _clone(self, *args, **kwargs):
+        kwargs.setdefault('_prefetch_connected_counts',
+                          self._prefetch_connected_counts)
+        return super(StoryQuerySet, self)._clone(*args, **kwargs)
+
+    def _set_connected_counts(self, stories):
+        """Set the cached connected story count on a list of stories"""
+        seed_ids = [story.pk for story in stories if story.allow_connected]
+        counts = {}
+        if seed_ids:
+            StoryRelation = self.model.related_stories.through
+            counts = dict(StoryRelation.objects.filter(
+                    source__in=seed_ids, relation_type='connected',
+                    target__status='published')\
+                .values_list('source')\
+                .annotate(count=Count('target')))
+
+        for story in stories:
+            story._connected_count = counts.get(story.pk, 0)
+
+    def iterator(self):
+        iterator = super(StoryQuerySet, self).iterator()
+        if not self._prefetch_connected_counts:
+            for obj in iterator:
+                yield obj
+            return
+
+        chunk = []
+        for obj in iterator:
+            chunk.append(obj)
+            if len(chunk) == GET_ITERATOR_CHUNK_SIZE:
+                self._set_connected_counts(chunk)
+                for chunk_obj in chunk:
+                    yield chunk_obj
+                chunk = []
+
+        self._set_connected_counts(chunk)
+        for chunk_obj in chunk:
+            yield chunk_obj
+
     def connected(self):
         """Return stories that are connected stories"""
         return self.filter(source__relation_type='connected')
@@ -83,7 +141,10 @@ class StoryManager(FeaturedManager):
     def public(self):
         return self.get_query_set().public()
 
+    def with_connected_counts(self):
+        return self.get_query_set().with_connected_counts()
+
 
-class StoryTemplateManager(models.Manager):
+class StoryTemplateManager(TranslatedManager):
     def get_by_natural_key(self, template_id):
         return self.get(template_id=template_id)
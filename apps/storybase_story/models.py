@@ -9,7 +9,8 @@ from django.core import urlresolvers
 from django.core.cache import cache
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import post_save, pre_save, m2m_changed
+from django.db.models.signals import (post_delete, post_save, pre_save,
+    m2m_changed)
 from django.template.loader import render_to_string
 from django.utils import simplejson
 from django.utils.safestring import mark_safe
@@ -24,9 +25,13 @@ from storybase.fields import ShortTextField
 from storybase.models import (TzDirtyFieldsMixin, LicensedModel, PermissionMixin,
     PublishedModel, TimestampedModel, TranslatedModel, TranslationModel,
     WeightedModel)
-from storybase.utils import key_from_instance, unique_slugify
+from storybase.utils import (incr_generation, invalidate_instance_cache,
+    key_from_instance, unique_slugify)
 from storybase_asset.models import (Asset, DataSet, ASSET_TYPES,
-    FeaturedAssetsMixin, invalidate_featured_asset_url_cache)
+    ExternalAsset, ExternalAssetTranslation, FeaturedAssetsMixin,
+    HtmlAsset, HtmlAssetTranslation, LocalImageAsset,
+    LocalImageAssetTranslation, invalidate_featured_asset_url_cache)
+from storybase_geo.models import Place, PlaceRelation
 from storybase_help.models import Help
 from storybase_user.models import Organization, Project
 from storybase_user.utils import format_user_name
@@ -51,7 +56,7 @@ class StoryPermission(PermissionMixin):
         if self.status == 'published':
             return True
 
-        if self.author == user:
+        if self.author_id == user.pk:
             return True
 
         if user.is_superuser or is_admin(user):
@@ -65,7 +70,7 @@ class StoryPermission(PermissionMixin):
         if not user.is_active:
             return False
 
-        if self.author == user:
+        if self.author_id == user.pk:
             return True
 
         if is_admin(user):
@@ -82,6 +87,35 @@ class StoryPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(author=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
+    @classmethod
+    def anonymoususer_can_view_q(cls, user):
+        return Q(status='published')
+
+    @classmethod
+    def user_can_view_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if user.is_superuser or is_admin(user):
+            return Q()
+
+        return Q(status='published') | Q(author=user)
+
 
 class StoryTranslation(TranslationModel):
     """Encapsulates translated fields of a Story"""
@@ -171,6 +205,8 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
     translated_fields = ['title', 'summary', 'call_to_action',
                          'connected_prompt']
     translation_set = 'storytranslation_set'
+    # Fields whose changes are checked by signal handlers
+    dirty_fields = ('status', 'license')
     translation_class = StoryTranslation
 
     _structure_obj = None
@@ -281,6 +317,26 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
         output.append('</ul>')
         return mark_safe(u'\n'.join(output))
 
+    def render_sections_html(self):
+        """
+        Render the HTML for all of the story's sections, as shown in the
+        story viewer
+
+        The rendered HTML is cached until the story is next edited.
+
+        """
+        key = self.fragment_key('sections')
+        output = cache.get(key, None) if key else None
+        if output is None:
+            sections = self.structure.sections_flat
+            prefetch_section_assets(sections)
+            output = render_to_string('storybase_story/story_sections.html',
+                {'sections': sections})
+            if key:
+                cache.set(key, output)
+
+        return mark_safe(output)
+
     def get_explore_url(self, filters=None):
         """
         Get a URL pointing to the explore view with specific filters set
@@ -313,6 +369,25 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
         extra = field + ':' + language if language else field
         return key_from_instance(self, extra)
 
+    def fragment_key(self, name, language=None):
+        """
+        Get a cache key for a rendered fragment of the story
+
+        The key includes the time the story was last edited, so a cached
+        fragment is no longer used once the story, one of its sections
+        or one of its assets changes.
+
+        Returns None if the story hasn't been saved.
+
+        """
+        if self.pk is None or self.last_edited is None:
+            return None
+
+        if language is None:
+            language = get_language()
+        version = self.last_edited.strftime('%Y%m%d%H%M%S%f')
+        return self.related_key("fragment:%s:%s" % (name, version), language)
+
     def get_related_list(self, field, id_field, name_field):
         """
         Get a list of id, name hashes for a ManyToMany field of this story
@@ -366,6 +441,110 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
             inherited_places.update(place.ancestors_set())
         return inherited_places
 
+    def _get_inherited_place_ids(self):
+        """
+        Get the ``place_id`` values of the places related to this story,
+        including their ancestors
+
+        Rather than walking up the place hierarchy one place at a time,
+        this retrieves the parents of all places at one level of the
+        hierarchy in a single query.
+
+        """
+        place_pks = set(self.places.values_list('pk', flat=True))
+        frontier = place_pks
+        while frontier:
+            parent_pks = set(PlaceRelation.objects.filter(child__in=frontier)
+                                                  .values_list('parent', flat=True))
+            frontier = parent_pks - place_pks
+            place_pks.update(frontier)
+
+        if not place_pks:
+            return []
+
+        return list(Place.objects.filter(pk__in=place_pks)
+                                 .values_list('place_id', flat=True))
+
+    def _get_points(self):
+        """
+        Calculate points (latitude, longitude pairs) related to the story
+        """
+        points = [(lat, lng) for (lat, lng)
+                  in self.locations.values_list('lat', 'lng')]
+        if points:
+            return points
+
+        # We need to track the geolevel of the first place we've found
+        # with a boundary so we can try to add points for all other
+        # places at that geolevel
+        point_geolevel = None
+        # Loop through related places looking at smaller geographies 
+        # first
+        for place in self.places.exclude(boundary=None)\
+                                .defer('boundary', 'boundary_low',
+                                       'boundary_medium')\
+                                .order_by('-geolevel__level'):
+            # Place has a geometry associated with it.  Use the
+            # precomputed centroid if it's been set.
+            centroid = place.centroid
+            if centroid is None:
+                centroid = place.boundary.centroid
+            if not point_geolevel:
+                points.append((centroid.y, centroid.x))
+                point_geolevel = place.geolevel_id
+            elif place.geolevel_id == point_geolevel:
+                points.append((centroid.y, centroid.x))
+            else:
+                # We've exhausted all the points at the 
+                # lowest geolevel.  Quit.
+                break
+
+        # TODO: Decide if we should check non-explicit places
+        return points
+
+    def get_geo_summary(self):
+        """
+        Get a summary of the geographic information related to the story
+
+        Returns a dictionary with the following keys:
+        points -- list of (latitude, longitude) pairs of related locations
+                  or the centroids of related places
+        num_points -- the number of points
+        place_ids -- ``place_id`` values of related places and their
+                     ancestors
+
+        The summary is cached, both on the model instance and in the
+        cache backend, so it is only calculated once, even when the
+        story is being indexed.  The cached value is invalidated when
+        the story's locations or places change.
+
+        """
+        summary = getattr(self, '_geo_summary', None)
+        if summary is not None:
+            return summary
+
+        key = self.related_key('geo_summary')
+        summary = cache.get(key, None)
+        if summary is None:
+            points = self._get_points()
+            summary = {
+                'points': points,
+                'num_points': len(points),
+                'place_ids': self._get_inherited_place_ids(),
+            }
+            cache.set(key, summary)
+
+        self._geo_summary = summary
+        return summary
+
+    @property
+    def inherited_place_ids(self):
+        """
+        Get the ``place_id`` values of the places related to this story,
+        including parents
+        """
+        return self.get_geo_summary()['place_ids']
+
     @property
     def points(self):
         """
@@ -375,41 +554,12 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
         otherwise try to find centroids of related places.
 
         """
-        key = self.related_key('points')
-        points = cache.get(key, None)
-
-        if points is not None:
-            return points
+        return self.get_geo_summary()['points']
 
-        points = []
-        if self.locations.count():
-            points = [(loc.lat, loc.lng) for loc in self.locations.all()]
-        elif self.places.count():
-            # We need to track the geolevel of the first place we've found
-            # with a boundary so we can try to add points for all other
-            # places at that geolevel
-            point_geolevel = None
-            # Loop through related places looking at smaller geographies 
-            # first
-            for place in self.places.all().order_by('-geolevel__level'):
-                if place.boundary:
-                    # Place has a geometry associated with it
-                    centroid = place.boundary.centroid
-                    if not point_geolevel:
-                        points.append((centroid.y, centroid.x))
-                        point_geolevel = place.geolevel
-                    else:
-                        if place.geolevel == point_geolevel:
-                            points.append((centroid.y, centroid.x))
-                        else:
-                            # We've exhausted all the points at the 
-                            # lowest geolevel.  Quit.
-                            break
-
-            # TODO: Decide if we should check non-explicit places
-       
-        cache.set(key, points)
-        return points
+    @property
+    def num_points(self):
+        """Get the number of points related to the story"""
+        return self.get_geo_summary()['num_points']
 
     def natural_key(self):
         return (self.story_id,)
@@ -466,6 +616,12 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
             # and save a call to the DB
             return 0
 
+        # The count may have already been retrieved in bulk by
+        # ``StoryQuerySet.with_connected_counts()``
+        connected_count = getattr(self, '_connected_count', None)
+        if connected_count is not None:
+            return connected_count
+
         return self.related_stories.connected().published().count()
 
     def builder_url(self):
@@ -598,7 +754,7 @@ class Story(WeightedModel, FeaturedAssetsMixin, TzDirtyFieldsMixin,
         if not self.allow_connected:
             return context
 
-        context['connected_count'] = self.connected_stories().count()
+        context['connected_count'] = self.connected_count()
 
         return context
 
@@ -734,30 +890,35 @@ def invalidate_related_cache(sender, instance, field_name, language_key=True,
     Helper function for invalidating cached version of a Story's ManyToMany
     field.
 
+    This invalidates all of the story's cached values, in every language,
+    by incrementing its cache generation.
+
     """
     action = kwargs.get('action')
     reverse = kwargs.get('reverse')
     if action in ("post_add", "post_remove", "post_clear") and not reverse:
-        if not language_key:
-            cache.delete(instance.related_key(field_name))
-        else:
-            languages = getattr(settings, 'LANGUAGES', None)
-            if languages: 
-                keys = []
-                for (code, name) in settings.LANGUAGES:
-                    keys.append(instance.related_key(field_name, code))
-                cache.delete_many(keys)
+        invalidate_instance_cache(instance)
+
+
+def invalidate_geo_summary_cache(sender, instance, **kwargs):
+    """Invalidate the cached version of a Story's geographic summary"""
+    action = kwargs.get('action')
+    reverse = kwargs.get('reverse')
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        invalidate_instance_cache(instance)
+        instance._geo_summary = None
 
 
 def invalidate_places_cache(sender, instance, **kwargs): 
     """Invalidate the cached version of a Story's ``places`` field"""
-    invalidate_related_cache(sender, instance, 'places', **kwargs)
+    # This also invalidates the cached places list, since both share the
+    # story's cache generation
+    invalidate_geo_summary_cache(sender, instance, **kwargs)
 
 
 def invalidate_points_cache(sender, instance, **kwargs): 
     """Invalidate the cached version of a Story's ``locations`` field"""
-    invalidate_related_cache(sender, instance, 'points', language_key=False,
-                             **kwargs)
+    invalidate_geo_summary_cache(sender, instance, **kwargs)
 
 
 def invalidate_topics_cache(sender, instance, **kwargs): 
@@ -802,6 +963,69 @@ def clean_storytranslation_html(sender, instance, **kwargs):
             settings.STORYBASE_ALLOWED_TAGS)
 
 
+FEED_CACHE_GENERATION_KEY = 'storybase_story.feeds:generation'
+"""Cache key of the generation counter for cached story feeds"""
+
+
+def invalidate_feed_cache():
+    """Invalidate all cached story feeds"""
+    incr_generation(FEED_CACHE_GENERATION_KEY)
+
+
+def set_feed_changed(sender, instance, **kwargs):
+    """
+    Flag stories whose changes will show up in the story feeds
+
+    This is checked in ``post_save`` because the dirty fields are reset
+    after the story is saved.
+
+    """
+    instance._feed_changed = (instance.status == 'published' or
+                              'status' in instance.get_dirty_fields())
+
+
+def invalidate_story_feed_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached feeds when a story is published, unpublished
+    or a published story changes
+    """
+    if getattr(instance, '_feed_changed', instance.status == 'published'):
+        invalidate_feed_cache()
+
+
+def invalidate_deleted_story_feed_cache(sender, instance, **kwargs):
+    """Invalidate the cached feeds when a published story is deleted"""
+    if instance.status == 'published':
+        invalidate_feed_cache()
+
+
+def invalidate_storytranslation_feed_cache(sender, instance, **kwargs):
+    """Invalidate the cached feeds when a published story's text changes"""
+    try:
+        if instance.story.status == 'published':
+            invalidate_feed_cache()
+    except Story.DoesNotExist:
+        # The story is being deleted
+        pass
+
+
+def invalidate_related_feed_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached feeds when a published story's topics, projects,
+    organizations or tags change
+    """
+    action = kwargs.get('action')
+    reverse = kwargs.get('reverse')
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        invalidate_feed_cache()
+    elif isinstance(instance, Story) and instance.status == 'published':
+        # Tags share their through model with other models, so make sure
+        # the changed object is a story
+        invalidate_feed_cache()
+
+
 # Hook up some signal handlers
 pre_save.connect(set_story_slug_on_publish, sender=Story)
 pre_save.connect(set_date_and_weight_on_published, sender=Story)
@@ -819,6 +1043,19 @@ m2m_changed.connect(invalidate_topics_cache, sender=Story.topics.through)
 m2m_changed.connect(invalidate_projects_cache, sender=Story.projects.through)
 m2m_changed.connect(invalidate_organizations_cache, sender=Story.organizations.through)
 m2m_changed.connect(invalidate_featured_asset_url_cache, sender=Story.featured_assets.through)
+pre_save.connect(set_feed_changed, sender=Story)
+post_save.connect(invalidate_story_feed_cache, sender=Story)
+post_delete.connect(invalidate_deleted_story_feed_cache, sender=Story)
+post_save.connect(invalidate_storytranslation_feed_cache,
+                  sender=StoryTranslation)
+m2m_changed.connect(invalidate_related_feed_cache,
+                    sender=Story.topics.through)
+m2m_changed.connect(invalidate_related_feed_cache,
+                    sender=Story.projects.through)
+m2m_changed.connect(invalidate_related_feed_cache,
+                    sender=Story.organizations.through)
+m2m_changed.connect(invalidate_related_feed_cache,
+                    sender=Story.tags.through)
 
 
 class StoryRelationPermission(PermissionMixin):
@@ -831,7 +1068,8 @@ class StoryRelationPermission(PermissionMixin):
 
         # TODO: Add additional logic as different relation types
         # are defined
-        if self.relation_type == 'connected' and self.target.author == user:
+        if (self.relation_type == 'connected' and
+                self.target.author_id == user.pk):
             # Users should be able to define the parent of connected
             # stories for stories that they own
             return True
@@ -847,6 +1085,22 @@ class StoryRelationPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(relation_type='connected', target__author=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class StoryRelation(StoryRelationPermission, models.Model):
     """Relationship between two stories"""
@@ -870,7 +1124,7 @@ class SectionPermission(PermissionMixin):
         if not user.is_active:
             return False
 
-        if self.story.author == user:
+        if self.story.author_id == user.pk:
             return True
 
         if is_admin(user):
@@ -884,6 +1138,22 @@ class SectionPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(story__author=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class SectionTranslation(TranslationModel):
     """Translated fields of a Section"""
@@ -988,18 +1258,53 @@ class Section(node_factory('SectionRelation'), TranslatedModel,
         if previous_section:
             simple.update(
                 {'previous_section_id': previous_section.section_id})
-        for child_relation in self.child_relations():
-            simple['children'].append(child_relation.child.section_id)
+        for child in self.story.structure.get_children(self):
+            simple['children'].append(child.section_id)
         
         return simple
 
     def render_html(self, show_title=True):
-        """Render a HTML representation of the section structure"""
+        """
+        Render a HTML representation of the section structure
+
+        The rendered HTML is cached until the section's story is next
+        edited.
+
+        """
+        key = self.story.fragment_key("section:%s:%d" % (self.section_id,
+                                                         show_title))
+        output = cache.get(key, None) if key else None
+        if output is None:
+            output = self._render_html(show_title)
+            if key:
+                cache.set(key, output)
+
+        return mark_safe(output)
+
+    def get_section_assets(self):
+        """
+        Get the section's ``SectionAsset`` instances, ordered by weight
+
+        The ``asset`` attribute of each ``SectionAsset`` is an instance of
+        the asset's concrete subclass.  If the section assets were loaded
+        by ``prefetch_section_assets``, no queries are made.
+        """
+        if not hasattr(self, '_section_assets'):
+            prefetch_section_assets([self])
+        return self._section_assets
+
+    def _render_html(self, show_title=True):
         default_template = "storybase_story/sectionlayouts/weighted.html"
-        assets = self.sectionasset_set.order_by('weight')
+        assets = self.get_section_assets()
+        container_assets = {}
+        for section_asset in assets:
+            if section_asset.container is not None:
+                container_assets.setdefault(section_asset.container.name,
+                                            []).append(section_asset)
         output = []
         context = {
             'assets': assets,
+            'container_assets': container_assets,
             'section': self
         }
         if show_title:
@@ -1010,7 +1315,7 @@ class Section(node_factory('SectionRelation'), TranslatedModel,
             if self.layout is not None else default_template)
         
         output.append(render_to_string(template_filename, context))
-        return mark_safe(u'\n'.join(output))
+        return u'\n'.join(output)
 
     def change_link(self):
         """Generate a link to the Django admin change page
@@ -1049,6 +1354,39 @@ class Section(node_factory('SectionRelation'), TranslatedModel,
         return True
 
 
+def prefetch_section_assets(sections):
+    """
+    Load the ``SectionAsset`` instances and assets for a list of sections
+
+    The section assets of all the sections are retrieved in one query
+    and their assets, as instances of their concrete subclasses with
+    their translations, in another, instead of querying for each
+    container of each section.  The results are stored on the sections
+    for ``Section.get_section_assets``.
+    """
+    sections = [section for section in sections
+                if not hasattr(section, '_section_assets')]
+    if not sections:
+        return
+
+    sections_by_pk = dict([(section.pk, section) for section in sections])
+    section_assets = list(SectionAsset.objects.filter(
+        section__in=sections_by_pk.keys()).select_related('container')\
+                                         .order_by('weight', 'pk'))
+    assets = Asset.objects.select_subclasses().with_translations()\
+                  .filter(pk__in=[section_asset.asset_id
+                                  for section_asset in section_assets])
+    assets_by_pk = dict([(asset.pk, asset) for asset in assets])
+
+    for section in sections:
+        section._section_assets = []
+    for section_asset in section_assets:
+        section_asset.asset = assets_by_pk[section_asset.asset_id]
+        section = sections_by_pk[section_asset.section_id]
+        section_asset.section = section
+        section._section_assets.append(section_asset)
+
+
 class SectionRelation(edge_factory(Section, concrete=False)):
     """Through class for parent/child relationships between sections"""
     weight = models.IntegerField(default=0)
@@ -1065,7 +1403,7 @@ class SectionAssetPermission(PermissionMixin):
         if not user.is_active:
             return False
 
-        if self.section.story.author == user:
+        if self.section.story.author_id == user.pk:
             return True
 
         if is_admin(user):
@@ -1079,6 +1417,22 @@ class SectionAssetPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if not user.is_active:
+            return Q(pk__in=[])
+
+        if is_admin(user):
+            return Q()
+
+        return Q(section__story__author=user)
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class SectionAsset(models.Model, SectionAssetPermission):
     """Through class for Asset to Section relations"""
@@ -1125,6 +1479,119 @@ def update_story_last_edited(sender, instance, **kwargs):
 # Update a section's story's last edited field when the section is saved
 post_save.connect(update_story_last_edited, sender=Section)
 
+
+def update_asset_stories_last_edited(sender, instance, **kwargs):
+    """
+    Update the last edited field of the stories that include an asset
+
+    This expires the cached, rendered versions of the stories.  The
+    field is updated directly in the database, so the stories' signal
+    handlers aren't run.
+
+    Should be connected to the post_save signal of Asset subclasses.
+    """
+    Story.objects.filter(assets__pk=instance.pk)\
+                 .update(last_edited=datetime.now())
+
+
+def update_asset_translation_stories_last_edited(sender, instance, **kwargs):
+    """
+    Update the last edited field of the stories that include a translated
+    asset
+
+    Should be connected to the post_save signal of the Asset subclasses'
+    translations.
+    """
+    # On the Asset subclasses, ``asset_id`` is the UUID field, but on the
+    # translations it's the foreign key's primary key value
+    Story.objects.filter(assets__pk=instance.asset_id)\
+                 .update(last_edited=datetime.now())
+
+
+def update_section_asset_story_last_edited(sender, instance, **kwargs):
+    """
+    Update the last edited field of a story when an asset is added to or
+    removed from one of its sections
+
+    Should be connected to SectionAsset's post_save and post_delete signals.
+    """
+    Story.objects.filter(sections__pk=instance.section_id)\
+                 .update(last_edited=datetime.now())
+
+post_save.connect(update_asset_stories_last_edited, sender=ExternalAsset)
+post_save.connect(update_asset_stories_last_edited, sender=HtmlAsset)
+post_save.connect(update_asset_stories_last_edited, sender=LocalImageAsset)
+post_save.connect(update_asset_translation_stories_last_edited,
+                  sender=ExternalAssetTranslation)
+post_save.connect(update_asset_translation_stories_last_edited,
+                  sender=HtmlAssetTranslation)
+post_save.connect(update_asset_translation_stories_last_edited,
+                  sender=LocalImageAssetTranslation)
+post_save.connect(update_section_asset_story_last_edited, sender=SectionAsset)
+post_delete.connect(update_section_asset_story_last_edited,
+                    sender=SectionAsset)
+
+
+def invalidate_structure_cache(story):
+    """Invalidate the cached sections of a Story's structure"""
+    invalidate_instance_cache(story)
+    story._structure_obj = None
+
+
+def invalidate_section_structure_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached structure of a section's story
+
+    Should be connected to Section's post_save and post_delete signals.
+    """
+    try:
+        invalidate_structure_cache(instance.story)
+    except Story.DoesNotExist:
+        # The story is being deleted
+        pass
+
+
+def invalidate_section_translation_structure_cache(sender, instance,
+                                                   **kwargs):
+    """
+    Invalidate the cached structure of a story when one of its section's
+    translations changes
+
+    Should be connected to SectionTranslation's post_save and post_delete
+    signals.
+    """
+    try:
+        invalidate_structure_cache(instance.section.story)
+    except (Section.DoesNotExist, Story.DoesNotExist):
+        # The section or story is being deleted
+        pass
+
+
+def invalidate_section_relation_structure_cache(sender, instance, **kwargs):
+    """
+    Invalidate the cached structure of a story when the relationships
+    between its sections change
+
+    Should be connected to SectionRelation's post_save and post_delete
+    signals.
+    """
+    try:
+        invalidate_structure_cache(instance.parent.story)
+    except (Section.DoesNotExist, Story.DoesNotExist):
+        # The section or story is being deleted
+        pass
+
+post_save.connect(invalidate_section_structure_cache, sender=Section)
+post_delete.connect(invalidate_section_structure_cache, sender=Section)
+post_save.connect(invalidate_section_translation_structure_cache,
+                  sender=SectionTranslation)
+post_delete.connect(invalidate_section_translation_structure_cache,
+                    sender=SectionTranslation)
+post_save.connect(invalidate_section_relation_structure_cache,
+                  sender=SectionRelation)
+post_delete.connect(invalidate_section_relation_structure_cache,
+                    sender=SectionRelation)
+
 class StoryTemplateTranslation(TranslationModel):
     """Translatable fields for the StoryTemplate model"""
     story_template = models.ForeignKey('StoryTemplate')
@@ -1,3 +1,5 @@
+from django.db.models import Q
+
 from haystack import indexes
 
 from storybase.search.fields import GeoHashMultiValueField, TextSpellField
@@ -37,13 +39,13 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         return obj.get_languages()
 
     def prepare_place_ids(self, obj):
-        return [place.place_id for place in obj.inherited_places]
+        return obj.inherited_place_ids
 
     def prepare_points(self, obj):
         return ["%s,%s" % (point[0], point[1]) for point in obj.points]
 
     def prepare_num_points(self, obj):
-        return len(obj.points)
+        return obj.num_points
 
     def prepare(self, obj):
         prepared_data = super(StoryIndex, self).prepare(obj)
@@ -56,9 +58,30 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
 
         Excludes unpublish stories, template stories, and connected stories.
         """
-        return Story.objects.filter(status__exact='published',
+        return Story.objects.with_translations()\
+                            .filter(status__exact='published',
                                     is_template=False)\
-                            .exclude(source__relation_type='connected')
+                            .exclude(source__relation_type='connected')\
+                            .select_related('author')\
+                            .prefetch_related('topics', 'organizations',
+                                              'projects')
+
+    def get_updated_field(self):
+        return 'last_edited'
+
+    def updated_queryset(self, start_date, using=None):
+        """
+        Get all stories that have changed since a given date
+
+        Unlike ``build_queryset()``, this includes stories that
+        are no longer eligible to be indexed, so they can be removed
+        from the index.  A story is considered changed if it, or one of
+        its assets, has been edited.
+
+        """
+        return Story.objects.filter(Q(last_edited__gte=start_date) |
+                                    Q(assets__last_edited__gte=start_date))\
+                            .distinct()
 
     def should_update(self, instance, **kwargs):
         """
@@ -99,20 +122,33 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         else:
             super(StoryIndex, self).update_object(instance, using, **kwargs)
 
-    def translation_update_object(self, instance, **kwargs):
-        """Signal handler for updating story index when the translation changes"""
+    def translation_objects(self, instance):
+        """Get the stories affected by a change to a story translation"""
         # Deal with race condition when stories are deleted
         # See issue #138
         try:
-            self.update_object(instance.story)
+            return [instance.story]
         except Story.DoesNotExist:
-            pass
+            return []
+
+    def translation_update_object(self, instance, **kwargs):
+        """Signal handler for updating story index when the translation changes"""
+        for story in self.translation_objects(instance):
+            self.update_object(story)
+
+    def location_objects(self, instance):
+        """Get the stories affected by a change to a location"""
+        return instance.stories.all()
 
     def location_update_object(self, instance, **kwargs):
         """Signal handler for updating story index when a related location changes"""
-        for story in instance.stories.all():
+        for story in self.location_objects(instance):
             self.update_object(story)
 
+    def section_translation_objects(self, instance):
+        """Get the stories affected by a change to a section translation"""
+        return [instance.section.story]
+
     def section_translation_update_object(self, instance, **kwargs):
         """
         Signal handler for updating story index when a related section
@@ -122,7 +158,19 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         of the document field of the index.
 
         """
-        self.update_object(instance.section.story)
+        for story in self.section_translation_objects(instance):
+            self.update_object(story)
+
+    def asset_translation_objects(self, instance):
+        """Get the stories affected by a change to an asset translation"""
+        stories = []
+        if instance.asset.type == 'text':
+            for section in instance.asset.sections.all():
+                # Should I use a set here to make this faster?
+                if section.story not in stories:
+                    stories.append(section.story)
+
+        return stories
 
     def asset_translation_update_object(self, instance, **kwargs):
         """
@@ -133,15 +181,8 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         document field in the index.
 
         """
-        stories = []
-        if instance.asset.type == 'text':
-            for section in instance.asset.sections.all():
-                # Should I use a set here to make this faster?
-                if section.story not in stories:
-                    stories.append(section.story)
-
-            for story in stories:
-                self.update_object(story)
+        for story in self.asset_translation_objects(instance):
+            self.update_object(story)
 
     def cache_story_for_delete(self, instance, **kwargs):
         """
@@ -156,6 +197,23 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         """
         instance._story = instance.section.story
 
+    def asset_relation_objects(self, instance):
+        """
+        Get the stories affected when an asset is added to or removed from
+        a section
+        """
+        if instance.asset.type != 'text':
+            return []
+
+        # Try using the cached story. This will be present if
+        # we're deleting the section asset
+        story = getattr(instance, '_story', None)
+        if story is None:
+            # No cached story present, it's safe to get it by following
+            # the relations
+            story = instance.section.story
+        return [story]
+
     def asset_relation_update_object(self, instance, **kwargs):
         """
         Signal handler for when an asset to section relationship is 
@@ -165,12 +223,5 @@ class StoryIndex(indexes.SearchIndex, indexes.Indexable):
         document field of the index.
 
         """
-        if instance.asset.type == 'text':
-            # Try using the cached story. This will be present if
-            # we're deleting the section asset
-            story = getattr(instance, '_story', None)
-            if story is None:
-                # No cached story present, it's safe to get it by following
-                # the relations
-                story = instance.section.story
+        for story in self.asset_relation_objects(instance):
             self.update_object(story)
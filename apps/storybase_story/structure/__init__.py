@@ -1,7 +1,9 @@
 """Interpret a story and render its structure"""
+from django.core.cache import cache
+from django.db.models.loading import get_model
 from django.utils import simplejson
 from django.utils.safestring import mark_safe
-from django.utils.translation import ugettext as _
+from django.utils.translation import get_language, ugettext as _
 
 from storybase.utils import open_html_element, close_html_element
 
@@ -37,6 +39,52 @@ class BaseStructure(object):
     _sections_flat = []
     _previous_sections = {}
     _next_sections = {}
+    _root_sections = []
+    _children = {}
+
+    @classmethod
+    def cache_key(cls, story, language=None):
+        """Get the key used to cache the sections of a story"""
+        if language is None:
+            language = get_language()
+        return story.related_key('structure', language)
+
+    def _load_sections(self):
+        """
+        Retrieve a story's sections and the parent/child relationships
+        between them
+
+        Sections and relations are retrieved with one query each and
+        cached.  Returns a tuple of the list of sections, the primary keys
+        of the root sections and a dictionary mapping the primary key of
+        each section to a list of the primary keys of its children.
+
+        """
+        key = self.cache_key(self.story)
+        cached = cache.get(key, None)
+        if cached is not None:
+            return cached
+
+        sections = list(self.story.sections.with_translations()\
+                                           .order_by('weight'))
+        sections_by_pk = dict([(section.pk, section) for section in sections])
+        root_pks = [section.pk for section in sections if section.root]
+
+        SectionRelation = get_model('storybase_story', 'SectionRelation')
+        relations = [relation for relation in
+                     SectionRelation.objects.filter(parent__story=self.story)\
+                         .values_list('parent_id', 'child_id', 'weight')
+                     if relation[1] in sections_by_pk]
+        # Order children by the relation weight and then by title
+        relations.sort(key=lambda relation: (relation[2],
+                                             sections_by_pk[relation[1]].title))
+        children_pks = {}
+        for (parent_pk, child_pk, weight) in relations:
+            children_pks.setdefault(parent_pk, []).append(child_pk)
+
+        cached = (sections, root_pks, children_pks)
+        cache.set(key, cached)
+        return cached
 
     def _section_children_flat(self, section):
         """
@@ -46,8 +94,7 @@ class BaseStructure(object):
         """
         section_children_flat = []
         previous = None
-        for child_relation in section.child_relations():
-            child = child_relation.child
+        for child in self._children[section]:
             section_children_flat.append(child)
             if previous is None:
                 # First child section
@@ -77,11 +124,22 @@ class BaseStructure(object):
         self._next_sections = {}
         # Build a representation of the sections flattened and 
         # of the next and previous section for a given section
-        root_sections = self.story.sections.filter(root=True) \
-                                           .order_by('weight')
+        (sections, root_pks, children_pks) = self._load_sections()
+        sections_by_pk = {}
+        for section in sections:
+            # Point the sections at this story so accessing
+            # ``section.story`` doesn't require a query or build another
+            # structure object
+            section.story = self.story
+            sections_by_pk[section.pk] = section
+        self._root_sections = [sections_by_pk[pk] for pk in root_pks]
+        self._children = dict([(section,
+                                [sections_by_pk[child_pk] for child_pk
+                                 in children_pks.get(section.pk, [])])
+                               for section in sections])
 
         previous = None
-        for section in root_sections:
+        for section in self._root_sections:
             self._sections_flat.append(section)
             self._previous_sections[section] = previous
             if previous is not None:
@@ -99,6 +157,14 @@ class BaseStructure(object):
                 self._next_sections[section] = None
                 previous = section
 
+    @property
+    def root_sections(self):
+        return self._root_sections
+
+    def get_children(self, section):
+        """Get the child sections of a section, in order"""
+        return self._children.get(section, [])
+
     @property
     def sections_flat(self):
         return self._sections_flat
@@ -197,8 +263,8 @@ class BaseStructure(object):
                           open_html_element(item_el, item_attrs),
                           self.summary_toc_link(),
                           close_html_element(item_el)))
-        for section_index, root_section in enumerate(self.story.sections.filter(root=True) \
-                                               .order_by('weight'), start=1):
+        for section_index, root_section in enumerate(self._root_sections,
+                                                     start=1):
             output.append(self.render_toc_section(root_section, index=section_index))
         if self.story.call_to_action:
             output.append("%s%s%s" % (
@@ -226,9 +292,11 @@ class SpiderStructure(BaseStructure):
         output.append(open_html_element(item_el, item_attrs))
         output.append("<a href='#sections/%s'>%s</a>" %
                       (section.section_id, section.title))
-        if section.children.count():
+        children = sorted(self.get_children(section),
+                          key=lambda child: child.weight)
+        if children:
             output.append(open_html_element(container_el))
-            for child in section.children.order_by('weight'):
+            for child in children:
                 output.append(self.render_toc_section(child, **kwargs))
             output.append(close_html_element(container_el))
         output.append(close_html_element(item_el))
@@ -251,7 +319,8 @@ class LinearStructure(BaseStructure):
                       open_html_element(item_el, item_attrs),
                       section.section_id, title,
                       close_html_element(item_el)))
-        for child in section.children.order_by('weight'):
+        for child in sorted(self.get_children(section),
+                            key=lambda child: child.weight):
             output.append(self.render_toc_section(child, **kwargs))
         return u'\n'.join(output)
 
@@ -13,11 +13,34 @@ logger = logging.getLogger('storybase')
 register = template.Library()
 
 
+def _log_multiple_assets(context, value, asset_ids):
+    # There are two assets added to the same container. See #535
+    section = context['section']
+    logger.error("Multiple assets assigned to container %s in section %s" % (value, section.section_id),
+        extra={'asset_ids': asset_ids,
+            'container': value,
+            'section_id': section.section_id})
+
+
 @register.simple_tag(takes_context=True)
 def container(context, value):
+    placeholder = '<div class="storybase-container-placeholder" id="%s"></div>' % (value)
     if hasattr(value, 'weight'):
         # Argument is a SectionAsset model instance
         asset = value.asset
+    elif 'container_assets' in context:
+        # Argument is a string and the section assets have been loaded
+        # into a mapping of container names to section assets by
+        # ``Section._render_html``
+        section_assets = context['container_assets'].get(value, [])
+        if not section_assets:
+            return placeholder
+        if len(section_assets) > 1:
+            _log_multiple_assets(context, value,
+                [section_asset.asset.asset_id
+                 for section_asset in section_assets])
+        # Just pick one of the assets to show
+        asset = section_assets[0].asset
     else:
         # Argument is a string
         try:
@@ -25,21 +48,18 @@ def container(context, value):
         except (KeyError, ObjectDoesNotExist):
             # Either the context doesn't have an "assets" attribute or there
             # is no asset matching the container
-            return '<div class="storybase-container-placeholder" id="%s"></div>' % (value)
+            return placeholder
         except MultipleObjectsReturned:
-            # There are two assets added to the same container. See #535
-            section = context['section']
             assets = context['assets'].filter(container__name=value)
-            logger.error("Multiple assets assigned to container %s in section %s" % (value, section.section_id),
-                extra={'asset_ids': [a.asset_id for a in assets],
-                    'container': value,
-                    'section_id': section.section_id})
+            _log_multiple_assets(context, value,
+                [a.asset.asset_id for a in assets])
 
             # Just pick one of the assets to show
-            asset = assets[0]
+            asset = assets[0].asset
 
-    # Get the asset subclass instance
-    asset = Asset.objects.get_subclass(pk=asset.pk)
+    if type(asset) is Asset:
+        # Get the asset subclass instance
+        asset = Asset.objects.get_subclass(pk=asset.pk)
     return asset.render_html()
 
 @register.inclusion_tag("storybase_story/connected_story.html")
@@ -51,13 +71,14 @@ def connected_story(story):
 @register.inclusion_tag("storybase_story/latest_stories.html")
 def latest_stories(count=3, img_width=100):
     return latest_context(
-            Story.objects.exclude(source__relation_type='connected'),
+            Story.objects.with_connected_counts()\
+                         .exclude(source__relation_type='connected'),
             count, img_width, '-weight')
 
 @register.inclusion_tag("storybase_story/featured_stories.html")
 def featured_stories():
     return {
-        'objects': [obj.normalize_for_view(300) for obj in Story.objects.filter(on_homepage=True).order_by('-published')]
+        'objects': [obj.normalize_for_view(300) for obj in Story.objects.with_connected_counts().filter(on_homepage=True).order_by('-published')]
     }
 
 @register.simple_tag
@@ -9,6 +9,7 @@ from urllib import urlencode
 
 from django.conf import settings
 from django.core.cache import cache
+from django.core.urlresolvers import reverse
 from django.contrib.auth.models import User
 from django.db import IntegrityError
 from django.http import HttpRequest, Http404
@@ -17,27 +18,34 @@ from django.test import RequestFactory, TestCase, TransactionTestCase
 from django.utils import simplejson
 from django.utils.translation import get_language
 
+import haystack
+from haystack.query import SearchQuerySet
 from tastypie.bundle import Bundle
 from tastypie.test import ResourceTestCase
 
 from storybase.admin import toggle_featured
+from storybase.models import SearchQueueItem
+from storybase.search.signals import QueuedSignalProcessor
 from storybase.tests.base import (SloppyComparisonTestMixin, 
         PermissionTestCase, FixedTestApiClient)
 from storybase.tests.utils import setup_view
 from storybase.utils import slugify
-from storybase_asset.models import (Asset, create_html_asset,
-        create_external_asset, create_external_dataset)
+from storybase_asset.models import (Asset, HtmlAsset, HtmlAssetTranslation,
+        create_html_asset, create_external_asset, create_external_dataset)
 from storybase_geo.models import Location, GeoLevel, Place
 from storybase_help.models import create_help 
 from storybase_story.api import (SectionAssetResource, SectionResource, 
                                  StoryResource)
 from storybase_story.forms import SectionRelationAdminForm
 from storybase_story.managers import StoryQuerySet
+from storybase_story.search_indexes import StoryIndex
 from storybase_story.models import (Container, Story, StoryTranslation,
     Section, SectionAsset, SectionLayout, SectionRelation, StoryTemplate,
     StoryRelation,
-    create_story, create_section, set_asset_license)
+    create_story, create_section, prefetch_section_assets,
+    set_asset_license)
 from storybase_story.templatetags.story import container
+from storybase_story.utils import bulk_create
 from storybase_story.views import (StoryBuilderView, StoryDetailView,
         StoryViewerView, StoryWidgetView)
 from storybase_taxonomy.models import Category, Tag, create_category
@@ -492,10 +500,12 @@ class StoryModelTest(TestCase, SloppyComparisonTestMixin):
         field = 'topics'
         topic = create_category(name="Schools")
         language = get_language()
+        story.topics.add(topic)
+        # Changing the topics changes the story's cache generation, so
+        # get the key afterwards
         key = story.related_key(field, language)
         # Make that the value is not cached
         cache.delete(key)
-        story.topics.add(topic)
         topics_list = story.get_related_list(field, 'pk', 'name')
         # Confirm that the topic is in the result
         self.assertEqual(len(topics_list), 1)
@@ -629,6 +639,58 @@ class StoryModelTest(TestCase, SloppyComparisonTestMixin):
         self.assertTrue(story.has_all_assets())
 
 
+class StoryGeoSummaryTest(TestCase):
+    """Tests for the cached geographic summary of a Story"""
+    def setUp(self):
+        self.story = create_story(title="Test Story", summary="Test Summary",
+                                  byline="Test Byline", status='published')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_locations(self):
+        """Test that location coordinates are used as the points"""
+        location = Location.objects.create(name="The Piton Foundation",
+                                           lat=39.7438167, lng=-104.9884953)
+        self.story.locations.add(location)
+        summary = self.story.get_geo_summary()
+        self.assertEqual(summary['points'], [(location.lat, location.lng)])
+        self.assertEqual(summary['num_points'], 1)
+        self.assertEqual(summary['place_ids'], [])
+
+    def test_inherited_place_ids(self):
+        """
+        Test that the summary includes the ids of ancestors of the story's
+        places
+        """
+        state = Place.objects.create(name="Illinois")
+        city = Place.objects.create(name="Chicago")
+        neighborhood = Place.objects.create(name="Humboldt Park")
+        other = Place.objects.create(name="Colorado")
+        state.add_child(city)
+        city.add_child(neighborhood)
+        self.story.places.add(neighborhood)
+        self.assertEqual(set(self.story.inherited_place_ids),
+                         set([state.place_id, city.place_id,
+                              neighborhood.place_id]))
+        self.assertNotIn(other.place_id, self.story.inherited_place_ids)
+        self.assertEqual(set(self.story.inherited_place_ids),
+                         set([place.place_id for place
+                              in self.story.inherited_places]))
+
+    def test_cached(self):
+        """Test that the summary is only calculated once"""
+        location = Location.objects.create(name="The Piton Foundation",
+                                           lat=39.7438167, lng=-104.9884953)
+        self.story.locations.add(location)
+        self.story.get_geo_summary()
+        story = Story.objects.get(pk=self.story.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(story.num_points, 1)
+            self.assertEqual(len(story.points), 1)
+            self.assertEqual(story.inherited_place_ids, [])
+
+
 class StoryPermissionTest(PermissionTestCase):
     """Test case for story permissions"""
     def setUp(self):
@@ -704,6 +766,29 @@ class StoryPermissionTest(PermissionTestCase):
         self.user1.is_active = False 
         self.assertFalse(self.story.user_can_change(self.user1))
 
+    def test_user_can_change_q(self):
+        """
+        Test that user_can_change_q filters stories the same way as
+        user_can_change
+        """
+        story2 = create_story(title="Test Story 2", summary="Test Summary",
+                              byline="Test Byline", status='published',
+                              author=self.user2)
+        qs = Story.objects.filter(Story.user_can_change_q(self.user1))
+        self.assertEqual(list(qs), [self.story])
+        qs = Story.objects.filter(Story.user_can_change_q(self.admin_user))
+        self.assertEqual(qs.count(), 2)
+        self.user1.is_active = False
+        qs = Story.objects.filter(Story.user_can_change_q(self.user1))
+        self.assertEqual(qs.count(), 0)
+
+    def test_perms_q(self):
+        """Test that perms_q calls through to user_can_<perm>_q"""
+        qs = Story.objects.filter(Story.perms_q(self.user2,
+                                                ['change', 'delete']))
+        self.assertEqual(qs.count(), 0)
+        self.assertEqual(Story.perms_q(self.user2, ['view']), None)
+
     def test_has_perm_change(self):
         """Test that has_perm(user, 'change') calls through to user_can_change"""
         perm = "change"
@@ -755,9 +840,8 @@ class StorySignalsTest(TestCase):
                                        language_key=True):
         story = create_story(title="Test Story", summary="Test Summary",
                              byline="Test Byline", status='published')
-        key = "storybase_story.story:%s:%s" % (story.pk, cache_field_name)
-        if language_key:
-            key = key + ":en"
+        language = "en" if language_key else ""
+        key = story.related_key(cache_field_name, language)
         test_value = "TEST"
         cache.set(key, "TEST")
         self.assertEqual(cache.get(key), test_value)
@@ -772,22 +856,34 @@ class StorySignalsTest(TestCase):
             fn(related_instance)
         elif related_method == "clear":
             fn()
-        self.assertNotEqual(cache.get(key), test_value)
+        new_key = story.related_key(cache_field_name, language)
+        self.assertNotEqual(new_key, key)
+        self.assertNotEqual(cache.get(new_key), test_value)
 
     def test_invalidate_points_cache_add(self):
         location = Location.objects.create(name="The Piton Foundation", lat=39.7438167, lng=-104.9884953)
-        self._test_invalidate_related_cache('locations', 'points', 'add',
+        self._test_invalidate_related_cache('locations', 'geo_summary', 'add',
                                              location, False)
 
     def test_invalidate_points_cache_remove(self):
         location = Location.objects.create(name="The Piton Foundation", lat=39.7438167, lng=-104.9884953)
-        self._test_invalidate_related_cache('locations', 'points', 'remove',
-                                             location, False)
+        self._test_invalidate_related_cache('locations', 'geo_summary',
+                                            'remove', location, False)
 
     def test_invalidate_points_cache_clear(self):
         location = Location.objects.create(name="The Piton Foundation", lat=39.7438167, lng=-104.9884953)
-        self._test_invalidate_related_cache('locations', 'points', 'clear',
-                                             location, False)
+        self._test_invalidate_related_cache('locations', 'geo_summary',
+                                            'clear', location, False)
+
+    def test_invalidate_geo_summary_cache_places_add(self):
+        place = Place.objects.create(name="Humboldt Park")
+        self._test_invalidate_related_cache('places', 'geo_summary', 'add',
+                                            place, False)
+
+    def test_invalidate_geo_summary_cache_places_remove(self):
+        place = Place.objects.create(name="Humboldt Park")
+        self._test_invalidate_related_cache('places', 'geo_summary',
+                                            'remove', place, False)
 
     def test_invalidate_topics_cache_add(self):
         topic = create_category(name="Schools")
@@ -835,6 +931,24 @@ class StorySignalsTest(TestCase):
         self._test_invalidate_related_cache('projects', 'projects',
                                             'clear', project)
 
+    def test_invalidate_featured_asset_url_cache(self):
+        """
+        Test that both the cached featured asset URLs, with and without
+        the host, are invalidated when the featured assets change
+        """
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline", status='published')
+        keys = [story.featured_asset_thumbnail_url_key(include_host)
+                for include_host in (True, False)]
+        for key in keys:
+            cache.set(key, "TEST")
+        asset = create_external_asset(type='image', title='',
+            url='http://example.com/image.jpg')
+        story.featured_assets.add(asset)
+        for include_host in (True, False):
+            key = story.featured_asset_thumbnail_url_key(include_host)
+            self.assertNotIn(key, keys)
+            self.assertNotEqual(cache.get(key), "TEST")
 
     def test_set_story_slug_on_publish(self):
         story = create_story(title="Test Story", 
@@ -850,6 +964,91 @@ class StorySignalsTest(TestCase):
         self.assertEqual(story.slug, "updated-story-title")
 
 
+class QueuedSignalProcessorTest(TestCase):
+    """Tests for queueing story index updates"""
+    def setUp(self):
+        self.processor = QueuedSignalProcessor(haystack.connections,
+            haystack.connection_router)
+
+    def tearDown(self):
+        self.processor.teardown()
+
+    def test_story_save_coalesced(self):
+        """Test that repeated saves of a story only queue one update"""
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline", status='published')
+        story.save()
+        translation = StoryTranslation.objects.get(story=story)
+        translation.title = "Updated Story Title"
+        translation.save()
+        items = SearchQueueItem.objects.all()
+        self.assertEqual(items.count(), 1)
+        self.assertEqual(items[0].identifier,
+                         u"storybase_story.story.%d" % story.pk)
+
+    def test_section_translation_save(self):
+        """Test that saving a section translation queues its story"""
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline", status='published')
+        SearchQueueItem.objects.all().delete()
+        create_section(title="Test Section", story=story)
+        self.assertEqual(SearchQueueItem.objects.filter(
+            module_name='story', object_id=story.pk).count(), 1)
+
+    def test_m2m_changed(self):
+        """Test that changing a story's many-to-many relations queues it"""
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline", status='published')
+        SearchQueueItem.objects.all().delete()
+        topic = create_category(name="Schools")
+        story.topics.add(topic)
+        self.assertEqual(SearchQueueItem.objects.filter(
+            module_name='story', object_id=story.pk).count(), 1)
+
+    @skipIf(settings.HAYSTACK_CONNECTIONS['default']['ENGINE'] not in ('haystack.backends.solr_backend.SolrEngine', 'storybase_geo.search.backends.Solr2155Engine'), "non-Solr Haystack backend")
+    def test_process(self):
+        """Test that processing the queue updates the index"""
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline", status='published')
+        draft = create_story(title="Draft Story", summary="Test Summary",
+                             byline="Test Byline", status='draft')
+        self.assertEqual(SearchQueueItem.objects.process(), 2)
+        self.assertEqual(SearchQueueItem.objects.count(), 0)
+        results = SearchQuerySet().models(Story)
+        story_ids = [int(result.pk) for result in results]
+        self.assertIn(story.pk, story_ids)
+        self.assertNotIn(draft.pk, story_ids)
+
+
+class StoryIndexTest(TestCase):
+    """Tests for the story search index"""
+    def test_updated_queryset(self):
+        """
+        Test that updated_queryset() includes stories whose assets have
+        been edited, as well as unpublished stories
+        """
+        index = StoryIndex()
+        story1 = create_story(title="Test Story 1", summary="Test Summary",
+                              byline="Test Byline", status='published')
+        story2 = create_story(title="Test Story 2", summary="Test Summary",
+                              byline="Test Byline", status='published')
+        story3 = create_story(title="Test Story 3", summary="Test Summary",
+                              byline="Test Byline", status='draft')
+        asset = create_html_asset(type='text', title='Test Asset',
+                                  body='Test content')
+        story2.assets.add(asset)
+        start_date = datetime.datetime.now()
+        Story.objects.filter(pk__in=[story1.pk, story2.pk])\
+                     .update(last_edited=start_date - datetime.timedelta(days=1))
+        Story.objects.filter(pk=story3.pk).update(last_edited=start_date)
+        asset.save()
+        pks = [story.pk for story in index.updated_queryset(start_date)]
+        self.assertEqual(len(pks), 2)
+        self.assertNotIn(story1.pk, pks)
+        self.assertIn(story2.pk, pks)
+        self.assertIn(story3.pk, pks)
+
+
 class StoryTranslationSignalsTest(TestCase):
     def test_clean_storytranslation_html(self):
         """
@@ -1030,6 +1229,65 @@ class StoryQuerySetTest(TestCase):
         self.assertEqual(published.count(), 1)
         self.assertIn(self.published_story, published)
 
+    def test_with_translations(self):
+        """
+        Test that translations are retrieved in bulk and that the translated
+        fields can be accessed without further queries
+        """
+        self._setUpPublished()
+        with self.assertNumQueries(2):
+            titles = [story.title for story in
+                      self.qs.with_translations().order_by('pk')]
+        self.assertEqual(titles, ["Test Story", "Test Draft Story",
+                                  "Test Published Story"])
+
+    def test_with_translations_survives_clone(self):
+        """
+        Test that further filtering doesn't disable bulk retrieval of
+        translations
+        """
+        self._setUpPublished()
+        with self.assertNumQueries(2):
+            stories = list(self.qs.with_translations().published())
+            self.assertEqual(stories[0].title, "Test Published Story")
+
+    def test_with_translations_fallback(self):
+        """
+        Test that bulk retrieval of translations falls back to another
+        language in the same way as accessing a single instance's fields
+        """
+        translation = StoryTranslation(story=self.story, language='es',
+                title="Historia de Prueba")
+        translation.save()
+        story = Story.objects.with_translations('es').get(pk=self.story.pk)
+        self.assertEqual(story._translation_cache['es'].title,
+                         "Historia de Prueba")
+        story = Story.objects.with_translations('es-mx').get(pk=self.story.pk)
+        self.assertEqual(story._translation_cache['es-mx'].title,
+                         "Historia de Prueba")
+        story = Story.objects.with_translations('fr').get(pk=self.story.pk)
+        self.assertEqual(story._translation_cache['fr'].title, "Test Story")
+
+    def test_with_connected_counts(self):
+        """
+        Test that connected story counts are retrieved in bulk and only
+        count published connected stories
+        """
+        self._setUpConnected()
+        self.seed_story.allow_connected = True
+        self.seed_story.save()
+        self.connected_story1.status = 'published'
+        self.connected_story1.save()
+        with self.assertNumQueries(2):
+            counts = dict([(story.pk, story.connected_count()) for story in
+                           self.qs.with_connected_counts().not_connected()])
+        self.assertEqual(counts, {
+            self.story.pk: 0,
+            self.seed_story.pk: 1,
+        })
+        self.assertEqual(counts[self.seed_story.pk],
+                         self.seed_story.connected_count())
+
 
 class StoryManagerTest(TestCase):
     """Test case for custom manager for Story model"""
@@ -1086,6 +1344,55 @@ class StoryManagerTest(TestCase):
 	    self.has_story_title(title, homepage_stories)
 
 
+class BulkCreateTest(TestCase):
+    """Test bulk creation of stories"""
+    def test_bulk_create(self):
+        org = create_organization(name="Mile High Connects")
+        project = create_project(name="The Education Project")
+        topic = create_category(name="Schools")
+        place = Place.objects.create(name="Humboldt Park")
+        existing = create_story(title="Test Story", status='published')
+        rows = [
+            {
+                'title': "Test Story",
+                'summary': "Test Summary",
+                'byline': "Test Byline",
+                'organizations': "Mile High Connects",
+                'projects': "The Education Project",
+                'topics': "Schools",
+                'places': "Humboldt Park",
+                'locations': "",
+            },
+            {
+                'title': "Test Story",
+                'summary': "<script>alert('hi');</script>Test Summary 2",
+                'byline': "Test Byline 2",
+                'organizations': "Mile High Connects, Unknown Organization",
+                'projects': "",
+                'topics': "",
+                'places': "",
+                'locations': "",
+            },
+        ]
+        pks = bulk_create(rows, batch_size=1, update_index=False)
+        self.assertEqual(len(pks), 2)
+        stories = list(Story.objects.filter(pk__in=pks).order_by('pk'))
+        self.assertEqual([story.byline for story in stories],
+                         ["Test Byline", "Test Byline 2"])
+        slugs = set([existing.slug] + [story.slug for story in stories])
+        self.assertEqual(len(slugs), 3)
+        for story in stories:
+            self.assertEqual(story.status, 'published')
+            self.assertNotEqual(story.published, None)
+            self.assertEqual(story.title, "Test Story")
+            self.assertEqual(list(story.organizations.all()), [org])
+        self.assertNotIn("<script>", stories[1].summary)
+        self.assertEqual(list(stories[0].projects.all()), [project])
+        self.assertEqual(list(stories[0].topics.all()), [topic])
+        self.assertEqual(list(stories[0].places.all()), [place])
+        self.assertEqual(stories[1].projects.count(), 0)
+
+
 class RelatedStoriesTest(TestCase):
     """Tests for managing relationships between stories"""
     def setUp(self):
@@ -1340,6 +1647,100 @@ class StoryBuilderViewTest(TestCase):
             for asset in section.assets.all():
                 self.assertIn(asset.asset_id, asset_ids)
 
+    def test_get_section_assets_json_queries(self):
+        """
+        Test that section asset data for all sections is retrieved with
+        a fixed number of queries
+        """
+        # One query each for the sections, the section assets, the assets,
+        # the HtmlAsset translations, the ExternalAsset translations and
+        # the datasets
+        with self.assertNumQueries(6):
+            json_data = self.view.get_section_assets_json(story=self.story)
+        data = json.loads(json_data)
+        bodies = [sectionasset['asset']['body'] for section_data
+                  in data.values() for sectionasset
+                  in section_data['objects']]
+        self.assertIn("Test content", bodies)
+
+
+class StoriesFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.story = create_story(title="Test Story", summary="Test Summary",
+                                  byline="Test Byline", status='published')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_conditional_get(self):
+        """Test that an unchanged feed gets a 304 response"""
+        response = self.client.get(reverse('story_feed'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Test Story", response.content)
+        etag = response['ETag']
+        last_modified = response['Last-Modified']
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_invalidated_on_publish(self):
+        """
+        Test that the cached feed is invalidated when a story is published
+        or unpublished
+        """
+        response = self.client.get(reverse('story_feed'))
+        etag = response['ETag']
+        story = create_story(title="Another Test Story",
+                             summary="Test Summary", byline="Test Byline",
+                             status='draft')
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        story.status = 'published'
+        story.save()
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Another Test Story", response.content)
+        story.status = 'draft'
+        story.save()
+        response = self.client.get(reverse('story_feed'))
+        self.assertNotIn("Another Test Story", response.content)
+
+    def test_invalidated_on_related_change(self):
+        """
+        Test that the cached feed is invalidated when a published story's
+        projects change
+        """
+        project = create_project(name="Test Project")
+        response = self.client.get(reverse('story_feed'))
+        etag = response['ETag']
+        self.story.projects.add(project)
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Test Project", response.content)
+
+    def test_last_modified_on_edit(self):
+        """
+        Test that the Last-Modified header changes when a published story
+        is edited
+        """
+        response = self.client.get(reverse('story_feed'))
+        last_modified = response['Last-Modified']
+        # HTTP dates have a resolution of a second
+        sleep(1)
+        self.story.byline = "Edited Byline"
+        self.story.save()
+        response = self.client.get(reverse('story_feed'),
+                                   HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
 
 class StoryDetailViewTest(TestCase):
     def test_connected_story_404(self):
@@ -1619,6 +2020,66 @@ class TemplateTagTest(TestCase):
         html = container(context, "right")
         self.assertEqual(html, assets[1].render_html())
 
+    def test_container_with_container_assets(self):
+        """
+        Test that the container tag uses the preloaded mapping of
+        containers to assets without making any queries
+        """
+        assets = Asset.objects.select_subclasses()
+        left = Container.objects.get(name='left')
+        right = Container.objects.get(name='right')
+        SectionAsset.objects.create(section=self.section, asset=assets[0],
+            container=left)
+        SectionAsset.objects.create(section=self.section, asset=assets[1],
+            container=right)
+        self.section = Section.objects.get(pk=self.section.pk)
+        prefetch_section_assets([self.section])
+        section_assets = self.section.get_section_assets()
+        context = {
+            'assets': section_assets,
+            'container_assets': dict([(sa.container.name, [sa])
+                                      for sa in section_assets]),
+            'section': self.section,
+        }
+        with self.assertNumQueries(0):
+            left_html = container(context, "left")
+            right_html = container(context, "right")
+            empty_html = container(context, "center")
+        self.assertEqual(left_html, assets[0].render_html())
+        self.assertEqual(right_html, assets[1].render_html())
+        self.assertIn("storybase-container-placeholder", empty_html)
+
+    def test_prefetch_section_assets(self):
+        """
+        Test that the assets of several sections are loaded with a
+        fixed number of queries
+        """
+        assets = Asset.objects.select_subclasses()
+        left = Container.objects.get(name='left')
+        right = Container.objects.get(name='right')
+        layout = SectionLayout.objects.get(
+                sectionlayouttranslation__name="Side by Side")
+        section2 = create_section(title="Test Section2", story=self.story,
+                layout=layout)
+        SectionAsset.objects.create(section=self.section, asset=assets[0],
+            container=left)
+        SectionAsset.objects.create(section=self.section, asset=assets[1],
+            container=right)
+        SectionAsset.objects.create(section=section2, asset=assets[2],
+            container=left)
+        sections = list(Section.objects.filter(story=self.story)\
+                                       .order_by('pk'))
+        with self.assertNumQueries(2):
+            prefetch_section_assets(sections)
+        with self.assertNumQueries(0):
+            loaded = [[sa.asset for sa in section.get_section_assets()]
+                      for section in sections]
+        self.assertEqual([[a.asset_id for a in section_assets]
+                          for section_assets in loaded],
+                         [[assets[0].asset_id, assets[1].asset_id],
+                          [assets[2].asset_id]])
+        self.assertEqual(loaded[1][0].__class__, assets[2].__class__)
+
     def test_latest_stories_no_connected(self):
         """
         Test that the latest_stories template tag doesn't include any
@@ -1756,6 +2217,55 @@ class SectionRenderTest(TestCase):
         html = section.render_html()
         self.assertIn(assets[0].title, html)
         self.assertIn(assets[1].title, html)
+
+    def test_render_html_cached(self):
+        """
+        Test that rendered sections are cached and that the cached version
+        expires when one of the section's assets changes
+        """
+        asset = HtmlAsset.objects.all()[0]
+        section = create_section(title="Test Section1", story=self.story)
+        SectionAsset.objects.create(section=section, asset=asset)
+        section = Section.objects.get(pk=section.pk)
+        html = section.render_html()
+        self.assertIn("Test content", html)
+        with self.assertNumQueries(0):
+            self.assertEqual(section.render_html(), html)
+        translation = HtmlAssetTranslation.objects.get(asset=asset)
+        translation.body = "Updated content"
+        translation.save()
+        section = Section.objects.get(pk=section.pk)
+        self.assertIn("Updated content", section.render_html())
+
+    def test_asset_save_updates_story_last_edited(self):
+        """
+        Test that saving an asset subclass instance updates the last
+        edited field of the stories that include it
+        """
+        asset = HtmlAsset.objects.all()[0]
+        self.story.assets.add(asset)
+        last_edited = datetime.datetime(2012, 1, 1)
+        Story.objects.filter(pk=self.story.pk).update(last_edited=last_edited)
+        asset.status = 'published'
+        asset.save()
+        story = Story.objects.get(pk=self.story.pk)
+        self.assertTrue(story.last_edited > last_edited)
+
+    def test_render_sections_html(self):
+        """Test rendering all of a story's sections"""
+        section1 = create_section(title="Test Section1", story=self.story,
+                                  root=True)
+        section2 = create_section(title="Test Section2", story=self.story)
+        SectionRelation.objects.create(parent=section1, child=section2)
+        story = Story.objects.get(pk=self.story.pk)
+        html = story.render_sections_html()
+        self.assertIn('id="%s"' % section1.section_id, html)
+        self.assertIn('id="%s"' % section2.section_id, html)
+        with self.assertNumQueries(0):
+            self.assertEqual(story.render_sections_html(), html)
+
+    def tearDown(self):
+        cache.clear()
                 
 
 class SectionLayoutModelTest(TestCase):
@@ -2158,6 +2668,70 @@ class StructureTest(TestCase):
                                   root=False)
         self.assertEqual(story.structure.sections_flat, [])
 
+    def test_structure_queries(self):
+        """
+        Test that building a structure takes a fixed number of queries
+        and that the sections are cached
+        """
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline")
+        layout = SectionLayout.objects.get(sectionlayouttranslation__name="Side by Side")
+        section1 = create_section(title="Section 1", story=story,
+                                  layout=layout, root=True)
+        previous = section1
+        for i in range(2, 6):
+            section = create_section(title="Section %d" % i, story=story,
+                                     layout=layout)
+            SectionRelation.objects.create(parent=previous, child=section)
+            previous = section
+        cache.clear()
+        story = Story.objects.with_translations().get(pk=story.pk)
+        # One query each for the sections, their translations and the
+        # relations between them
+        with self.assertNumQueries(3):
+            sections_flat = story.structure.sections_flat
+            story.structure.sections_json(connected_stories=[])
+        self.assertEqual(len(sections_flat), 5)
+        story = Story.objects.get(pk=story.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(story.structure.sections_flat, sections_flat)
+
+    def test_structure_cache_invalidated(self):
+        """
+        Test that the cached structure is invalidated when sections change
+        """
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline")
+        layout = SectionLayout.objects.get(sectionlayouttranslation__name="Side by Side")
+        section1 = create_section(title="Section 1", story=story,
+                                  layout=layout, root=True)
+        story = Story.objects.get(pk=story.pk)
+        self.assertEqual(story.structure.sections_flat, [section1])
+        section2 = create_section(title="Section 2", story=story,
+                                  layout=layout)
+        SectionRelation.objects.create(parent=section1, child=section2)
+        story = Story.objects.get(pk=story.pk)
+        self.assertEqual(story.structure.sections_flat, [section1, section2])
+
+    def test_get_children_unknown_section(self):
+        """
+        Test that get_children returns an empty list for a section that
+        was created after the structure was built
+        """
+        story = create_story(title="Test Story", summary="Test Summary",
+                             byline="Test Byline")
+        layout = SectionLayout.objects.get(sectionlayouttranslation__name="Side by Side")
+        section1 = create_section(title="Section 1", story=story,
+                                  layout=layout, root=True)
+        structure = story.structure
+        self.assertEqual(structure.sections_flat, [section1])
+        section2 = create_section(title="Section 2", story=story,
+                                  layout=layout)
+        self.assertEqual(structure.get_children(section2), [])
+        section2.delete()
+        story = Story.objects.get(pk=story.pk)
+        self.assertEqual(story.structure.sections_flat, [section1])
+
     def test_get_next_section_linear_nested(self):
         """
         Test get_next_section() when sections are arranged in a linear
@@ -3712,6 +4286,43 @@ class StoryExploreResourceTest(ResourceTestCase):
         self.assertEqual(len(self.deserialize(resp)['objects']), 1)
         self.assertEqual(self.deserialize(resp)['objects'][0]['story_id'], story1.story_id)
 
+    @skipIf(settings.HAYSTACK_CONNECTIONS['default']['ENGINE'] not in ('haystack.backends.solr_backend.SolrEngine', 'storybase_geo.search.backends.Solr2155Engine'), "non-Solr Haystack backend")
+    def test_explore_get_list_paginated(self):
+        """
+        Test that the story exploration endpoint only returns the requested
+        page of stories while reporting the total number of matches
+        """
+        for i in range(3):
+            create_story(title="Test Story %d" % i, summary="Test Summary",
+                         byline="Test Byline", status='published')
+        resp = self.api_client.get('/api/0.1/stories/explore/',
+                                   data={'limit': 2, 'offset': 1})
+        self.assertValidJSONResponse(resp)
+        deserialized = self.deserialize(resp)
+        self.assertEqual(len(deserialized['objects']), 2)
+        self.assertEqual(deserialized['meta']['total_count'], 3)
+        self.assertEqual(deserialized['meta']['offset'], 1)
+        self.assertIn('topics', deserialized)
+
+    def test_explore_load_objects(self):
+        """
+        Test that model instances for a page of search results are loaded
+        in result order and that stale results are dropped
+        """
+        class MockResult(object):
+            def __init__(self, pk):
+                self.pk = pk
+
+        story1 = create_story(title="Test Story", summary="Test Summary",
+                              byline="Test Byline", status='published')
+        story2 = create_story(title="Test Story 2", summary="Test Summary 2",
+                              byline="Test Byline 2", status='published')
+        results = [MockResult(str(story2.pk)), MockResult('9999'),
+                   MockResult(str(story1.pk))]
+        with self.assertNumQueries(2):
+            objects = self.resource.explore_load_objects(results)
+        self.assertEqual(objects, [story2, story1])
+
 
 class StoryTemplateResourceTest(ResourceTestCase):
     fixtures = ['admin_user.json', 'section_layouts.json', 
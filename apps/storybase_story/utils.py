@@ -1,22 +1,61 @@
+from datetime import datetime
 import re
+import uuid
 
 from django.conf import settings
+from django.db import transaction
 
+from storybase.utils import unique_slug
 from storybase_user.models import Organization, Project
 from storybase_geo.models import Location, Place
 from storybase_story.models import (Container, SectionAsset, SectionLayout,
-    create_section, create_story, create_story_template)
+    Story, StoryTranslation, clean_storytranslation_html, create_section,
+    create_story, create_story_template, invalidate_feed_cache)
 from storybase_taxonomy.models import Category
 from storybase_asset.models import (create_external_asset, create_html_asset)
 
-def bulk_create(hashes):
+def _update_search_index(model, pks, batch_size):
+    """Update the search index for a list of objects, a batch at a time"""
+    # HACK: Import here to avoid circular import
+    from haystack import connections, connection_router
+    from haystack.exceptions import NotHandled
+
+    for using in connection_router.for_write():
+        try:
+            index = connections[using].get_unified_index().get_index(model)
+        except NotHandled:
+            continue
+
+        backend = connections[using].get_backend()
+        for i in range(0, len(pks), batch_size):
+            objects = index.index_queryset(using=using).filter(
+                pk__in=pks[i:i + batch_size])
+            backend.update(index, [obj for obj in objects
+                                   if index.should_update(obj)])
+
+
+def bulk_create(hashes, batch_size=500, update_index=True):
     """Bulk create stories from a list of dictionaries
 
     This is meant to be passed a csv.DictWriter object or steps.hashes in a
     lettuce step
 
+    Stories, their translations and their relations to organizations,
+    projects, topics, places and locations are inserted with
+    ``bulk_create``, ``batch_size`` rows at a time.  Related objects are
+    looked up by name once and remembered for later rows.
+
+    Because ``bulk_create`` doesn't send the ``pre_save`` and
+    ``post_save`` signals, the work done by the signal handlers, such as
+    setting slugs and published dates, is done here instead.  The search
+    index is updated once, after all the stories have been created.
+
     Arguments:
     hashes -- List of dictionaries containing story attributes
+    batch_size -- Number of stories to create at a time
+    update_index -- Update the search index for the new stories
+
+    Returns a list of the primary keys of the created stories.
 
     """
     def _nonempty(names):
@@ -25,28 +64,109 @@ def bulk_create(hashes):
     def _parse_names(names):
         return _nonempty(re.split(',\W+', names))
 
+    # Mapping of story relation field names to the CSV column containing
+    # related object names, the queryset used to look up related objects
+    # and the field that contains the names
+    relations = (
+        ('organizations', 'organizations', Organization.objects.all(),
+         'organizationtranslation__name'),
+        ('projects', 'projects', Project.objects.all(),
+         'projecttranslation__name'),
+        ('topics', 'topics', Category.objects.all(),
+         'categorytranslation__name'),
+        ('places', 'places', Place.objects.all(), 'name'),
+        ('locations', 'locations', Location.objects.all(), 'name'),
+    )
+    # Primary keys of related objects, keyed by field name and then
+    # by object name
+    lookups = dict([(field_name, {}) for field_name, column, qs, name_field
+                    in relations])
+    slugs = set(Story.objects.exclude(slug='')\
+                             .values_list('slug', flat=True))
+    story_pks = []
+    rows = []
+
+    def _create_batch(rows):
+        # Look up related objects that haven't been seen in earlier batches
+        for field_name, column, qs, name_field in relations:
+            lookup = lookups[field_name]
+            names = set()
+            for row in rows:
+                names.update(_parse_names(row[column]))
+            names = [name for name in names if name not in lookup]
+            if names:
+                for name, pk in qs.filter(**{"%s__in" % name_field: names})\
+                                  .values_list(name_field, 'pk'):
+                    lookup.setdefault(name, []).append(pk)
+
+        now = datetime.now()
+        stories = []
+        for row in rows:
+            story = Story(story_id=uuid.uuid4().hex, byline=row['byline'],
+                          status='published', published=now,
+                          slug=unique_slug(row['title'], slugs))
+            story.weight = story.get_weight()
+            stories.append(story)
+
+        with transaction.commit_on_success():
+            Story.objects.bulk_create(stories, batch_size=batch_size)
+            # ``bulk_create`` doesn't set the primary keys of the created
+            # objects, so look them up by the stories' UUIDs
+            story_ids = [story.story_id for story in stories]
+            pks = dict(Story.objects.filter(story_id__in=story_ids)\
+                                    .values_list('story_id', 'pk'))
+            batch_pks = [pks[story_id] for story_id in story_ids]
+
+            translations = []
+            for pk, row in zip(batch_pks, rows):
+                translation = StoryTranslation(story_id=pk,
+                    title=row['title'], summary=row['summary'],
+                    language=settings.LANGUAGE_CODE)
+                clean_storytranslation_html(StoryTranslation, translation)
+                translations.append(translation)
+            StoryTranslation.objects.bulk_create(translations,
+                                                 batch_size=batch_size)
+
+            for field_name, column, qs, name_field in relations:
+                field = Story._meta.get_field(field_name)
+                through = field.rel.through
+                lookup = lookups[field_name]
+                through_objs = []
+                related_pks = set()
+                for pk, row in zip(batch_pks, rows):
+                    row_related_pks = set()
+                    for name in _parse_names(row[column]):
+                        row_related_pks.update(lookup.get(name, []))
+                    for related_pk in row_related_pks:
+                        through_objs.append(through(**{
+                            field.m2m_column_name(): pk,
+                            field.m2m_reverse_name(): related_pk,
+                        }))
+                    related_pks.update(row_related_pks)
+                through.objects.bulk_create(through_objs,
+                                            batch_size=batch_size)
+                if field_name in ('organizations', 'projects') and related_pks:
+                    # Do what the ``update_last_edited`` signal handler
+                    # would have done
+                    field.rel.to.objects.filter(pk__in=related_pks)\
+                                        .update(last_edited=now)
+
+        story_pks.extend(batch_pks)
+
     for story_dict in hashes:
-        title = story_dict['title']
-        summary = story_dict['summary']
-        byline = story_dict['byline']
-        org_names = _parse_names(story_dict['organizations'])
-        proj_names = _parse_names(story_dict['projects'])
-        topic_names = _parse_names(story_dict['topics'])
-        place_names = _parse_names(story_dict['places'])
-        loc_names = _parse_names(story_dict['locations'])
-        orgs = list(Organization.objects.filter(organizationtranslation__name__in=org_names))
-        projects = list(Project.objects.filter(projecttranslation__name__in=proj_names))
-        topics = list(Category.objects.filter(categorytranslation__name__in=topic_names))
-        places = list(Place.objects.filter(name__in=place_names))
-        locations = list(Location.objects.filter(name__in=loc_names))
-        story = create_story(title=title, summary=summary, byline=byline,
-                             status='published')
-        story.organizations.add(*orgs)
-        story.projects.add(*projects)
-        story.topics.add(*topics)
-        story.places.add(*places)
-        story.locations.add(*locations)
-        story.save()
+        rows.append(story_dict)
+        if len(rows) == batch_size:
+            _create_batch(rows)
+            rows = []
+    if rows:
+        _create_batch(rows)
+
+    if story_pks:
+        invalidate_feed_cache()
+        if update_index:
+            _update_search_index(Story, story_pks, batch_size)
+
+    return story_pks
 
 def create_connected_story_template():
     """
@@ -18,11 +18,12 @@ from django.views.generic.detail import SingleObjectMixin, SingleObjectTemplateR
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext as _
 
+from storybase.models import prefetch_translations
 from storybase.utils import escape_json_for_html, roundrobin
 from storybase.views import EmbedView, EmbedPopupView, ShareView, SharePopupView
 from storybase.views.generic import ModelIdDetailView, Custom404Mixin, VersionTemplateMixin
 from storybase_asset.api import AssetResource
-from storybase_asset.models import ASSET_TYPES
+from storybase_asset.models import ASSET_TYPES, Asset
 from storybase_geo.models import Place
 from storybase_help.api import HelpResource
 from storybase_story.api import (ContainerTemplateResource,
@@ -40,7 +41,6 @@ class HomeView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super(HomeView, self).get_context_data(**kwargs)
         context['topics'] = Category.objects.all()
-        context['places'] = Place.objects.all().values('name', 'id')
 
         return context
 
@@ -282,6 +282,18 @@ class StoryBuilderView(DetailView):
         to_be_serialized = resource.full_dehydrate(bundle)
         return resource.serialize(None, to_be_serialized, 'application/json')
 
+    def dehydrate_list(self, resource, objects):
+        """
+        Dehydrate a list of model instances in the same format as a
+        resource's list endpoint
+        """
+        bundles = [resource.build_bundle(obj=obj) for obj in objects]
+        to_be_serialized = {
+            'objects': [resource.full_dehydrate(bundle) for bundle in bundles],
+        }
+        return resource.alter_list_data_to_serialize(request=None,
+                                                     data=to_be_serialized)
+
     def get_sections_json(self, story=None):
         """
         Get serialized section data for a story
@@ -293,16 +305,17 @@ class StoryBuilderView(DetailView):
         if story is None:
             story = self.object
         resource = SectionResource()
-        to_be_serialized = {}
         bundle = resource.build_bundle()
         objects = resource.obj_get_list(bundle, story__story_id=story.story_id)
         sorted_objects = resource.apply_sorting(objects)
-        to_be_serialized['objects'] = sorted_objects
-
-        # Dehydrate the bundles in preparation for serialization.
-        bundles = [resource.build_bundle(obj=obj) for obj in to_be_serialized['objects']]
-        to_be_serialized['objects'] = [resource.full_dehydrate(bundle) for bundle in bundles]
-        to_be_serialized = resource.alter_list_data_to_serialize(request=None, data=to_be_serialized)
+        # Retrieve the related objects that are needed to dehydrate the
+        # sections along with the sections instead of with separate
+        # queries for each section
+        sections = list(sorted_objects.select_related('story', 'layout',
+            'help', 'template_section'))
+        prefetch_translations([section.help for section in sections
+                               if section.help])
+        to_be_serialized = self.dehydrate_list(resource, sections)
         return resource.serialize(None, to_be_serialized, 'application/json')
 
     def get_section_assets_json(self, story=None):
@@ -316,31 +329,43 @@ class StoryBuilderView(DetailView):
         The asset data is accessible via the objects property of
         each section object.
 
+        The section assets for all of the story's sections and their
+        assets are retrieved with a fixed number of queries, regardless
+        of the number of sections.
+
         """
         if story is None:
             story = self.object
         resource = SectionAssetResource()
-        to_be_serialized = {}
-        for section in story.sections.all():
-            sa_to_be_serialized = {}
-            bundle = resource.build_bundle()
-            objects = resource.obj_get_list(bundle, section__section_id=section.section_id)
-            sorted_objects = resource.apply_sorting(objects)
-            sa_to_be_serialized['objects'] = sorted_objects
-
-            # Dehydrate the bundles in preparation for serialization.
-            bundles = [resource.build_bundle(obj=obj) for obj in sa_to_be_serialized['objects']]
-            sa_to_be_serialized['objects'] = [resource.full_dehydrate(bundle) for bundle in bundles]
-            sa_to_be_serialized = resource.alter_list_data_to_serialize(request=None, data=sa_to_be_serialized)
-            to_be_serialized[section.section_id] = sa_to_be_serialized
-
+        bundle = resource.build_bundle()
+        objects = resource.apply_sorting(resource.obj_get_list(bundle))
+        section_assets = list(objects.filter(section__story=story)\
+                                     .select_related('section__story',
+                                                     'container'))
+        assets = Asset.objects.select_subclasses().with_translations()\
+                      .prefetch_related('datasets')\
+                      .filter(pk__in=[section_asset.asset_id for
+                                      section_asset in section_assets])
+        assets_by_pk = dict([(asset.pk, asset) for asset in assets])
+
+        section_assets_by_section = dict([(section_id, []) for section_id
+            in story.sections.values_list('section_id', flat=True)])
+        for section_asset in section_assets:
+            # Use the subclass instance of the asset when dehydrating
+            section_asset.asset = assets_by_pk[section_asset.asset_id]
+            section_assets_by_section[section_asset.section.section_id]\
+                .append(section_asset)
+
+        to_be_serialized = dict([
+            (section_id, self.dehydrate_list(resource, section_assets))
+            for section_id, section_assets
+            in section_assets_by_section.items()])
         return resource.serialize(None, to_be_serialized, 'application/json')
 
     def get_assets_json(self, story=None, featured=False):
         if story is None:
             story = self.object
         resource = AssetResource()
-        to_be_serialized = {}
         bundle = resource.build_bundle()
         # Set the resource request's user to match this view's
         # request's user.  Otherwise authorization checks won't work
@@ -348,12 +373,10 @@ class StoryBuilderView(DetailView):
         objects = resource.obj_get_list(bundle, featured=featured,
                                         story_id=story.story_id)
         sorted_objects = resource.apply_sorting(objects)
-        to_be_serialized['objects'] = sorted_objects
-
-        # Dehydrate the bundles in preparation for serialization.
-        bundles = [resource.build_bundle(obj=obj) for obj in to_be_serialized['objects']]
-        to_be_serialized['objects'] = [resource.full_dehydrate(bundle) for bundle in bundles]
-        to_be_serialized = resource.alter_list_data_to_serialize(request=None, data=to_be_serialized)
+        # Retrieve the datasets used when rendering the assets' captions
+        # in a single query
+        to_be_serialized = self.dehydrate_list(resource,
+            sorted_objects.prefetch_related('datasets'))
         return resource.serialize(None, to_be_serialized, 'application/json')
 
     def get_story_template_json(self):
@@ -392,11 +415,6 @@ class StoryBuilderView(DetailView):
                            for obj in Category.objects.order_by('categorytranslation__name')]
         return json.dumps(to_be_serialized)
 
-    def get_places_json(self):
-        to_be_serialized = [{ 'id': place.place_id, 'name': place.name }
-                            for place in Place.objects.order_by('geolevel__name', 'name')]
-        return json.dumps(to_be_serialized)
-
     def get_organizations_json(self):
         to_be_serialized = [{'organization_id': org.organization_id,
                              'name': org.name}
@@ -545,7 +563,6 @@ class StoryBuilderView(DetailView):
                 self.get_help_json())),
             'layouts_json': mark_safe(self.get_layouts_json()),
             'organizations_json': mark_safe(self.get_organizations_json()),
-            'places_json': mark_safe(self.get_places_json()),
             'projects_json': mark_safe(self.get_projects_json()),
             'story_template_json': mark_safe(self.get_story_template_json()),
             'topics_json': mark_safe(self.get_topics_json()),
@@ -848,7 +865,7 @@ class StoryWidgetView(Custom404Mixin, VersionTemplateMixin, DetailView):
 
         if self.list_match:
             filter_kwargs = self.get_filter_kwargs(self.list_match, self.get_related_field_name(self.list_match))
-            context['stories'] = Story.objects.published().filter(**filter_kwargs).order_by('-published')[:3]
+            context['stories'] = Story.objects.with_translations().published().filter(**filter_kwargs).order_by('-published')[:3]
             # This is a list widget. The taxonomy sole taxonomy term is the term
             # we're displaying in the widget
             context['taxonomy_terms'] = [context['object']]
@@ -931,7 +948,7 @@ class StoryListView(MultipleObjectMixin, ModelIdDetailView):
         page = None
         is_paginated = False
         filter_kwargs = self.get_story_filter_kwargs()
-        queryset = Story.objects.published().filter(**filter_kwargs).order_by('-published')
+        queryset = Story.objects.with_translations().published().filter(**filter_kwargs).order_by('-published')
 
         page_size = self.get_paginate_by(queryset)
         if page_size:
@@ -6,9 +6,10 @@ from tastypie.authentication import Authentication
 from tastypie.exceptions import ImmediateHttpResponse, NotFound
 from tastypie.utils import trailing_slash
 
-from storybase.api import HookedModelResource, LoggedInAuthorization
+from storybase.api import (HookedModelResource, LoggedInAuthorization,
+    TypeaheadResource)
 from storybase_story.models import Story
-from storybase_taxonomy.models import Tag
+from storybase_taxonomy.models import CategoryTranslation, Tag
 
 class TagResource(HookedModelResource):
     class Meta:
@@ -97,3 +98,15 @@ class TagResource(HookedModelResource):
             story.save()
         else:
             raise ImmediateHttpResponse(response=http.HttpUnauthorized("You are not authorized to delete a tag, only to remove them from a story"))
+
+
+class TopicTypeaheadResource(TypeaheadResource):
+    """Suggest topics whose names match what a user has typed"""
+    model = CategoryTranslation
+    id_field = 'category'
+
+    class Meta(TypeaheadResource.Meta):
+        resource_name = 'typeahead/topics'
+
+    def get_queryset(self, language):
+        return CategoryTranslation.objects.filter(language=language)
@@ -0,0 +1,76 @@
+# encoding: utf-8
+import datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Indexes used by the typeahead API to match topic names.
+        # Django's ``istartswith`` lookup compares ``UPPER(name::text)``,
+        # so index that expression for prefix matching.
+        if db.backend_name != 'postgres':
+            return
+
+        db.execute('CREATE INDEX "storybase_taxonomy_categorytranslation_name_upper_like" '
+                   'ON "storybase_taxonomy_categorytranslation" (UPPER("name"::text) text_pattern_ops)')
+        # Index trigrams for ``STORYBASE_TYPEAHEAD_TRIGRAM`` if the
+        # pg_trgm extension is installed
+        if db.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"):
+            db.execute('CREATE INDEX "storybase_taxonomy_categorytranslation_name_trgm" '
+                       'ON "storybase_taxonomy_categorytranslation" USING gin ("name" gin_trgm_ops)')
+
+
+    def backwards(self, orm):
+        if db.backend_name != 'postgres':
+            return
+
+        db.execute('DROP INDEX IF EXISTS "storybase_taxonomy_categorytranslation_name_trgm"')
+        db.execute('DROP INDEX IF EXISTS "storybase_taxonomy_categorytranslation_name_upper_like"')
+
+
+    models = {
+        'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'storybase_taxonomy.category': {
+            'Meta': {'object_name': 'Category'},
+            'active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'level': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'}),
+            'lft': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'}),
+            'parent': ('mptt.fields.TreeForeignKey', [], {'blank': 'True', 'related_name': "'children'", 'null': 'True', 'to': "orm['storybase_taxonomy.Category']"}),
+            'rght': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'}),
+            'tree_id': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'})
+        },
+        'storybase_taxonomy.categorytranslation': {
+            'Meta': {'unique_together': "(('category', 'language'),)", 'object_name': 'CategoryTranslation'},
+            'category': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['storybase_taxonomy.Category']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'language': ('django.db.models.fields.CharField', [], {'default': "'en'", 'max_length': '15'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '50', 'db_index': 'True'}),
+            'translation_id': ('uuidfield.fields.UUIDField', [], {'unique': 'True', 'max_length': '32', 'blank': 'True'})
+        },
+        'storybase_taxonomy.tag': {
+            'Meta': {'object_name': 'Tag'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '100', 'db_index': 'True'}),
+            'tag_id': ('uuidfield.fields.UUIDField', [], {'unique': 'True', 'max_length': '32', 'blank': 'True'})
+        },
+        'storybase_taxonomy.taggeditem': {
+            'Meta': {'object_name': 'TaggedItem'},
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'storybase_taxonomy_taggeditem_tagged_items'", 'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'object_id': ('django.db.models.fields.IntegerField', [], {'db_index': 'True'}),
+            'tag': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'items'", 'to': "orm['storybase_taxonomy.Tag']"})
+        }
+    }
+
+    complete_apps = ['storybase_taxonomy']
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.db import models
+from django.db.models import Q
 from django.utils.encoding import force_unicode
 from django.utils.translation import ugettext_lazy as _
 
@@ -111,6 +112,14 @@ class TagPermission(PermissionMixin):
     def user_can_delete(self, user):
         return self.user_can_change(user)
 
+    @classmethod
+    def user_can_change_q(cls, user):
+        return Q(pk__in=[])
+
+    @classmethod
+    def user_can_delete_q(cls, user):
+        return cls.user_can_change_q(user)
+
 
 class Tag(TagPermission, TagBase):
     tag_id = UUIDField(auto=True)
@@ -1,5 +1,6 @@
 """Tests for taxonomy app"""
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import TestCase
 
@@ -34,6 +35,29 @@ class CategoryApiTest(TestCase):
         self.fail('Implement me')
 
 
+class TopicTypeaheadResourceTest(ResourceTestCase):
+    def setUp(self):
+        super(TopicTypeaheadResourceTest, self).setUp()
+        cache.clear()
+        self.category = create_category(name="Education")
+        CategoryTranslation.objects.create(category=self.category,
+            name=u"Educaci\u00f3n", language="es")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_list_language(self):
+        """Test that topic names are matched in the requested language"""
+        uri = '/api/0.1/typeahead/topics/'
+        for lang, name in (('en', u"Education"), ('es', u"Educaci\u00f3n")):
+            resp = self.api_client.get(uri, data={'q': "edu", 'lang': lang})
+            self.assertValidJSONResponse(resp)
+            self.assertEqual(self.deserialize(resp)['objects'], [{
+                'id': unicode(self.category.pk),
+                'name': name,
+            }])
+
+
 class TagResourceTest(ResourceTestCase):
     def setUp(self):
         super(TagResourceTest, self).setUp()
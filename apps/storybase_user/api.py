@@ -0,0 +1,17 @@
+from storybase.api import TypeaheadResource
+from storybase_user.models import OrganizationTranslation
+
+class OrganizationTypeaheadResource(TypeaheadResource):
+    """
+    Suggest published organizations whose names match what a user has
+    typed
+    """
+    model = OrganizationTranslation
+    id_field = 'organization__organization_id'
+
+    class Meta(TypeaheadResource.Meta):
+        resource_name = 'typeahead/organizations'
+
+    def get_queryset(self, language):
+        return OrganizationTranslation.objects.filter(language=language,
+            organization__status='published')
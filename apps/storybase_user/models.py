@@ -13,6 +13,7 @@ from django.contrib.auth.models import User
 from django.core.mail import send_mail
 from django.core import urlresolvers
 from django.db import models
+from django.db.models import Q
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
@@ -138,6 +139,19 @@ class PermissionBase(PermissionMixin):
 
         return False
 
+    @classmethod
+    def anonymoususer_can_view_q(cls, user):
+        return Q(status='published')
+
+    @classmethod
+    def user_can_view_q(cls, user):
+        from storybase_user.utils import is_admin
+
+        if user.is_superuser or is_admin(user):
+            return Q()
+
+        return Q(status='published')
+
         
 class OrganizationTranslation(TranslationModel, TimestampedModel):
     organization = models.ForeignKey('Organization')
@@ -177,6 +191,8 @@ class Organization(PermissionBase, MembershipUtilsMixin, FeaturedAssetsMixin,
     translation_class = OrganizationTranslation
     translated_fields = ['name', 'description']
     translation_set = 'organizationtranslation_set'
+    # Fields whose changes are checked by ``send_approval_notification``
+    dirty_fields = ('status',)
 
     def __unicode__(self):
         return self.name
@@ -343,6 +359,8 @@ class Project(PermissionBase, MembershipUtilsMixin, FeaturedAssetsMixin,
     translation_class = ProjectTranslation
     translated_fields = ['name', 'description']
     translation_set = 'projecttranslation_set'
+    # Fields whose changes are checked by ``send_approval_notification``
+    dirty_fields = ('status',)
 
     def __unicode__(self):
         return self.name
@@ -11,9 +11,24 @@ from storybase_user.models import Organization, Project, ADMIN_GROUP_NAME
 
 def is_admin(user):
     from django.db.models import Q
-    return user in User.objects.filter(
-        Q(groups__name=ADMIN_GROUP_NAME) | Q(is_superuser=True)
-    )
+    from storybase.models import get_perm_cache
+
+    if user.pk is None:
+        return False
+
+    # Permission checks often call this for the same user many times
+    # during a request, so cache the result along with the checks
+    cache = get_perm_cache()
+    key = ('is_admin', user.pk)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    result = User.objects.filter(
+        Q(groups__name=ADMIN_GROUP_NAME) | Q(is_superuser=True),
+        pk=user.pk).exists()
+    if cache is not None:
+        cache[key] = result
+    return result
 
 def get_admin_emails():
     """Get a list of admin email addresses"""
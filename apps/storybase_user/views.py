@@ -162,7 +162,7 @@ class OrganizationDetailView(RelatedStoriesDetailView):
 class OrganizationListView(ListView):
     """Display a list of all Organizations"""
     context_object_name = 'organizations'
-    queryset = Organization.objects.published()\
+    queryset = Organization.objects.with_translations().published()\
                            .order_by('organizationtranslation__name')
 
 
@@ -177,7 +177,8 @@ class ProjectDetailView(RelatedStoriesDetailView):
 class ProjectListView(ListView):
     """Display a list of all Projects"""
     context_object_name = "projects"
-    queryset = Project.objects.published().order_by('-published')
+    queryset = Project.objects.with_translations().published()\
+                      .order_by('-published')
 
 
 class UserProfileDetailView(RelatedStoriesDetailView):
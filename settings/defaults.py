@@ -355,6 +355,12 @@ HAYSTACK_SEARCH_RESULTS_PER_PAGE = 10
 # This often breaks the system because of a circular import - this may be required
 #
 # HAYSTACK_SIGNAL_PROCESSOR = 'storybase.search.signals.RealtimeSignalProcessor'
+#
+# To keep index updates out of the request/response cycle, queue them
+# instead and run the ``process_search_queue`` management command from
+# a cron job or as a worker:
+#
+# HAYSTACK_SIGNAL_PROCESSOR = 'storybase.search.signals.QueuedSignalProcessor'
 
 # storybase settings
 # The name of the group used for site administrators
@@ -419,6 +425,29 @@ STORYBASE_DEFAULT_USER_IMAGES = {
     335: STATIC_URL + 'img/default-image-user-335x200.png',
 }
 
+# Number of seconds before a stored oEmbed response should be requested
+# again from the provider.  Stored responses continue to be used after
+# this, until they're refreshed by the refresh_oembed_cache management
+# command.
+STORYBASE_OEMBED_TTL = 60 * 60 * 24 * 7
+# Number of seconds before retrying an oEmbed request that failed
+STORYBASE_OEMBED_ERROR_TTL = 60 * 60
+
+# Maximum size, in bytes, of files uploaded through the API, either as
+# data URIs or in chunks
+STORYBASE_MAX_UPLOAD_SIZE = 100 * 1024 * 1024
+# Number of seconds after the last piece of a chunked upload was
+# received before the upload is discarded
+STORYBASE_CHUNKED_UPLOAD_EXPIRY = 60 * 60 * 24
+
+# Number of seconds that typeahead suggestions for places, topics and
+# organizations are cached, both on the server and by clients
+STORYBASE_TYPEAHEAD_CACHE_TIMEOUT = 60 * 60
+# Suggest names that are similar to, rather than just containing, the
+# text a user has typed.  This requires the PostgreSQL pg_trgm extension
+# to be installed in the database.
+STORYBASE_TYPEAHEAD_TRIGRAM = False
+
 # Browser support message that will be shown if a user's browser lacks
 # support for certain features required by the site.
 STORYBASE_BROWSER_SUPPORT_MSG = "This site works best in a recent version of <a href='http://www.mozilla.org/firefox/' title='Mozilla Firefox'>Firefox</a> or <a href='http://www.google.com/chrome/' title='Google Chrome'>Chrome</a>. If you are using an older browser, we recommend updating to the latest version."
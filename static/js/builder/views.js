@@ -189,9 +189,6 @@
    *   Project items have ``project_id`` and ``name`` properties.
    * @property {string} options.alertsEl - Selector for DOM element where
    *   application alerts will be displayed.
-   * @property {object} options.places - List of available places that can be
-   *   used to categorize the story.
-   *   Place items have ``id`` and ``name`` properties.
    * @property {StoryRelations} options.relatedStories - Collection of stories
    *   related to the current story or story that will be created. This is
    *   used to specify the seed story in connected story relationships.
@@ -403,7 +400,6 @@
       if (this.options.visibleSteps.tag) {
         this.subviews.tag = new TaxonomyView(
           _.defaults({
-            places: this.options.places,
             topics: this.options.topics,
             organizations: this.options.organizations,
             projects: this.options.projects
@@ -6127,7 +6123,6 @@
       initializeForm: function() {
         // Convert the JSON into the format for Backbone Forms
         var topicsOptions = this.getFormOptions(this.options.topics);
-        var placesOptions = this.getFormOptions(this.options.places);
         var organizationsOptions = this.getFormOptions(this.options.organizations, 'organization_id');
         var projectsOptions = this.getFormOptions(this.options.projects, 'project_id');
         // Default editor attributes for the Backbone Form
@@ -6142,10 +6137,16 @@
             options: topicsOptions, 
             editorAttrs: _.defaults({placeholder: gettext("Click to select topics")}, editorAttrs)
           },
-          places: { 
-            type: 'Select', 
-            options: placesOptions, 
-            editorAttrs: _.defaults({placeholder: gettext("Click to select places")}, editorAttrs)
+          // There are too many places to include them all in the page,
+          // so they're suggested as the user types.  Select2 requires a
+          // hidden input rather than a select element for this.
+          places: {
+            type: 'Text',
+            editorAttrs: {
+              type: 'hidden',
+              placeholder: gettext("Start typing to select places"),
+              style: editorAttrs.style
+            }
           },
           organizations: {
             type: 'Select',
@@ -6204,6 +6205,53 @@
         });
       },
 
+      /**
+       * Enable Select2 on the places field, retrieving the places that
+       * match what the user types from the API.
+       *
+       * @param {Backbone.Form.editors.Text} editor Editor for the places
+       *     field.
+       */
+      initializePlacesEditor: function(editor) {
+        var places = this.model.get('places');
+        var language = this.options.language;
+        var toChoice = function(place) {
+          return {
+            id: place.id,
+            text: place.name
+          };
+        };
+        editor.$el.select2({
+          width: 'resolve',
+          multiple: true,
+          minimumInputLength: 2,
+          ajax: {
+            url: storybase.API_ROOT + 'typeahead/places/',
+            dataType: 'json',
+            quietMillis: 250,
+            data: function(term, page) {
+              return {
+                q: term,
+                lang: language
+              };
+            },
+            results: function(data, page) {
+              return {
+                results: _.map(data.objects, toChoice)
+              };
+            }
+          },
+          initSelection: function(element, callback) {
+            callback(_.map(places, toChoice));
+          }
+        });
+        // Select2 changes the value of the hidden input without firing
+        // the keyboard events that Backbone Forms' Text editor listens to
+        editor.$el.on('change', function() {
+          editor.determineChange();
+        });
+      },
+
       replaceRelated: function(url, data) {
         data = data ? data : [];
         $.ajax(url, {
@@ -6221,7 +6269,8 @@
 
       changePlaces: function(form, editor) {
         var url = this.model.url() + 'places/'; 
-        this.replaceRelated(url, editor.getValue());
+        var value = editor.getValue();
+        this.replaceRelated(url, value ? value.split(',') : []);
       },
 
       changeOrganizations: function(form, editor) {
@@ -6237,7 +6286,7 @@
       render: function() {
         var initialValues = {
           'topics': _.pluck(this.model.get('topics'), 'id'),
-          'places': _.pluck(this.model.get('places'), 'id')
+          'places': _.pluck(this.model.get('places'), 'id').join(',')
         };
         this.$el.html(this.template());
         this.$('#taxonomy').append(this.officialForm.render().el);
@@ -6251,7 +6300,7 @@
         
         // TODO: Custom editor that automatically does this?
         this.officialForm.fields.topics.editor.$el.select2({width: 'resolve'});
-        this.officialForm.fields.places.editor.$el.select2({width: 'resolve'});
+        this.initializePlacesEditor(this.officialForm.fields.places.editor);
         if (this.officialForm.fields.organizations) {
           this.officialForm.fields.organizations.editor.$el.select2({width: 'resolve'});
         }
@@ -424,6 +424,11 @@
       if (this.onlyPoints) {
         filterStrings.push("num_points__gt=0");
       }
+      // Send the map's zoom level so place boundaries are returned
+      // at a suitable resolution
+      if (this.selectedFilters.places && this.mapView && this.mapView.map) {
+        filterStrings.push("zoom=" + this.mapView.map.getZoom());
+      }
       filterUri = filterStrings.length > 0 ? filterUri + '?' : filterUri;
       filterUri += filterStrings.join("&");
       return filterUri;
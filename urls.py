@@ -7,14 +7,17 @@ from django.views.generic.base import RedirectView
 
 from tastypie.api import Api
 
-from storybase.api import CreativeCommonsLicenseGetProxyView
+from storybase.api import (ChunkedUploadResource,
+    CreativeCommonsLicenseGetProxyView)
 from storybase.views import JSErrorHandlerView
 from storybase_asset.api import AssetResource, DataSetResource
 from storybase_geo.api import (GeocoderResource, GeoLevelResource,
-                               LocationResource, PlaceResource)
+                               LocationResource, PlaceResource,
+                               PlaceTypeaheadResource)
 from storybase_help.api import (HelpResource)
 from storybase_story.api import StoryResource
-from storybase_taxonomy.api import TagResource
+from storybase_taxonomy.api import TagResource, TopicTypeaheadResource
+from storybase_user.api import OrganizationTypeaheadResource
 from storybase_badge.api import BadgeResource
 
 # Override default error handler with one that uses RequestContext
@@ -36,6 +39,10 @@ v0_1_api.register(PlaceResource())
 v0_1_api.register(HelpResource())
 v0_1_api.register(TagResource())
 v0_1_api.register(BadgeResource())
+v0_1_api.register(ChunkedUploadResource())
+v0_1_api.register(PlaceTypeaheadResource())
+v0_1_api.register(TopicTypeaheadResource())
+v0_1_api.register(OrganizationTypeaheadResource())
 
 urlpatterns += patterns('', 
     # REST API